@@ -65,6 +65,9 @@ import configparser
 import tempfile
 import sys
 
+from .fmw_parser import read_fmw_header
+from .fme_tasks import import_memory_layers
+
 class CollapsibleGroupBox(QGroupBox):
     def __init__(self, title):
         super().__init__()
@@ -633,113 +636,39 @@ class FMEFileLister(QWidget):
             # Check workspace compatibility
             is_compatible, compatibility_message = self.check_workspace_compatibility(fmw_path)
             
-            with open(fmw_path, 'r') as file:
-                lines = file.readlines()
-
-            header_lines = []
-            source_dataset_lines = []
-            dest_dataset_lines = []
-            user_parameter_lines = []
-            header_started = False
-            command_line_found = False
-
-            for index, line in enumerate(lines):
-                if line.startswith("#! <WORKSPACE"):
-                    header_started = True
-                if header_started:
-                    if line.startswith("#!   A0_PREVIEW_IMAGE"):
-                        break
-                    header_lines.append(line)
-
-                    if "Command line to run this workspace:" in line:
-                        command_line_found = True
-                        # Collect all lines that are part of the command line
-                        command_lines = []
-                        i = index + 1
-                        while i < len(lines) and lines[i].strip().startswith("#"):
-                            command_line_part = lines[i].strip().lstrip("#").strip()
-                            if command_line_part:
-                                command_lines.append(command_line_part)
-                            i += 1
-                        # Join the command lines into a single string
-                        command_line = " ".join(command_lines)
-                        # Use regex to extract paths within quotes or contiguous non-space characters
-                        match = re.findall(r'"([^"]+)\'|\'([^\']+)\'|(\S+)', command_line)
-                        # Flatten the match results
-                        parts = [m[0] or m[1] or m[2] for m in match]
-                        if len(parts) >= 2:
-                            # Find the FME executable path (it's the first quoted path)
-                            fme_path = None
-                            workspace_path = None
-                            
-                            # Join parts until we find both paths
-                            current_path = []
-                            in_quotes = False
-                            
-                            for part in parts:
-                                if part.startswith('"') and not in_quotes:
-                                    current_path = [part]
-                                    in_quotes = True
-                                elif part.endswith('"') and in_quotes:
-                                    current_path.append(part)
-                                    full_path = ' '.join(current_path)
-                                    if not fme_path:
-                                        fme_path = full_path
-                                    elif not workspace_path:
-                                        workspace_path = full_path
-                                    current_path = []
-                                    in_quotes = False
-                                elif in_quotes:
-                                    current_path.append(part)
-                            
-                            if fme_path and workspace_path:
-                                # Update paths table - keep quotes for these paths
-                                # First ensure the table has items
-                                if not self.paths_table.item(0, 0):
-                                    self.paths_table.setItem(0, 0, QTableWidgetItem(""))
-                                if not self.paths_table.item(0, 1):
-                                    self.paths_table.setItem(0, 1, QTableWidgetItem(""))
-                                
-                                # Now set the values
-                                self.paths_table.item(0, 0).setText(fme_path)
-                                self.paths_table.item(0, 1).setText(workspace_path)
-
-                if "SourceDataset" in line:
-                    cleaned_line = line.replace("#          --", "").strip()
-                    parts = cleaned_line.split(" ", 1)
-                    if len(parts) == 2:
-                        source_dataset_lines.append((parts[0], parts[1]))
-
-                elif "DestDataset" in line:
-                    cleaned_line = line.replace("#          --", "").strip()
-                    parts = cleaned_line.split(" ", 1)
-                    if len(parts) == 2:
-                        dest_dataset_lines.append((parts[0], parts[1]))
-
-                elif re.search(r"#\s+--", line) and "SourceDataset" not in line and "DestDataset" not in line:
-                    cleaned_line = re.sub(r"#\s+--", "", line).strip()
-                    parts = cleaned_line.split(" ", 1)
-                    if len(parts) == 2:
-                        user_parameter_lines.append((parts[0], parts[1]))
+            # Only the header is read; parsing stops at the end of the workspace attributes
+            header = read_fmw_header(fmw_path)
+
+            if header.fme_exe and header.workspace_path:
+                # Update paths table - keep quotes for these paths
+                # First ensure the table has items
+                if not self.paths_table.item(0, 0):
+                    self.paths_table.setItem(0, 0, QTableWidgetItem(""))
+                if not self.paths_table.item(0, 1):
+                    self.paths_table.setItem(0, 1, QTableWidgetItem(""))
+                
+                # Now set the values
+                self.paths_table.item(0, 0).setText(f'"{header.fme_exe}"')
+                self.paths_table.item(0, 1).setText(f'"{header.workspace_path}"')
 
             # Set the workspace header content
-            self.header_text.setPlainText("".join(header_lines))
+            self.header_text.setPlainText("".join(header.header_lines))
             self.adjust_header_height()
 
             # Update tables
-            for name, value in source_dataset_lines:
+            for name, value in header.source_datasets:
                 row = self.source_dataset_table.rowCount()
                 self.source_dataset_table.insertRow(row)
                 self.source_dataset_table.setItem(row, 0, QTableWidgetItem("GEOJSON"))
                 self.source_dataset_table.setItem(row, 1, QTableWidgetItem(value.strip('"').strip("'")))
 
-            for name, value in dest_dataset_lines:
+            for name, value in header.dest_datasets:
                 row = self.dest_dataset_table.rowCount()
                 self.dest_dataset_table.insertRow(row)
                 self.dest_dataset_table.setItem(row, 0, QTableWidgetItem("GEOJSON"))
                 self.dest_dataset_table.setItem(row, 1, QTableWidgetItem(value.strip('"').strip("'")))
 
-            for name, value in user_parameter_lines:
+            for name, value in header.user_parameters:
                 self.add_parameter(name, value)
 
             # Update dataset paths
@@ -1357,34 +1286,21 @@ class FMEFileLister(QWidget):
                                 if not source_layer.isValid():
                                     QMessageBox.warning(self, "Warning", "Failed to load source GeoJSON file")
                                 else:
-                                    # Create an empty memory layer with same CRS and fields
-                                    geometry_type = source_layer.geometryType()
-                                    geom_str = "Point"
-                                    if geometry_type == 1:  # Line
-                                        geom_str = "LineString"
-                                    elif geometry_type == 2:  # Polygon
-                                        geom_str = "Polygon"
-                                        
-                                    memory_layer = QgsVectorLayer(f"{geom_str}?crs=" + source_layer.crs().authid(), "FME_Form_Output", "memory")
-                                    
-                                    # Copy fields from source layer
-                                    memory_layer.dataProvider().addAttributes(source_layer.fields())
-                                    memory_layer.updateFields()
+                                    # Copy the features into memory layers, one per geometry type
+                                    memory_layers = import_memory_layers(source_layer, "FME_Form_Output")
+                                    if memory_layers is None:
+                                        QMessageBox.warning(self, "Warning", "Failed to copy the features of the output file")
+                                    else:
+                                        for memory_layer in memory_layers:
+                                            QgsProject.instance().addMapLayer(memory_layer)
                                     
-                                    # Copy features directly through the provider (no editing needed)
-                                    features = [f for f in source_layer.getFeatures()]
-                                    memory_layer.dataProvider().addFeatures(features)
-                                    
-                                    # Add to project
-                                    QgsProject.instance().addMapLayer(memory_layer)
-                                    
-                                    # Zoom to the layer if available
-                                    try:
-                                        iface.mapCanvas().zoomToFullExtent()
-                                    except:
-                                        pass
+                                        # Zoom to the layer if available
+                                        try:
+                                            iface.mapCanvas().zoomToFullExtent()
+                                        except:
+                                            pass
                                     
-                                    status_label.setText("Translation successful! Layer added to map as scratch layer.")
+                                        status_label.setText("Translation successful! Layer added to map as scratch layer.")
                             else:
                                 # Load the physical GeoJSON file directly
                                 layer = QgsVectorLayer(dest_path, "FME_Form_Output", "ogr")
@@ -1487,13 +1403,13 @@ class FMEFileLister(QWidget):
             required_params = ["SourceDataset_GEOJSON", "DestDataset_GEOJSON"]
             found_params = []
             
-            # Read the workspace file
-            with open(fmw_path, 'r') as file:
-                content = file.read()
+            # Published parameters are listed in the header command line
+            header = read_fmw_header(fmw_path)
+            parameter_names = [name for name, value in header.parameters]
             
             # Check for each required parameter
             for param in required_params:
-                if param in content:
+                if param in parameter_names:
                     found_params.append(param)
             
             # Check if all required parameters are found
@@ -2000,34 +1916,21 @@ class QGISFMEConnectorDialog(QDialog):
                                 if not source_layer.isValid():
                                     QMessageBox.warning(self, "Warning", "Failed to load source GeoJSON file")
                                 else:
-                                    # Create an empty memory layer with same CRS and fields
-                                    geometry_type = source_layer.geometryType()
-                                    geom_str = "Point"
-                                    if geometry_type == 1:  # Line
-                                        geom_str = "LineString"
-                                    elif geometry_type == 2:  # Polygon
-                                        geom_str = "Polygon"
-                                        
-                                    memory_layer = QgsVectorLayer(f"{geom_str}?crs=" + source_layer.crs().authid(), "FME_Form_Output", "memory")
-                                    
-                                    # Copy fields from source layer
-                                    memory_layer.dataProvider().addAttributes(source_layer.fields())
-                                    memory_layer.updateFields()
-                                    
-                                    # Copy features directly through the provider (no editing needed)
-                                    features = [f for f in source_layer.getFeatures()]
-                                    memory_layer.dataProvider().addFeatures(features)
+                                    # Copy the features into memory layers, one per geometry type
+                                    memory_layers = import_memory_layers(source_layer, "FME_Form_Output")
+                                    if memory_layers is None:
+                                        QMessageBox.warning(self, "Warning", "Failed to copy the features of the output file")
+                                    else:
+                                        for memory_layer in memory_layers:
+                                            QgsProject.instance().addMapLayer(memory_layer)
                                     
-                                    # Add to project
-                                    QgsProject.instance().addMapLayer(memory_layer)
+                                        # Zoom to the layer if available
+                                        try:
+                                            iface.mapCanvas().zoomToFullExtent()
+                                        except:
+                                            pass
                                     
-                                    # Zoom to the layer if available
-                                    try:
-                                        iface.mapCanvas().zoomToFullExtent()
-                                    except:
-                                        pass
-                                    
-                                    status_label.setText("Translation successful! Layer added to map as scratch layer.")
+                                        status_label.setText("Translation successful! Layer added to map as scratch layer.")
                             else:
                                 # Load the physical GeoJSON file directly
                                 layer = QgsVectorLayer(dest_path, "FME_Form_Output", "ogr")
@@ -2137,20 +2040,13 @@ class QGISFMEConnectorDialog(QDialog):
             QMessageBox.warning(self, "Warning", "Failed to load source GeoJSON file")
             return
                 
-        # Create an empty memory layer with same CRS and fields
-        memory_layer = QgsVectorLayer("Point?crs=" + source_layer.crs().authid(), "FME_Form_Output", "memory")
-        
-        # Copy fields from source layer
-        for field in source_layer.fields():
-            memory_layer.dataProvider().addAttributes([field])
-        memory_layer.updateFields()
-        
-        # Copy features directly through the provider (no editing needed)
-        features = [f for f in source_layer.getFeatures()]
-        memory_layer.dataProvider().addFeatures(features)
-        
-        # Add to project
-        QgsProject.instance().addMapLayer(memory_layer)
+        # Copy the features into memory layers, one per geometry type
+        memory_layers = import_memory_layers(source_layer, "FME_Form_Output")
+        if memory_layers is None:
+            QMessageBox.warning(self, "Warning", "Failed to copy the features of the output file")
+            return
+        for memory_layer in memory_layers:
+            QgsProject.instance().addMapLayer(memory_layer)
         
         # Update status
         self.status_label.setText("Layer loaded as scratch layer")
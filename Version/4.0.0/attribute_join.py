@@ -0,0 +1,71 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Attribute-only runs. The source layer is exported without geometries, with
+# a key column that identifies each feature, and the table FME writes back is
+# joined onto the source layer by that key instead of being loaded as a new
+# geometry layer.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+from dataclasses import dataclass
+
+from qgis.core import QgsField, QgsVectorLayerJoinInfo
+from qgis.PyQt.QtCore import QMetaType
+
+# Column that carries the QGIS feature id through FME when the layer has no key field
+FID_FIELD = "qgis_fid"
+# Prefix of the joined output attributes on the source layer
+JOIN_PREFIX = "fme_"
+
+
+@dataclass
+class JoinKey:
+    """The column that identifies source features in the output table."""
+
+    field_name: str
+    from_fid: bool  # True if the column holds the feature id and is added on export
+
+    @property
+    def export_fid_field(self):
+        """Column the export adds with the feature ids, or None."""
+        return self.field_name if self.from_fid else None
+
+
+def join_key(layer):
+    """Return the JoinKey of a layer: its single primary key field, else the feature id."""
+    keys = layer.primaryKeyAttributes()
+    if len(keys) == 1:
+        return JoinKey(layer.fields().at(keys[0]).name(), False)
+    return JoinKey(FID_FIELD, True)
+
+
+def join_output(layer, table, key):
+    """Join the attributes of an output table onto layer by key; return the joined field names.
+
+    A feature id key is matched through a virtual field on the layer, which
+    is added once and evaluates to $id. A previous join of a table with the
+    same name is replaced.
+    """
+    if key.from_fid and layer.fields().lookupField(key.field_name) < 0:
+        layer.addExpressionField("$id", QgsField(key.field_name, QMetaType.Type.LongLong))
+
+    for previous in layer.vectorJoins():
+        if previous.joinLayer() is not None and previous.joinLayer().name() == table.name():
+            layer.removeJoin(previous.joinLayerId())
+
+    names = [name for name in table.fields().names() if name != key.field_name]
+    join = QgsVectorLayerJoinInfo()
+    join.setJoinLayer(table)
+    join.setJoinFieldName(key.field_name)
+    join.setTargetFieldName(key.field_name)
+    join.setJoinFieldNamesSubset(names)
+    join.setPrefix(JOIN_PREFIX)
+    join.setUsingMemoryCache(True)
+    layer.addJoin(join)
+    return [JOIN_PREFIX + name for name in names]
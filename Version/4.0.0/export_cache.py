@@ -0,0 +1,110 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Cache of exported source datasets. A run whose layer, layer state, filter
+# and target CRS match an earlier export reuses that file instead of writing
+# the layer again, which makes parameter-tuning iterations on large layers
+# cost only the FME run itself.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+import hashlib
+import os
+from collections import OrderedDict
+
+from .interchange_formats import dataset_files
+
+
+def _source_file_state(layer):
+    """[(size, mtime_ns)...] of the files behind a file-backed layer, sidecars included, or None."""
+    path = layer.source().split("|")[0]
+    try:
+        return [(stat.st_size, stat.st_mtime_ns) for stat in map(os.stat, dataset_files(path))]
+    except (OSError, ValueError):
+        return None
+
+
+class ExportCache:
+    """Map export keys to previously written source datasets.
+
+    A key is made of the layer source, the state of the file behind it, an
+    edit revision counted from the layer's dataChanged signal, the subset
+    string, the feature filter, the target CRS, the file format and the
+    exported attributes. Entries are kept for the session only, because the
+    edit revision starts over when QGIS restarts.
+    """
+
+    DEFAULT_MAX_ENTRIES = 16
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._entries = OrderedDict()  # key -> (path, size, mtime_ns)
+        self._revisions = {}           # layer id -> edit revision
+
+    def track(self, layer):
+        """Start counting edits of a layer; safe to call more than once."""
+        layer_id = layer.id()
+        if layer_id in self._revisions:
+            return
+        self._revisions[layer_id] = 0
+        layer.dataChanged.connect(lambda: self._bump(layer_id))
+        layer.willBeDeleted.connect(lambda: self._revisions.pop(layer_id, None))
+
+    def _bump(self, layer_id):
+        self._revisions[layer_id] = self._revisions.get(layer_id, 0) + 1
+
+    def revision(self, layer):
+        """Edit revision of a layer, counted since it was first tracked."""
+        self.track(layer)
+        return self._revisions.get(layer.id(), 0)
+
+    def key(self, layer, dest_crs, filter_expression="", file_format="", attributes=None):
+        """Return the cache key of exporting layer with the given settings."""
+        self.track(layer)
+        parts = (
+            layer.providerType(),
+            layer.source(),
+            repr(_source_file_state(layer)),
+            str(self._revisions.get(layer.id(), 0)),
+            layer.subsetString(),
+            filter_expression or "",
+            dest_crs.authid() or dest_crs.toWkt(),
+            file_format,
+            "*" if attributes is None else ",".join(attributes)
+        )
+        return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def lookup(self, key):
+        """Return the cached export for key, or None if missing or changed on disk."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        path, size, mtime_ns = entry
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stat = None
+        if stat is None or (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return path
+
+    def store(self, key, path):
+        """Remember a completed export."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        self._entries[key] = (path, stat.st_size, stat.st_mtime_ns)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
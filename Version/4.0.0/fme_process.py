@@ -0,0 +1,119 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Event-driven runner for fme.exe translations. Both stdout and stderr are
+# drained as soon as data arrives, so FME never blocks on a full pipe and the
+# log reaches the console at the rate FME produces it.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+import locale
+
+from qgis.PyQt.QtCore import QObject, QProcess, pyqtSignal
+
+
+class FMEProcessRunner(QObject):
+    """Run an FME command through QProcess and emit its output line by line."""
+
+    output_line = pyqtSignal(str)   # One complete line from stdout
+    error_line = pyqtSignal(str)    # One complete line from stderr
+    finished = pyqtSignal(int)      # Exit code, -1 if FME crashed or never started
+
+    def __init__(self, command, parent=None):
+        super().__init__(parent)
+        self.command = list(command)
+        self.encoding = locale.getpreferredencoding(False) or "utf-8"
+        self._pending = {QProcess.ProcessChannel.StandardOutput: "",
+                         QProcess.ProcessChannel.StandardError: ""}
+        self._done = False
+        self.exit_code = None
+
+        self.process = QProcess(self)
+        self.process.setProgram(self.command[0])
+        self.process.setArguments(self.command[1:])
+        self.process.readyReadStandardOutput.connect(self._read_stdout)
+        self.process.readyReadStandardError.connect(self._read_stderr)
+        self.process.finished.connect(self._on_finished)
+        self.process.errorOccurred.connect(self._on_error)
+
+    def start(self):
+        """Start the process; output is delivered through the signals."""
+        self._done = False
+        self.exit_code = None
+        self.process.start()
+
+    def kill(self):
+        """Terminate the running process."""
+        if self.process.state() != QProcess.ProcessState.NotRunning:
+            self.process.kill()
+
+    def is_running(self):
+        return self.process.state() != QProcess.ProcessState.NotRunning
+
+    def wait(self, is_canceled=None, interval=100):
+        """Block until FME exits, for use from a worker thread without an event loop.
+
+        QProcess still emits the output signals while waiting, so lines are
+        delivered as they arrive. Returns the exit code, or None if canceled.
+        """
+        self.start()
+        while self.exit_code is None:
+            if is_canceled is not None and is_canceled():
+                self.kill()
+                self.process.waitForFinished(-1)
+                return None
+            self.process.waitForFinished(interval)
+        return self.exit_code
+
+    def _read_stdout(self):
+        data = self.process.readAllStandardOutput()
+        self._emit_lines(QProcess.ProcessChannel.StandardOutput, data, self.output_line)
+
+    def _read_stderr(self):
+        data = self.process.readAllStandardError()
+        self._emit_lines(QProcess.ProcessChannel.StandardError, data, self.error_line)
+
+    def _emit_lines(self, channel, data, signal):
+        """Split a chunk into lines, keeping any partial trailing line for later."""
+        text = self._pending[channel] + bytes(data).decode(self.encoding, errors="replace")
+        lines = text.splitlines(keepends=True)
+        if lines and not lines[-1].endswith(("\n", "\r")):
+            self._pending[channel] = lines.pop()
+        else:
+            self._pending[channel] = ""
+        for line in lines:
+            signal.emit(line.rstrip("\r\n"))
+
+    def _flush_pending(self):
+        """Emit whatever is left in the buffers once the process has ended."""
+        self._read_stdout()
+        self._read_stderr()
+        if self._pending[QProcess.ProcessChannel.StandardOutput]:
+            self.output_line.emit(self._pending[QProcess.ProcessChannel.StandardOutput])
+        if self._pending[QProcess.ProcessChannel.StandardError]:
+            self.error_line.emit(self._pending[QProcess.ProcessChannel.StandardError])
+        self._pending[QProcess.ProcessChannel.StandardOutput] = ""
+        self._pending[QProcess.ProcessChannel.StandardError] = ""
+
+    def _on_finished(self, exit_code, exit_status):
+        if self._done:
+            return
+        self._done = True
+        self._flush_pending()
+        if exit_status == QProcess.ExitStatus.CrashExit:
+            exit_code = -1
+        self.exit_code = exit_code
+        self.finished.emit(exit_code)
+
+    def _on_error(self, error):
+        # Only a failed start leaves us without a finished() signal
+        if error == QProcess.ProcessError.FailedToStart and not self._done:
+            self._done = True
+            self.exit_code = -1
+            self.error_line.emit(f"Failed to start {self.command[0]}: {self.process.errorString()}")
+            self.finished.emit(-1)
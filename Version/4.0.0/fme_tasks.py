@@ -0,0 +1,884 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Background task chain for one FME run: export the source layer, run
+# fme.exe, then load the result. Every stage is a QgsTask so the work happens
+# off the UI thread, reports progress to the QGIS task manager and can be
+# canceled; QgsProject is only touched from finished() on the main thread.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+import math
+import os
+
+from qgis.PyQt.QtCore import QCoreApplication, QMetaType, pyqtSignal
+from qgis.core import (
+    Qgis,
+    QgsTask,
+    QgsFeature,
+    QgsField,
+    QgsFields,
+    QgsProject,
+    QgsFeatureRequest,
+    QgsVectorLayer,
+    QgsVectorFileWriter,
+    QgsVectorLayerFeatureSource,
+    QgsCoordinateReferenceSystem,
+    QgsRectangle
+)
+
+from .fme_process import FMEProcessRunner
+from .interchange_formats import DEFAULT_FORMAT, format_for_path
+from .source_scope import SourceScope, SpatialIndexCache
+from .spatial_tiles import MERGE_CLIP, MERGE_OWNER, balanced_tiles
+from .attribute_join import join_output
+from .result_store import STORE_FORMATS
+from .geometry_fanout import GeometryFanOut
+
+# CRS of the exported source dataset
+EXPORT_CRS = "EPSG:4326"
+# Features handed to a sink per call when importing results
+IMPORT_BATCH_SIZE = 10000
+
+
+def set_command_parameter(command, name, value):
+    """Set --name to value in an FME command list, appending it if missing."""
+    flag = f"--{name}"
+    if flag in command:
+        index = command.index(flag) + 1
+        if index < len(command):
+            command[index] = value
+            return
+        command.append(value)
+        return
+    command.extend([flag, value])
+
+
+def copy_features(features, sink, batch_size=IMPORT_BATCH_SIZE, is_canceled=None, progress=None, total=0):
+    """Add features to a QgsFeatureSink in batches of batch_size; False if canceled or refused.
+
+    Only one batch is held at a time, so memory stays bounded however many
+    features the iterator yields. progress, if given, receives a percentage
+    of total after every batch.
+    """
+    batch = []
+    count = 0
+    for feature in features:
+        if is_canceled is not None and is_canceled():
+            return False
+        batch.append(feature)
+        if len(batch) < batch_size:
+            continue
+        if not _add_batch(sink, batch):
+            return False
+        count += len(batch)
+        batch = []
+        if progress is not None and total > 0:
+            progress(min(100.0, 100.0 * count / total))
+    return not batch or _add_batch(sink, batch)
+
+
+def _add_batch(sink, batch):
+    # Sinks return (ok, features) to Python; some wrappers return only ok
+    result = sink.addFeatures(batch)
+    return result[0] if isinstance(result, tuple) else bool(result)
+
+
+def import_memory_layers(source_layer, name, crs=None, batch_size=IMPORT_BATCH_SIZE, is_canceled=None, progress=None):
+    """Copy a layer into memory layers, one per geometry type; None if canceled or refused."""
+    fan_out = GeometryFanOut(source_layer.fields(), crs or source_layer.crs(), name, source_layer.wkbType())
+    copied = copy_features(
+        source_layer.getFeatures(), fan_out, batch_size, is_canceled, progress, source_layer.featureCount())
+    return fan_out.layers() if copied else None
+
+
+def shard_path(path, index):
+    """Path of shard index of a dataset, e.g. run_input_shard03.geojson."""
+    stem, extension = os.path.splitext(path)
+    return f"{stem}_shard{index + 1:02d}{extension}"
+
+
+class ExportLayerTask(QgsTask):
+    """Write a snapshot of a vector layer to the FME source dataset.
+
+    scope limits the export to a SourceScope of the layer. Extent scopes on
+    layers without a provider spatial index are resolved through
+    index_cache, which is keyed on layer_revision. attributes, if given,
+    names the only fields that are written. dest_crs defaults to EXPORT_CRS;
+    pass the layer CRS to write the data without reprojecting it.
+    ogr_driver and layer_options override the format's driver and pass
+    layer creation options, e.g. a GeoJSON coordinate precision.
+    no_geometry writes a table without geometries; fid_field names a column
+    added with each feature's id.
+    """
+
+    def __init__(self, layer, path, file_format=DEFAULT_FORMAT, scope=None, index_cache=None, layer_revision=0,
+                 attributes=None, dest_crs=None, ogr_driver=None, layer_options=None, no_geometry=False,
+                 fid_field=None):
+        super().__init__(f"Exporting {layer.name()}", QgsTask.Flag.CanCancel)
+        # Everything that reads the layer itself is captured here, on the main thread
+        self.source = QgsVectorLayerFeatureSource(layer)
+        self.layer_id = layer.id()
+        self.layer_revision = layer_revision
+        self.provider_indexed = SpatialIndexCache.provider_has_index(layer)
+        self.scope = scope if scope is not None else SourceScope()
+        self.index_cache = index_cache
+        self.fields = layer.fields()
+        self.attribute_indexes = None
+        if attributes is not None:
+            self.attribute_indexes = [index for index in map(self.fields.lookupField, attributes) if index >= 0]
+            self.fields = QgsFields()
+            for index in self.attribute_indexes:
+                self.fields.append(layer.fields().at(index))
+        self.fid_field = fid_field
+        if fid_field:
+            self.fields = QgsFields(self.fields)
+            self.fields.append(QgsField(fid_field, QMetaType.Type.LongLong))
+        self.no_geometry = no_geometry
+        self.wkb_type = Qgis.WkbType.NoGeometry if no_geometry else layer.wkbType()
+        self.feature_count = self.scope.feature_count if self.scope.feature_count is not None else layer.featureCount()
+        self.source_crs = layer.crs()
+        self.dest_crs = dest_crs if dest_crs is not None else QgsCoordinateReferenceSystem(EXPORT_CRS)
+        self.transform_context = QgsProject.instance().transformContext()
+        self.path = path
+        self.file_format = file_format
+        self.ogr_driver = ogr_driver or file_format.ogr_driver
+        self.layer_options = ([] if no_geometry else list(file_format.layer_options)) + list(layer_options or [])
+        self.error = None
+        self.completed = False
+
+    def run(self):
+        writer = self.create_writer(self.path)
+        if writer is None:
+            return False
+        request = self.feature_request()
+        if request is None:
+            del writer
+            return False
+
+        for index, feature in enumerate(self.source.getFeatures(request)):
+            if self.isCanceled():
+                del writer
+                return False
+            if not writer.addFeature(self.export_feature(feature)):
+                self.error = f"Failed to save {self.file_format.label}: {writer.errorMessage()}\nPath: {self.path}"
+                del writer
+                return False
+            if self.feature_count > 0 and index % 1000 == 0:
+                self.setProgress(100.0 * index / self.feature_count)
+
+        # Deleting the writer flushes and closes the file
+        del writer
+        self.completed = True
+        return True
+
+    def create_writer(self, path):
+        """Open a writer for path; None (with error set) on failure."""
+        save_options = QgsVectorFileWriter.SaveVectorOptions()
+        save_options.driverName = self.ogr_driver
+        save_options.fileEncoding = "UTF-8"
+        save_options.layerOptions = self.layer_options
+
+        writer = QgsVectorFileWriter.create(
+            path,
+            self.fields,
+            self.wkb_type,
+            self.dest_crs,
+            self.transform_context,
+            save_options
+        )
+        if writer.hasError() != QgsVectorFileWriter.WriterError.NoError:
+            self.error = f"Failed to save {self.file_format.label}: {writer.errorMessage()}\nPath: {path}"
+            return None
+        return writer
+
+    def feature_request(self):
+        """The request that reads the exported features; None if canceled."""
+        request = QgsFeatureRequest(self.scope.request)
+        if self.scope.filter_rect is not None:
+            fids = self.extent_feature_ids(self.scope.filter_rect)
+            if fids is None:
+                return None
+            request.setFilterFids(fids)
+            self.feature_count = len(fids)
+
+        # Transform to the export CRS if needed
+        if self.no_geometry:
+            request.setFlags(request.flags() | QgsFeatureRequest.Flag.NoGeometry)
+        elif self.source_crs != self.dest_crs:
+            request.setDestinationCrs(self.dest_crs, self.transform_context)
+        if self.attribute_indexes is not None:
+            request.setSubsetOfAttributes(self.attribute_indexes)
+        return request
+
+    def export_feature(self, feature):
+        """Re-pack the kept attributes of a feature to match the exported field list."""
+        if self.attribute_indexes is None and not self.fid_field:
+            return feature
+        attributes = feature.attributes()
+        if self.attribute_indexes is not None:
+            attributes = [attributes[i] for i in self.attribute_indexes]
+        if self.fid_field:
+            attributes.append(feature.id())
+        pruned = QgsFeature(self.fields, feature.id())
+        if not self.no_geometry:
+            pruned.setGeometry(feature.geometry())
+        pruned.setAttributes(attributes)
+        return pruned
+
+    def extent_feature_ids(self, rect):
+        """Ids of the features whose bounding box meets rect (layer CRS); None if canceled.
+
+        Resolving the extent to ids first keeps the filter in layer
+        coordinates, independent of the reprojection applied on export.
+        """
+        if self.provider_indexed or self.index_cache is None:
+            request = QgsFeatureRequest()
+            request.setFilterRect(rect)
+            request.setNoAttributes()
+            fids = []
+            for feature in self.source.getFeatures(request):
+                if self.isCanceled():
+                    return None
+                fids.append(feature.id())
+            return fids
+
+        index = self.index_cache.get(self.layer_id, self.layer_revision)
+        if index is None:
+            index = self.index_cache.build(self.layer_id, self.layer_revision, self.source, self.isCanceled)
+            if index is None:
+                return None
+        return index.intersects(rect)
+
+
+class ShardedExportTask(ExportLayerTask):
+    """Write the exported features to several source datasets in one pass.
+
+    Features are split into contiguous runs in read order, which is feature
+    id order for the file and database providers, so each shard covers one
+    id range. paths holds one dataset path per shard.
+    """
+
+    def __init__(self, layer, paths, file_format=DEFAULT_FORMAT, **kwargs):
+        super().__init__(layer, paths[0], file_format, **kwargs)
+        self.setDescription(f"Exporting {layer.name()} in {len(paths)} shards")
+        self.paths = list(paths)
+
+    def run(self):
+        writers = [self.create_writer(path) for path in self.paths]
+        if any(writer is None for writer in writers):
+            writers.clear()
+            return False
+        request = self.feature_request()
+        if request is None:
+            writers.clear()
+            return False
+
+        shard_size = math.ceil(self.feature_count / len(writers)) if self.feature_count > 0 else 0
+        for index, feature in enumerate(self.source.getFeatures(request)):
+            if self.isCanceled():
+                writers.clear()
+                return False
+            # Without a feature count, deal the features out in turn
+            shard = min(index // shard_size, len(writers) - 1) if shard_size else index % len(writers)
+            if not writers[shard].addFeature(self.export_feature(feature)):
+                self.error = f"Failed to save {self.file_format.label}: {writers[shard].errorMessage()}\nPath: {self.paths[shard]}"
+                writers.clear()
+                return False
+            if self.feature_count > 0 and index % 1000 == 0:
+                self.setProgress(100.0 * index / self.feature_count)
+
+        # Deleting the writers flushes and closes the files
+        writers.clear()
+        self.completed = True
+        return True
+
+
+class TiledExportTask(ExportLayerTask):
+    """Write the exported features to one dataset per spatial tile.
+
+    A first pass reads the feature centres and cuts balanced tiles (in the
+    export CRS); the second writes each feature to every tile whose core,
+    grown by halo, meets its bounding box. tiles and merge_mode tell the
+    import stage how to put the outputs back together. There may be fewer
+    tiles than paths; empty_shards holds the indexes of the paths that got
+    no features, whose FME runs are skipped.
+    """
+
+    def __init__(self, layer, paths, file_format=DEFAULT_FORMAT, halo=0.0, merge_mode=MERGE_OWNER, **kwargs):
+        super().__init__(layer, paths[0], file_format, **kwargs)
+        self.setDescription(f"Exporting {layer.name()} in {len(paths)} tiles")
+        self.paths = list(paths)
+        self.halo = max(0.0, halo)
+        self.merge_mode = merge_mode
+        self.tiles = []
+        self.empty_shards = set()
+
+    def run(self):
+        request = self.feature_request()
+        if request is None:
+            return False
+
+        centre_request = QgsFeatureRequest(request)
+        centre_request.setNoAttributes()
+        centres = []
+        for feature in self.source.getFeatures(centre_request):
+            if self.isCanceled():
+                return False
+            if feature.hasGeometry():
+                centres.append(feature.geometry().boundingBox().center())
+        self.tiles = balanced_tiles([(point.x(), point.y()) for point in centres], len(self.paths))
+        self.setProgress(10)
+
+        writers = [self.create_writer(path) for path in self.paths[:len(self.tiles)]]
+        if any(writer is None for writer in writers):
+            writers.clear()
+            return False
+        written = [0] * len(writers)
+        for index, feature in enumerate(self.source.getFeatures(request)):
+            if self.isCanceled():
+                writers.clear()
+                return False
+            if feature.hasGeometry():
+                box = feature.geometry().boundingBox()
+                targets = [i for i, tile in enumerate(self.tiles)
+                           if tile.intersects(box.xMinimum(), box.yMinimum(), box.xMaximum(), box.yMaximum(), self.halo)]
+            else:
+                # Features without geometry belong to no tile; the first one takes them
+                targets = [0]
+            exported = self.export_feature(feature)
+            for shard in targets:
+                if not writers[shard].addFeature(exported):
+                    self.error = f"Failed to save {self.file_format.label}: {writers[shard].errorMessage()}\nPath: {self.paths[shard]}"
+                    writers.clear()
+                    return False
+                written[shard] += 1
+            if self.feature_count > 0 and index % 1000 == 0:
+                self.setProgress(10 + 90.0 * index / self.feature_count)
+
+        # Deleting the writers flushes and closes the files
+        writers.clear()
+        self.empty_shards = {shard for shard in range(len(self.paths)) if shard >= len(written) or not written[shard]}
+        # With nothing to export at all, the first shard still runs, as an unsharded run would
+        self.empty_shards.discard(0)
+        self.completed = True
+        return True
+
+
+class FMETranslationTask(QgsTask):
+    """Run fme.exe and relay its log lines while it works.
+
+    With a result cache, a run that matches an earlier one (same workspace
+    content, parameters and input content) copies the stored output to the
+    destination instead of starting FME.
+    """
+
+    output_line = pyqtSignal(str)
+
+    def __init__(self, command, source_path=None, dest_path=None, result_cache=None, excluded_parameters=(),
+                 log_prefix=""):
+        super().__init__(f"Running FME translation {log_prefix}".strip(), QgsTask.Flag.CanCancel)
+        self.command = list(command)
+        self.log_prefix = log_prefix
+        self.source_path = source_path
+        self.dest_path = dest_path
+        self.result_cache = result_cache
+        self.excluded_parameters = tuple(excluded_parameters)
+        self.exit_code = None
+        self.cache_hit = False
+        self.skipped = False
+        self.wait_for = None  # threading.Event to wait on before starting FME, e.g. a source pipe
+        self.skip = None      # Callable, true if the source turned out empty and FME need not run
+
+    def run(self):
+        if self.skip is not None and self.skip():
+            self.skipped = True
+            self.exit_code = 0
+            self.output_line.emit(f"{self.log_prefix}No features to translate; FME was not started.")
+            return True
+
+        cache_key = None
+        if self.result_cache is not None:
+            try:
+                cache_key = self.result_cache.key(self.command[1], self.command, self.source_path, self.excluded_parameters)
+                if self.result_cache.fetch(cache_key, self.dest_path):
+                    self.cache_hit = True
+                    self.exit_code = 0
+                    self.output_line.emit(f"{self.log_prefix}Identical run found in the result cache; FME was not started.")
+                    return True
+            except OSError as e:
+                self.output_line.emit(f"Result cache unavailable: {e}")
+                cache_key = None
+
+        if self.wait_for is not None:
+            while not self.wait_for.wait(0.1):
+                if self.isCanceled():
+                    return False
+
+        # The runner lives in this worker thread; its signals reach the UI queued
+        runner = FMEProcessRunner(self.command)
+        if self.log_prefix:
+            # Tell the lines of concurrent shard runs apart
+            relay = lambda line: self.output_line.emit(self.log_prefix + line)
+            runner.output_line.connect(relay)
+            runner.error_line.connect(relay)
+        else:
+            runner.output_line.connect(self.output_line)
+            runner.error_line.connect(self.output_line)
+        self.exit_code = runner.wait(self.isCanceled)
+
+        if self.exit_code == 0 and cache_key is not None:
+            try:
+                self.result_cache.store(cache_key, self.dest_path)
+            except OSError as e:
+                self.output_line.emit(f"Could not store the result in the cache: {e}")
+        return self.exit_code == 0
+
+
+class FMERunTask(QgsTask):
+    """Export, translate and import as one task chain.
+
+    The export and FME stages are subtasks this task depends on, so its own
+    run() is the import stage and only starts once FME has succeeded.
+    export_task writes the source dataset; without one the source dataset
+    is taken as already written. A result_cache lets the FME stage reuse the
+    output of an identical earlier run; excluded_parameters names the
+    command parameters that hold generated paths and are not part of the key.
+    expected_crs is assigned to the output when its file does not carry a
+    usable CRS, e.g. GeoJSON in a projected CRS.
+
+    shards, a list of (command, source_path, dest_path), replaces the single
+    translation with one concurrent FME process per shard; their outputs are
+    merged into one result layer, written to dest_path unless as_scratch.
+    With stream_source the export writes into a pipe FME reads from, so
+    both start together instead of one after the other.
+    With a TiledExportTask the merge keeps or clips each tile's output to
+    its tile core, which drops the duplicates the halos produce; the
+    workspace is expected to write in the CRS it reads.
+
+    Workspaces with several readers and writers pass the exports of the
+    other source datasets as extra_export_tasks, which run alongside
+    export_task, and the other destinations as extra_outputs, a list of
+    (dest_path, layer name); each destination is loaded as its own layer.
+
+    join_layer and join_key turn the main output into a table that is joined
+    onto join_layer (the source layer of an attribute-only run) by that key.
+    With a WriteBack, the main output is not loaded at all; its changes are
+    written to the source layer instead. Scratch layers are filled in
+    batches of import_batch_size features.
+
+    With a ResultStore, an output too large for memory is converted into an
+    indexed file in the store instead of a scratch layer, as is a large
+    output file in a format without a spatial index.
+
+    Before they are handed to the main thread, loaded layers get a spatial
+    index (unless spatial_index is False) and attribute indexes on the
+    index_fields their provider can index.
+    """
+
+    output_line = pyqtSignal(str)
+    run_finished = pyqtSignal(bool, str)  # success, status message
+
+    def __init__(self, command, source_path, dest_path, export_task=None, as_scratch=True,
+                 result_cache=None, excluded_parameters=(), expected_crs=None, shards=None, stream_source=False,
+                 extra_export_tasks=(), extra_outputs=(), output_name="FME_Form_Output", join_layer=None,
+                 join_key=None, write_back=None, import_batch_size=IMPORT_BATCH_SIZE, result_store=None,
+                 spatial_index=True, index_fields=()):
+        super().__init__(f"FME Form: {os.path.basename(command[1])}", QgsTask.Flag.CanCancel)
+        self.source_path = source_path
+        self.dest_path = dest_path
+        self.as_scratch = as_scratch
+        self.expected_crs = expected_crs
+        self.batch_size = max(1, import_batch_size)
+        self.output_name = output_name
+        self.extra_outputs = list(extra_outputs)
+        self.result_layers = []
+        self.join_layer_id = join_layer.id() if join_layer is not None else None
+        self.join_key = join_key
+        self.joined_fields = []
+        self.write_back = write_back
+        self.result_store = result_store
+        self.stored_paths = []
+        self.spatial_index = spatial_index
+        self.index_fields = list(index_fields)
+        self.error = None
+
+        self.export_task = export_task
+        self.extra_export_tasks = list(extra_export_tasks)
+        if shards:
+            self.fme_tasks = [
+                FMETranslationTask(shard_command, shard_source, shard_dest, result_cache, excluded_parameters,
+                                   log_prefix=f"[shard {index + 1}/{len(shards)}] ")
+                for index, (shard_command, shard_source, shard_dest) in enumerate(shards)
+            ]
+        else:
+            self.fme_tasks = [FMETranslationTask(command, source_path, dest_path, result_cache, excluded_parameters)]
+        # Shard runs share the export as their only dependency, so the task manager runs them side by side
+        dependencies = list(self.extra_export_tasks)
+        if self.export_task is not None and not stream_source:
+            dependencies.append(self.export_task)
+        elif self.export_task is not None:
+            # FME starts once the pipe exists; the export stops waiting for it once FME has exited
+            reader = self.fme_tasks[0]
+            reader.wait_for = self.export_task.pipe_ready
+            self.export_task.reader_exited = lambda: reader.exit_code is not None
+        if shards and isinstance(self.export_task, TiledExportTask):
+            # Tiles are cut during the export; a shard left without features is not run
+            for index, fme_task in enumerate(self.fme_tasks):
+                fme_task.skip = lambda index=index: index in self.export_task.empty_shards
+        for export in [self.export_task] + self.extra_export_tasks:
+            if export is not None:
+                self.addSubTask(export, [], QgsTask.SubTaskDependency.ParentDependsOnSubTask)
+        for fme_task in self.fme_tasks:
+            fme_task.output_line.connect(self.output_line)
+            self.addSubTask(fme_task, dependencies, QgsTask.SubTaskDependency.ParentDependsOnSubTask)
+
+    @property
+    def is_sharded(self):
+        return len(self.fme_tasks) > 1
+
+    @property
+    def exported(self):
+        """True if this run wrote a complete source dataset."""
+        return self.export_task is not None and self.export_task.completed
+
+    @property
+    def result_layer(self):
+        return self.result_layers[0] if self.result_layers else None
+
+    def run(self):
+        if self.is_sharded:
+            if not self.merge_shards():
+                return False
+        elif self.write_back is not None:
+            if not self.collect_write_back():
+                return False
+        else:
+            if not os.path.exists(self.dest_path):
+                self.error = "Translation failed: Output file not found"
+                return False
+            layers = self.load_output(self.dest_path, self.output_name)
+            if layers is None:
+                return False
+            self.result_layers.extend(layers)
+
+        for dest_path, name in self.extra_outputs:
+            # A writer that received no features may not create its dataset
+            if not os.path.exists(dest_path):
+                self.output_line.emit(f"No output written for {name}")
+                continue
+            layers = self.load_output(dest_path, name)
+            if layers is None:
+                return False
+            self.result_layers.extend(layers)
+        return True
+
+    def collect_write_back(self):
+        """Compare the main output with the source layer for a write-back run."""
+        if not os.path.exists(self.dest_path):
+            self.error = "Translation failed: Output file not found"
+            return False
+        output_layer = QgsVectorLayer(self.dest_path, "temp_source", "ogr")
+        if not output_layer.isValid():
+            self.error = "Failed to load output file"
+            return False
+        try:
+            if not self.write_back.collect(output_layer, self.isCanceled):
+                return False
+        except ValueError as e:
+            self.error = str(e)
+            return False
+        if self.write_back.unmatched:
+            self.output_line.emit(f"{self.write_back.unmatched} output features match no source feature")
+        if self.write_back.unconvertible:
+            self.output_line.emit(f"Not written back: {self.write_back.unconvertible} changed geometries "
+                                  f"that do not fit the geometry type of the source layer")
+        if self.write_back.ignored_fields:
+            self.output_line.emit(f"Not written back: {', '.join(self.write_back.ignored_fields)}")
+        return True
+
+    def load_output(self, path, name):
+        """Load one output dataset as scratch, stored or file layers, owned by the main thread.
+
+        A scratch import gives one layer per geometry type of the output.
+        """
+        output_layer = QgsVectorLayer(path, "temp_source", "ogr")
+        if not output_layer.isValid():
+            self.error = f"Failed to load output file {path}"
+            return None
+        if self.spills_to_disk(output_layer.featureCount(), os.path.getsize(path), path):
+            layer = self.load_as_stored_layer(output_layer, name)
+            layers = None if layer is None else [layer]
+        elif self.as_scratch:
+            layers = self.load_as_memory_layers(output_layer, name)
+        else:
+            # Load the physical output file directly
+            output_layer.setName(name)
+            output_layer.setCrs(self.output_crs(output_layer))
+            layers = [output_layer]
+        if layers is None:
+            return None
+
+        # Hand the layers over to the main thread before they are added to the project
+        for layer in layers:
+            self.build_indexes(layer)
+            layer.moveToThread(QCoreApplication.instance().thread())
+        return layers
+
+    def build_indexes(self, layer):
+        """Index a loaded result in the worker, so the canvas never renders it unindexed.
+
+        Memory layers get their spatial index in one pass over the filled
+        layer; stored GeoPackage and FlatGeobuf results already carry one.
+        """
+        provider = layer.dataProvider()
+        capabilities = provider.capabilities()
+        if self.spatial_index and layer.isSpatial() \
+                and capabilities & Qgis.VectorProviderCapability.CreateSpatialIndex \
+                and provider.hasSpatialIndex() != Qgis.SpatialIndexPresence.Present:
+            if not provider.createSpatialIndex():
+                self.output_line.emit(f"Could not build a spatial index for {layer.name()}")
+
+        # Memory layers cannot hold attribute indexes; that is not worth a warning
+        if not self.index_fields or not capabilities & Qgis.VectorProviderCapability.CreateAttributeIndex:
+            return
+        for name in self.index_fields:
+            index = provider.fields().lookupField(name)
+            if index < 0:
+                self.output_line.emit(f"Not indexed: {layer.name()} has no field {name}")
+            elif not provider.createAttributeIndex(index):
+                self.output_line.emit(f"Could not index {name} of {layer.name()}")
+
+    def spills_to_disk(self, feature_count, size, path):
+        """True if a result goes to the result store instead of memory or its output file."""
+        if self.result_store is None or not self.result_store.exceeds_memory_limit(feature_count, size):
+            return False
+        # An output file in an indexed format renders well as it is
+        return self.as_scratch or format_for_path(path) not in STORE_FORMATS
+
+    def output_crs(self, layer):
+        """CRS of an output layer, falling back to expected_crs when the file's CRS is not usable.
+
+        GDAL reads GeoJSON without a crs member as EPSG:4326, so a geographic
+        CRS whose extent lies outside longitude/latitude range is replaced too.
+        """
+        crs = layer.crs()
+        if self.expected_crs is None or not self.expected_crs.isValid() or crs == self.expected_crs:
+            return crs
+        if not crs.isValid():
+            return self.expected_crs
+        if crs.isGeographic() and not self.expected_crs.isGeographic():
+            extent = layer.extent()
+            if not extent.isEmpty() and not QgsRectangle(-180, -90, 180, 90).contains(extent):
+                return self.expected_crs
+        return crs
+
+    def merge_shards(self):
+        """Combine the shard outputs into one result layer."""
+        # A shard whose features were all filtered out may leave no output file
+        tiles = self.export_task.tiles if isinstance(self.export_task, TiledExportTask) else None
+        outputs = [(index, task.dest_path) for index, task in enumerate(self.fme_tasks)
+                   if not task.skipped and os.path.exists(task.dest_path)]
+        if not outputs:
+            self.error = "Translation failed: Output file not found"
+            return False
+        shard_layers = [QgsVectorLayer(path, "temp_source", "ogr") for _, path in outputs]
+        if not all(layer.isValid() for layer in shard_layers):
+            self.error = "Failed to load output file"
+            return False
+        if tiles:
+            bounds = QgsRectangle()
+            for shard_layer in shard_layers:
+                bounds.combineExtentWith(shard_layer.extent())
+
+        fields = QgsFields()
+        for shard_layer in shard_layers:
+            for field in shard_layer.fields():
+                if fields.lookupField(field.name()) < 0:
+                    fields.append(field)
+
+        feature_count = sum(shard_layer.featureCount() for shard_layer in shard_layers)
+        size = sum(os.path.getsize(path) for _, path in outputs)
+        if self.spills_to_disk(feature_count, size, self.dest_path):
+            merged_path = self.result_store.new_path(self.output_name)
+            sink = self.result_store.create_writer(
+                merged_path, fields, shard_layers[0].wkbType(), self.output_crs(shard_layers[0]))
+            if sink.hasError() != QgsVectorFileWriter.WriterError.NoError:
+                self.error = f"Failed to store the merged output: {sink.errorMessage()}"
+                return False
+            self.stored_paths.append(merged_path)
+            self.output_line.emit(f"The merged output is too large for a scratch layer, storing it in {merged_path}")
+        elif self.as_scratch:
+            merged_path = None
+            sink = GeometryFanOut(fields, self.output_crs(shard_layers[0]), self.output_name, shard_layers[0].wkbType())
+        else:
+            merged_path = self.dest_path
+            save_options = QgsVectorFileWriter.SaveVectorOptions()
+            output_format = format_for_path(self.dest_path)
+            save_options.driverName = output_format.ogr_driver if output_format else DEFAULT_FORMAT.ogr_driver
+            save_options.fileEncoding = "UTF-8"
+            sink = QgsVectorFileWriter.create(
+                self.dest_path,
+                fields,
+                shard_layers[0].wkbType(),
+                self.output_crs(shard_layers[0]),
+                QgsProject.instance().transformContext(),
+                save_options
+            )
+            if sink.hasError() != QgsVectorFileWriter.WriterError.NoError:
+                self.error = f"Failed to merge the shard outputs: {sink.errorMessage()}"
+                return False
+
+        def merged_features(shard, shard_layer):
+            names = shard_layer.fields().names()
+            for feature in shard_layer.getFeatures():
+                geometry = feature.geometry()
+                if tiles and not geometry.isNull():
+                    geometry = self.tile_geometry(tiles[shard], geometry, bounds)
+                    if geometry is None:
+                        continue
+                merged = QgsFeature(fields)
+                merged.setGeometry(geometry)
+                for name, value in zip(names, feature.attributes()):
+                    merged.setAttribute(name, value)
+                yield merged
+
+        for (shard, _), shard_layer in zip(outputs, shard_layers):
+            if not copy_features(merged_features(shard, shard_layer), sink, self.batch_size, self.isCanceled):
+                if not self.isCanceled():
+                    self.error = "Failed to merge the shard outputs"
+                return False
+
+        if merged_path is not None:
+            # Deleting the writer flushes and closes the file
+            del sink
+            layer = QgsVectorLayer(merged_path, self.output_name, "ogr")
+            if not layer.isValid():
+                self.error = "Failed to load output file"
+                return False
+            layer.setCrs(self.output_crs(layer))
+            layers = [layer]
+        else:
+            layers = sink.layers()
+
+        for layer in layers:
+            self.build_indexes(layer)
+            layer.moveToThread(QCoreApplication.instance().thread())
+        self.result_layers.extend(layers)
+        return True
+
+    def tile_geometry(self, tile, geometry, bounds):
+        """The part of an output geometry that belongs to a tile, None if none does."""
+        if self.export_task.merge_mode == MERGE_CLIP and geometry.type() != Qgis.GeometryType.Point:
+            # Outer tiles reach to infinity; the combined output extent bounds them
+            xmin, ymin, xmax, ymax = tile.clamped(
+                bounds.xMinimum(), bounds.yMinimum(), bounds.xMaximum(), bounds.yMaximum())
+            clipped = geometry.clipped(QgsRectangle(xmin, ymin, xmax, ymax))
+            return None if clipped.isEmpty() else clipped
+        centre = geometry.boundingBox().center()
+        return geometry if tile.contains(centre.x(), centre.y()) else None
+
+    def load_as_memory_layers(self, source_layer, name):
+        """Copy an FME output layer into memory layers, one per geometry type."""
+        # Stream the features through the providers in batches (no editing needed)
+        layers = import_memory_layers(
+            source_layer,
+            name,
+            self.output_crs(source_layer),
+            self.batch_size,
+            self.isCanceled,
+            self.setProgress
+        )
+        if layers is None:
+            if not self.isCanceled():
+                self.error = f"Failed to copy the features of {source_layer.source()}"
+            return None
+        if len(layers) > 1:
+            self.output_line.emit(f"{name} mixes geometry types, loaded as {len(layers)} layers")
+        return layers
+
+    def load_as_stored_layer(self, source_layer, name):
+        """Convert an FME output layer into an indexed file in the result store."""
+        path = self.result_store.new_path(name)
+        crs = self.output_crs(source_layer)
+        writer = self.result_store.create_writer(path, source_layer.fields(), source_layer.wkbType(), crs)
+        if writer.hasError() != QgsVectorFileWriter.WriterError.NoError:
+            self.error = f"Failed to store {name}: {writer.errorMessage()}"
+            return None
+        self.stored_paths.append(path)
+        self.output_line.emit(f"{name} is too large for a scratch layer, storing it in {path}")
+
+        copied = copy_features(
+            source_layer.getFeatures(),
+            writer,
+            self.batch_size,
+            self.isCanceled,
+            self.setProgress,
+            source_layer.featureCount()
+        )
+        # Deleting the writer flushes the file and builds the spatial index
+        del writer
+        if not copied:
+            if not self.isCanceled():
+                self.error = f"Failed to store the features of {source_layer.source()}"
+            return None
+        layer = QgsVectorLayer(path, name, "ogr")
+        if not layer.isValid():
+            self.error = f"Failed to load stored result {path}"
+            return None
+        layer.setCrs(crs)
+        return layer
+
+    def finished(self, result):
+        export_errors = [task.error for task in [self.export_task] + self.extra_export_tasks
+                         if task is not None and task.error]
+        write_back_layer = None
+        if result and self.write_back is not None:
+            write_back_layer = QgsProject.instance().mapLayer(self.write_back.layer_id)
+            if write_back_layer is None:
+                self.error = "The source layer was removed before the results could be written back"
+            else:
+                self.error = self.write_back.apply(write_back_layer)
+            if self.error:
+                write_back_layer = None
+                result = False
+
+        if write_back_layer is not None:
+            for layer in self.result_layers:
+                QgsProject.instance().addMapLayer(layer)
+            message = f"Translation successful! {self.write_back.changed_count} features updated in {write_back_layer.name()}."
+            if write_back_layer.isEditable():
+                message += " Save the layer edits to keep them."
+        elif result and self.result_layers:
+            for layer in self.result_layers:
+                QgsProject.instance().addMapLayer(layer)
+            join_layer = QgsProject.instance().mapLayer(self.join_layer_id) if self.join_layer_id else None
+            if join_layer is not None:
+                self.joined_fields = join_output(join_layer, self.result_layers[0], self.join_key)
+                message = f"Translation successful! {len(self.joined_fields)} attributes joined to {join_layer.name()}."
+            elif all(task.cache_hit for task in self.fme_tasks):
+                message = "Result loaded from cache! Layer added to map."
+            elif len(self.result_layers) > 1:
+                message = f"Translation successful! {len(self.result_layers)} layers added to map."
+            elif self.is_sharded:
+                message = f"Translation successful! {len(self.fme_tasks)} shard outputs merged and added to map."
+            elif self.stored_paths:
+                message = "Translation successful! Large result stored on disk and added to map."
+            elif self.as_scratch:
+                message = "Translation successful! Layer added to map as scratch layer."
+            else:
+                message = "Translation successful! Layer added to map from file."
+        elif export_errors:
+            message = export_errors[0]
+        elif any(task.exit_code not in (None, 0) for task in self.fme_tasks):
+            message = "Translation failed!"
+        elif self.error:
+            message = self.error
+        else:
+            message = "Translation canceled"
+        self.run_finished.emit(bool(result and (self.result_layers or write_back_layer is not None)), message)
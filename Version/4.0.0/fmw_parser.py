@@ -0,0 +1,397 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Streaming parser for the header of FME workspace (.fmw) files. Only the
+# "Command line to run this workspace" block, the #! <WORKSPACE attributes,
+# the datasets and the published parameters are read; parsing stops as soon
+# as those are known, and overlong lines such as the base64 A0_PREVIEW_IMAGE
+# are skipped without being kept in memory. Parsed workspaces are cached per
+# path, size and modification time.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+import html
+import os
+import re
+import shlex
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+# Lines longer than this are skipped in pieces instead of being read whole
+MAX_LINE_LENGTH = 64 * 1024
+
+# Number of parsed workspaces kept by load_workspace()
+CACHE_SIZE = 64
+
+_WORKSPACE_START = "#! <WORKSPACE"
+_ATTRIBUTES_END = "#! >"
+_COMMAND_LINE_MARKER = "Command line to run this workspace:"
+_COMMAND_RE = re.compile(r"^#\s+(\S.*)$")
+_PARAMETER_RE = re.compile(r"^#\s+--(\S+)(?:\s+(.*))?$")
+_ATTRIBUTE_RE = re.compile(r'^#!\s+([A-Za-z0-9_]+)="(.*)"\s*$')
+_PREVIEW_IMAGE = "#!   A0_PREVIEW_IMAGE"
+_ELEMENT_END = ("#! >", "#! />")
+_DATASETS_START = "#! <DATASETS>"
+_DATASETS_END = "#! </DATASETS>"
+_DATASET_START = "#! <DATASET\n"
+_FEATURE_TYPE_START = "#! <FEATURE_TYPE\n"
+_FEATURE_TYPE_END = "#! </FEATURE_TYPE>"
+_FEAT_ATTRIBUTE_RE = re.compile(r'^#!\s+<FEAT_ATTRIBUTE\s+ATTR_NAME="([^"]*)"\s+ATTR_TYPE="([^"]*)"(.*)/>\s*$')
+_GLOBAL_PARAMETER_START = "#! <GLOBAL_PARAMETER\n"
+_GLOBAL_PARAMETERS_END = "#! </GLOBAL_PARAMETERS>"
+_WORKSPACE_END = "#! </WORKSPACE>"
+_DATASET_PARAMETER_RE = re.compile(r"^\$\((\w+)\)$")
+_MACRO_RE = re.compile(r"^DEFAULT_MACRO\s+(\S+)(?:\s(.*))?$")
+
+
+@dataclass
+class FMWHeader:
+    """What the connector needs from the top of a workspace file."""
+
+    header_lines: list = field(default_factory=list)  # Command line block as written in the file
+    fme_exe: str = None                               # fme.exe from the command line
+    workspace_path: str = None                        # Workspace path from the command line
+    parameters: list = field(default_factory=list)    # (name, value) pairs from the command line
+    attributes: dict = field(default_factory=dict)    # #! <WORKSPACE attributes
+
+    @property
+    def source_datasets(self):
+        return [(name, value) for name, value in self.parameters if name.startswith("SourceDataset")]
+
+    @property
+    def dest_datasets(self):
+        return [(name, value) for name, value in self.parameters if name.startswith("DestDataset")]
+
+    @property
+    def user_parameters(self):
+        return [(name, value) for name, value in self.parameters
+                if not name.startswith(("SourceDataset", "DestDataset"))]
+
+
+@dataclass
+class FMWDataset:
+    """A reader or writer from the <DATASETS> block."""
+
+    is_source: bool
+    format: str        # FME format short name, e.g. GEOJSON
+    dataset: str       # Usually a published parameter reference such as $(SourceDataset_GEOJSON)
+    keyword: str = ""
+    coordsys: str = ""
+
+    @property
+    def parameter(self):
+        """Name of the published parameter that holds the dataset path, if any."""
+        match = _DATASET_PARAMETER_RE.match(self.dataset)
+        return match.group(1) if match else None
+
+
+@dataclass
+class FMWFeatureType:
+    """A reader or writer feature type from the <FEATURE_TYPES> block."""
+
+    is_source: bool
+    name: str
+    keyword: str = ""              # Keyword of the dataset the feature type belongs to
+    geometry_type: str = ""
+    dynamic_schema: bool = False   # Schema is taken from the data rather than the attributes below
+    schema_sources: str = ""       # Keywords of the readers a dynamic writer takes its schema from
+    attributes: list = field(default_factory=list)  # (name, type) pairs of user attributes
+
+    @property
+    def attribute_names(self):
+        return [name for name, attr_type in self.attributes]
+
+
+@dataclass
+class FMWParameter:
+    """A published parameter with its GUI definition."""
+
+    name: str
+    default_value: str = ""
+    gui_type: str = ""
+    optional: bool = False
+    gui_line: str = ""
+
+
+@dataclass
+class FMWWorkspace(FMWHeader):
+    """Parsed workspace shared by the dialog, the command builder and the checks.
+
+    Instances returned by load_workspace() are cached; treat them as read-only.
+    """
+
+    path: str = ""
+    datasets: list = field(default_factory=list)              # FMWDataset entries
+    feature_types: list = field(default_factory=list)         # FMWFeatureType entries
+    published_parameters: list = field(default_factory=list)  # FMWParameter entries
+
+    @property
+    def fme_build(self):
+        return self.attributes.get("FME_BUILD_NUM", "")
+
+    @property
+    def readers(self):
+        return [dataset for dataset in self.datasets if dataset.is_source]
+
+    @property
+    def writers(self):
+        return [dataset for dataset in self.datasets if not dataset.is_source]
+
+    def consumed_attributes(self, keyword=None):
+        """Attribute names the readers declare, or None if the workspace may use any attribute.
+
+        Any feature type with a dynamic schema that reads from, or takes its
+        schema from, the reader means every attribute can reach the output,
+        so nothing may be pruned.
+        """
+        readers = [ft for ft in self.feature_types if ft.is_source and (keyword is None or ft.keyword == keyword)]
+        if not readers:
+            return None
+        reader_keywords = {ft.keyword for ft in readers}
+        for feature_type in self.feature_types:
+            if not feature_type.dynamic_schema:
+                continue
+            if feature_type.is_source and feature_type.keyword in reader_keywords:
+                return None
+            if reader_keywords.intersection(feature_type.schema_sources.split()):
+                return None
+        names = []
+        for feature_type in readers:
+            names.extend(name for name in feature_type.attribute_names if name not in names)
+        return names
+
+    def parameter_names(self):
+        """Names of all parameters the workspace accepts on the command line."""
+        names = [name for name, value in self.parameters]
+        names.extend(parameter.name for parameter in self.published_parameters if parameter.name not in names)
+        return names
+
+
+def iter_lines(file):
+    """Yield the lines of a text file, truncating any longer than MAX_LINE_LENGTH.
+
+    The remainder of a truncated line is consumed in MAX_LINE_LENGTH pieces and
+    discarded, so a multi-megabyte line never exists as a single string.
+    Yields (line, truncated) tuples.
+    """
+    while True:
+        line = file.readline(MAX_LINE_LENGTH)
+        if not line:
+            return
+        truncated = len(line) == MAX_LINE_LENGTH and not line.endswith("\n")
+        if truncated:
+            rest = line
+            while rest and not rest.endswith("\n"):
+                rest = file.readline(MAX_LINE_LENGTH)
+        yield line, truncated
+
+
+def _split_command(command_line):
+    """Return the fme.exe and workspace paths of the header command line."""
+    try:
+        parts = shlex.split(command_line, posix=False)
+    except ValueError:
+        parts = command_line.split()
+    parts = [part.strip('"') for part in parts]
+    fme_exe = parts[0] if len(parts) > 0 else None
+    workspace_path = parts[1] if len(parts) > 1 else None
+    return fme_exe, workspace_path
+
+
+def parse_header_lines(lines, header):
+    """Fill an FMWHeader from (line, truncated) tuples, stopping after the attributes.
+
+    The iterator is left just after the closing "#! >", so the caller can keep
+    reading the rest of the file if it needs to.
+    """
+    in_workspace = False
+    in_command = False
+    command_seen = False
+    for line, truncated in lines:
+        if not in_workspace:
+            if line.startswith(_WORKSPACE_START):
+                in_workspace = True
+                header.header_lines.append(line)
+            continue
+
+        if line.startswith(_ATTRIBUTES_END):
+            return header
+
+        if line.startswith("#!"):
+            # Attribute lines; the command line block ends where they start
+            in_command = False
+            if not truncated and not line.startswith(_PREVIEW_IMAGE):
+                match = _ATTRIBUTE_RE.match(line)
+                if match:
+                    header.attributes[match.group(1)] = match.group(2)
+            continue
+
+        if not header.attributes:
+            header.header_lines.append(line)
+
+        if _COMMAND_LINE_MARKER in line:
+            in_command = True
+            continue
+        if not in_command or truncated:
+            continue
+
+        match = _PARAMETER_RE.match(line)
+        if match:
+            header.parameters.append((match.group(1), (match.group(2) or "").strip()))
+        elif not command_seen:
+            match = _COMMAND_RE.match(line)
+            if match:
+                command_seen = True
+                header.fme_exe, header.workspace_path = _split_command(match.group(1))
+    return header
+
+
+def _read_element(lines):
+    """Collect the attributes of a multi-line #! <ELEMENT up to its closing line."""
+    attributes = {}
+    for line, truncated in lines:
+        if line.startswith(_ELEMENT_END):
+            break
+        if truncated:
+            continue
+        match = _ATTRIBUTE_RE.match(line)
+        if match:
+            attributes[match.group(1)] = html.unescape(match.group(2))
+    return attributes
+
+
+def _read_feature_type(lines):
+    """Build an FMWFeatureType from a #! <FEATURE_TYPE element and its attributes."""
+    attributes = _read_element(lines)
+    feature_type = FMWFeatureType(
+        is_source=attributes.get("IS_SOURCE", "").lower() == "true",
+        name=attributes.get("NODE_NAME", ""),
+        keyword=attributes.get("KEYWORD", ""),
+        geometry_type=attributes.get("FEAT_GEOMTYPE", ""),
+        dynamic_schema=attributes.get("DYNAMIC_SCHEMA", "").lower() == "true",
+        schema_sources=attributes.get("DYNAMIC_SCHEMA_SOURCES", "")
+    )
+    for line, truncated in lines:
+        if line.startswith(_FEATURE_TYPE_END):
+            break
+        if truncated:
+            continue
+        match = _FEAT_ATTRIBUTE_RE.match(line)
+        # Format attributes such as fme_feature_type are exposed, not user data
+        if match and "EXPOSABLE_ATTR=" not in match.group(3):
+            feature_type.attributes.append((html.unescape(match.group(1)), match.group(2)))
+    return feature_type
+
+
+def _parse_gui_line(gui_line, default_value=""):
+    """Build an FMWParameter from a "GUI [OPTIONAL] TYPE NAME ..." line."""
+    parts = gui_line.split()
+    if len(parts) < 3 or parts[0] != "GUI":
+        return None
+    optional = parts[1] == "OPTIONAL"
+    offset = 2 if optional else 1
+    if len(parts) < offset + 2:
+        return None
+    return FMWParameter(
+        name=parts[offset + 1],
+        default_value=default_value,
+        gui_type=parts[offset],
+        optional=optional,
+        gui_line=gui_line
+    )
+
+
+def parse_workspace_lines(lines, workspace):
+    """Fill an FMWWorkspace from (line, truncated) tuples.
+
+    After the header, the <DATASETS>, <FEATURE_TYPES> and <GLOBAL_PARAMETERS>
+    blocks are read; parsing stops once the global parameters are closed. Workspaces
+    without that block fall back to the DEFAULT_MACRO/GUI lines that follow
+    the XML header.
+    """
+    parse_header_lines(lines, workspace)
+
+    in_datasets = False
+    in_macros = False
+    macros = {}
+    for line, truncated in lines:
+        if in_macros:
+            if line.startswith("INCLUDE") and macros:
+                break
+            if truncated:
+                continue
+            match = _MACRO_RE.match(line.rstrip("\r\n"))
+            if match:
+                macros[match.group(1)] = (match.group(2) or "").strip()
+            elif line.startswith("GUI ") and not line.startswith("GUI IGNORE"):
+                parameter = _parse_gui_line(line.strip())
+                if parameter is not None:
+                    workspace.published_parameters.append(parameter)
+            continue
+
+        if line.startswith(_DATASETS_START):
+            in_datasets = True
+        elif line.startswith(_DATASETS_END):
+            in_datasets = False
+        elif in_datasets and line == _DATASET_START:
+            attributes = _read_element(lines)
+            workspace.datasets.append(FMWDataset(
+                is_source=attributes.get("IS_SOURCE", "").lower() == "true",
+                format=attributes.get("FORMAT", ""),
+                dataset=attributes.get("DATASET", ""),
+                keyword=attributes.get("KEYWORD", ""),
+                coordsys=attributes.get("COORDSYS", "")
+            ))
+        elif line == _FEATURE_TYPE_START:
+            workspace.feature_types.append(_read_feature_type(lines))
+        elif line == _GLOBAL_PARAMETER_START:
+            attributes = _read_element(lines)
+            parameter = _parse_gui_line(attributes.get("GUI_LINE", ""), attributes.get("DEFAULT_VALUE", ""))
+            if parameter is not None:
+                workspace.published_parameters.append(parameter)
+        elif line.startswith(_GLOBAL_PARAMETERS_END):
+            return workspace
+        elif line.startswith(_WORKSPACE_END):
+            in_macros = True
+
+    # Macro fallback: attach default values to the GUI definitions, or use the
+    # macros themselves when the workspace has no GUI lines
+    for parameter in workspace.published_parameters:
+        parameter.default_value = macros.get(parameter.name, parameter.default_value)
+    if not workspace.published_parameters:
+        workspace.published_parameters = [FMWParameter(name, value) for name, value in macros.items()]
+    return workspace
+
+
+def read_fmw_header(path):
+    """Read the command line block and workspace attributes of an .fmw file."""
+    header = FMWHeader()
+    with open(path, "r", encoding="utf-8", errors="replace") as file:
+        parse_header_lines(iter_lines(file), header)
+    return header
+
+
+def read_workspace(path):
+    """Parse an .fmw file into an FMWWorkspace without using the cache."""
+    workspace = FMWWorkspace(path=path)
+    with open(path, "r", encoding="utf-8", errors="replace") as file:
+        parse_workspace_lines(iter_lines(file), workspace)
+    return workspace
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _load_workspace(path, size, mtime_ns):
+    # size and mtime_ns only take part in the cache key
+    return read_workspace(path)
+
+
+def load_workspace(path):
+    """Return the parsed workspace, re-parsing only when the file has changed."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return _load_workspace(path, stat.st_size, stat.st_mtime_ns)
@@ -0,0 +1,104 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Geometry-type fan-out on import. An FME output may mix single and
+# multi-part geometries, Z and M values or several geometry families, while a
+# memory layer holds exactly one WKB type. Features are sorted by geometry
+# family (point, line, polygon) and Z/M as they are read; each kind gets its
+# own multi-part memory layer, created when the kind first appears, and
+# single-part features are promoted to multi-part on the way in. One pass
+# both discovers the kinds and fills the layers, so no feature is refused for
+# not matching a guessed type, and Polygons and MultiPolygons share a layer.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+from qgis.core import Qgis, QgsVectorLayer, QgsWkbTypes
+
+
+def memory_layer_uri(wkb_type, crs):
+    """Memory provider URI for a layer of wkb_type, e.g. MultiPolygonZ?crs=EPSG:2154."""
+    geometry = "None" if wkb_type == Qgis.WkbType.NoGeometry else QgsWkbTypes.displayString(wkb_type)
+    crs_definition = crs.authid() or f"wkt:{crs.toWkt()}"
+    return f"{geometry}?crs={crs_definition}"
+
+
+class GeometryFanOut:
+    """A feature sink that sorts features into one memory layer per geometry kind.
+
+    Use it wherever copy_features takes a sink. Features without a geometry
+    join the layer of the only geometry type there is, or form a table of
+    their own when there are several. fallback_type is the type of the
+    single, empty layer of an output without features.
+    """
+
+    def __init__(self, fields, crs, name, fallback_type=Qgis.WkbType.Unknown):
+        self.fields = fields
+        self.crs = crs
+        self.name = name
+        self.fallback_type = fallback_type
+        self._layers = {}  # Multi-part WKB type (or NoGeometry) -> memory layer, in order of appearance
+
+    def addFeatures(self, features, flags=None):
+        groups = {}
+        for feature in features:
+            if feature.hasGeometry():
+                geometry = feature.geometry()
+                if not QgsWkbTypes.isMultiType(geometry.wkbType()):
+                    geometry.convertToMultiType()
+                    feature.setGeometry(geometry)
+                layer_type = _layer_type(geometry.wkbType())
+            else:
+                layer_type = Qgis.WkbType.NoGeometry
+            groups.setdefault(layer_type, []).append(feature)
+        for layer_type, group in groups.items():
+            ok, _ = self._layer(layer_type).dataProvider().addFeatures(group)
+            if not ok:
+                return False
+        return True
+
+    def _layer(self, layer_type):
+        layer = self._layers.get(layer_type)
+        if layer is None:
+            layer = QgsVectorLayer(memory_layer_uri(layer_type, self.crs), self.name, "memory")
+            layer.dataProvider().addAttributes(self.fields)
+            layer.updateFields()
+            self._layers[layer_type] = layer
+        return layer
+
+    def layers(self):
+        """The filled layers, named after their type when there are several."""
+        if not self._layers:
+            fallback = self.fallback_type
+            if fallback == Qgis.WkbType.Unknown:
+                fallback = Qgis.WkbType.NoGeometry
+            self._layer(_layer_type(fallback))
+        table = self._layers.get(Qgis.WkbType.NoGeometry)
+        typed = [layer for wkb_type, layer in self._layers.items() if wkb_type != Qgis.WkbType.NoGeometry]
+        if table is not None and len(typed) == 1:
+            # A layer of one type takes features without geometry as well
+            typed[0].dataProvider().addFeatures(list(table.getFeatures()))
+            del self._layers[Qgis.WkbType.NoGeometry]
+
+        if len(self._layers) > 1:
+            for wkb_type, layer in self._layers.items():
+                label = "No geometry" if wkb_type == Qgis.WkbType.NoGeometry else QgsWkbTypes.displayString(wkb_type)
+                layer.setName(f"{self.name} ({label})")
+        for layer in self._layers.values():
+            layer.updateExtents()
+        return list(self._layers.values())
+
+
+def _layer_type(wkb_type):
+    """The layer type for features of wkb_type: the linear multi-part type of the same family and Z/M.
+
+    Curved geometries share the layer of their family and are segmentized
+    by the memory provider.
+    """
+    if wkb_type == Qgis.WkbType.NoGeometry:
+        return wkb_type
+    return QgsWkbTypes.multiType(QgsWkbTypes.linearType(wkb_type))
@@ -0,0 +1,151 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Registry of the file formats used to hand data between QGIS and FME. Each
+# entry pairs the FME format short name (which also names the published
+# dataset parameters, e.g. SourceDataset_FLATGEOBUF) with the OGR driver
+# QGIS writes and reads it with.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class InterchangeFormat:
+    """A format both QGIS and FME can read and write."""
+
+    name: str         # FME format short name
+    label: str        # Name shown to the user
+    ogr_driver: str   # QgsVectorFileWriter driver name
+    extension: str    # File extension including the dot
+    layer_options: tuple = ()  # Layer creation options the format always needs
+    sidecars: tuple = ()       # Extensions of the other files that belong to a dataset
+    destination: bool = True   # False if FME writes a folder of datasets rather than the file
+
+    @property
+    def source_parameter(self):
+        return f"SourceDataset_{self.name}"
+
+    @property
+    def dest_parameter(self):
+        return f"DestDataset_{self.name}"
+
+
+GEOJSON = InterchangeFormat("GEOJSON", "GeoJSON", "GeoJSON", ".geojson")
+GEOPACKAGE = InterchangeFormat("OGCGEOPACKAGE", "GeoPackage", "GPKG", ".gpkg")
+FLATGEOBUF = InterchangeFormat("FLATGEOBUF", "FlatGeobuf", "FlatGeobuf", ".fgb")
+# The ESRISHAPE writer takes a folder, so Shapefile is only used for sources
+SHAPEFILE = InterchangeFormat("ESRISHAPE", "Esri Shapefile", "ESRI Shapefile", ".shp",
+                              sidecars=(".shx", ".dbf", ".prj", ".cpg"), destination=False)
+CSV = InterchangeFormat("CSV2", "CSV", "CSV", ".csv", ("GEOMETRY=AS_WKT",))
+
+FORMATS = {f.name: f for f in (GEOJSON, GEOPACKAGE, FLATGEOBUF, SHAPEFILE, CSV)}
+DEFAULT_FORMAT = GEOJSON
+
+
+@dataclass
+class GeoJSONOptions:
+    """Encoding options for a GeoJSON interchange, stored per workspace."""
+
+    precision: int = None   # Decimal places of coordinates, None for the driver default
+    rfc7946: bool = False   # Strict RFC 7946 output (always EPSG:4326)
+    sequence: bool = False  # Newline-delimited GeoJSON text sequence
+
+    @classmethod
+    def from_settings(cls, settings):
+        precision = settings.get("geojson_precision", "")
+        return cls(
+            precision=int(precision) if precision.isdigit() else None,
+            rfc7946=settings.get("geojson_rfc7946", "").lower() == "true",
+            sequence=settings.get("geojson_sequence", "").lower() == "true"
+        )
+
+    def to_settings(self):
+        """Key/value pairs for the workspace section; empty values remove the key."""
+        return {
+            "geojson_precision": "" if self.precision is None else str(self.precision),
+            "geojson_rfc7946": "true" if self.rfc7946 else "",
+            "geojson_sequence": "true" if self.sequence else "",
+        }
+
+    @property
+    def ogr_driver(self):
+        return "GeoJSONSeq" if self.sequence else GEOJSON.ogr_driver
+
+    def layer_options(self):
+        """Layer creation options for QgsVectorFileWriter.SaveVectorOptions.layerOptions."""
+        options = []
+        if self.precision is not None:
+            options.append(f"COORDINATE_PRECISION={self.precision}")
+        if self.rfc7946:
+            options.append("RFC7946=YES")
+        return options
+
+    def key(self):
+        return ";".join([self.ogr_driver] + self.layer_options())
+
+
+def format_for_path(path):
+    """Return the registered format of a file, judged by its extension, or None."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        return GEOJSON
+    for interchange in FORMATS.values():
+        if interchange.extension == extension:
+            return interchange
+    return None
+
+
+def dataset_files(path):
+    """Return the existing files of a file dataset: path and its format's sidecars, e.g. the .dbf of a .shp."""
+    files = [path]
+    interchange = format_for_path(path)
+    if interchange is not None:
+        stem = os.path.splitext(path)[0]
+        for extension in interchange.sidecars:
+            for candidate in (stem + extension, stem + extension.upper()):
+                if os.path.isfile(candidate):
+                    files.append(candidate)
+                    break
+    return files
+
+
+def get_format(name):
+    """Return the registered format for an FME short name, or None."""
+    return FORMATS.get((name or "").upper())
+
+
+def detect_all_formats(workspace):
+    """Return ([(format, parameter)...] for the readers, [...] for the writers).
+
+    Only datasets that use a registered format and take their path from a
+    published parameter are listed, each parameter once, in workspace order.
+    Writers of formats that cannot be a destination are left out.
+    """
+    sources, dests, seen = [], [], set()
+    for dataset in workspace.datasets:
+        interchange = get_format(dataset.format)
+        if interchange is None or not dataset.parameter or dataset.parameter in seen:
+            continue
+        if not dataset.is_source and not interchange.destination:
+            continue
+        seen.add(dataset.parameter)
+        (sources if dataset.is_source else dests).append((interchange, dataset.parameter))
+    return sources, dests
+
+
+def detect_formats(workspace):
+    """Return (source format, destination format) from a workspace's datasets.
+
+    The first reader and writer that use a registered format and take their
+    path from a published parameter win; None where nothing matches.
+    """
+    sources, dests = detect_all_formats(workspace)
+    return (sources[0] if sources else None), (dests[0] if dests else None)
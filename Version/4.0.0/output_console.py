@@ -0,0 +1,92 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Console model for the "Command Output" box. Incoming FME log lines are
+# batched and appended once per frame, the widget keeps only the most recent
+# lines, and the complete log is spilled to a file on disk.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+import os
+import re
+from collections import deque
+from datetime import datetime
+
+from qgis.PyQt.QtCore import QObject, QTimer, QUrl
+from qgis.PyQt.QtGui import QDesktopServices
+
+
+class OutputConsole(QObject):
+    """Batch log lines into a QPlainTextEdit with a bounded number of blocks."""
+
+    DEFAULT_MAX_LINES = 5000
+    FLUSH_INTERVAL = 50  # ms, roughly one flush per frame
+
+    def __init__(self, text_edit, log_dir, max_lines=DEFAULT_MAX_LINES, parent=None):
+        super().__init__(parent)
+        self.text_edit = text_edit
+        self.log_dir = log_dir
+        self.log_path = None
+        self._log_file = None
+
+        # The widget acts as a ring buffer: older blocks drop off the top
+        self.max_lines = max(1, max_lines)
+        self.text_edit.setMaximumBlockCount(self.max_lines)
+        # Lines beyond the visible limit would be trimmed anyway, so never queue them
+        self._pending = deque(maxlen=self.max_lines)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.FLUSH_INTERVAL)
+        self._timer.timeout.connect(self.flush)
+
+    def start_log(self, name):
+        """Clear the console and start a new full log file for a run."""
+        self.close_log()
+        self.clear()
+        os.makedirs(self.log_dir, exist_ok=True)
+        safe_name = re.sub(r"[^\w.-]+", "_", name) or "fme"
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.log_path = os.path.join(self.log_dir, f"{timestamp}_{safe_name}.log")
+        self._log_file = open(self.log_path, "w", encoding="utf-8")
+
+    def close_log(self):
+        """Flush pending lines and close the full log file."""
+        self.flush()
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+
+    def append_line(self, line):
+        """Queue a line for the widget and write it to the full log."""
+        self._pending.append(line)
+        if self._log_file is not None:
+            self._log_file.write(line + "\n")
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """Append all queued lines to the widget in a single call."""
+        self._timer.stop()
+        if self._log_file is not None:
+            self._log_file.flush()
+        if not self._pending:
+            return
+        self.text_edit.appendPlainText("\n".join(self._pending))
+        self._pending.clear()
+
+    def clear(self):
+        self._pending.clear()
+        self.text_edit.clear()
+
+    def open_full_log(self):
+        """Open the full log of the last run in the default text viewer."""
+        if not self.log_path or not os.path.exists(self.log_path):
+            return False
+        self.flush()
+        return QDesktopServices.openUrl(QUrl.fromLocalFile(self.log_path))
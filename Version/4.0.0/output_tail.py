@@ -0,0 +1,84 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Tailing of a CSV file while FME is still writing it. Each read takes in a
+# bounded slice of the file and returns only the records completed so far;
+# a record cut off at the end of a slice, including a quoted value that spans
+# lines, waits for the next read. Kept free of QGIS so it can be tested on
+# its own.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+import csv
+import io
+import os
+
+# Bytes read from an output per tick, so a large file is taken in over several ticks
+READ_SIZE = 1024 * 1024
+
+
+class OutputTail:
+    """Reads the complete records appended to a growing CSV file.
+
+    Each call reads at most max_bytes more of the file; a partly read
+    record is kept until the rest of it has been read.
+    """
+
+    def __init__(self, path, max_bytes=READ_SIZE):
+        self.path = path
+        self.max_bytes = max(1, max_bytes)
+        self.offset = 0
+        self.pending = b""  # Bytes read after the last complete record
+        self.header = None
+
+    def read_text(self):
+        """The complete records in the next max_bytes of the file, as text."""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return ""
+        if size < self.offset:
+            # The file was replaced
+            self.offset = 0
+            self.pending = b""
+            self.header = None
+        if size == self.offset:
+            return ""
+        with open(self.path, "rb") as file:
+            file.seek(self.offset)
+            data = file.read(self.max_bytes)
+        self.offset += len(data)
+        data = self.pending + data
+        end = self.record_end(data)
+        if end < 0:
+            self.pending = data
+            return ""
+        self.pending = data[end + 1:]
+        return data[:end + 1].decode("utf-8", errors="replace")
+
+    def record_end(self, data):
+        """Index of the last newline that ends a record in data, -1 if none does."""
+        # A quoted CSV value may span lines; a record ends where the quotes are balanced
+        end, quotes, position = -1, 0, 0
+        while True:
+            newline = data.find(b"\n", position)
+            if newline < 0:
+                return end
+            quotes += data.count(b'"', position, newline)
+            if quotes % 2 == 0:
+                end = newline
+            position = newline + 1
+
+    def read_records(self):
+        """New records as dicts of column name to value."""
+        text = self.read_text()
+        # Parsed as one text so quoted values keep their line breaks
+        rows = list(csv.reader(io.StringIO(text, newline="")))
+        if self.header is None and rows:
+            self.header = rows.pop(0)
+        return [dict(zip(self.header, row)) for row in rows if row]
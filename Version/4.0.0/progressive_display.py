@@ -0,0 +1,138 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Progressive display of a running translation. While FME writes a
+# record-sequential destination (CSV), the file is tailed from the main thread
+# at a fixed rate and each complete record is appended to a preview layer on
+# the map, so a long run shows its first results after seconds and a bad one
+# can be canceled early. The preview is removed when the run finishes and its
+# result is loaded. GeoJSON is not tailed: the FME writer puts all features in
+# one FeatureCollection, pretty-printed over many lines by default, so no
+# record can be read before the file is complete.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+from qgis.PyQt.QtCore import QMetaType, QObject, QTimer
+from qgis.core import (
+    QgsCoordinateReferenceSystem,
+    QgsFeature,
+    QgsField,
+    QgsFields,
+    QgsGeometry,
+    QgsProject,
+    QgsVectorLayer,
+    QgsWkbTypes
+)
+
+from .interchange_formats import CSV
+from .output_tail import READ_SIZE, OutputTail
+
+# Destination formats whose records can be read while the file grows
+PROGRESSIVE_FORMATS = (CSV,)
+# Columns of a CSV destination that hold WKT geometries
+_WKT_COLUMNS = ("wkt", "geometry", "the_geom")
+
+
+def supports_progressive(dest_format):
+    return dest_format in PROGRESSIVE_FORMATS
+
+
+class ProgressiveDisplay(QObject):
+    """Show the features of running FME outputs in a preview layer.
+
+    Created and driven on the main thread. paths are the destination files
+    being written (one per shard); crs is the CRS they are written in.
+    Every interval_ms each output is read on by at most read_size bytes,
+    the complete records are added and the layer is repainted once; once
+    batch_size records are gathered the remaining outputs wait for the next
+    tick, so a tick never blocks the UI for long however large the file.
+    """
+
+    def __init__(self, paths, name, crs=None, interval_ms=1000, batch_size=5000, read_size=READ_SIZE, parent=None):
+        super().__init__(parent)
+        self.tails = [OutputTail(path, read_size) for path in paths]
+        self.name = name
+        self.crs = crs if crs is not None and crs.isValid() else QgsCoordinateReferenceSystem("EPSG:4326")
+        self.batch_size = max(1, batch_size)
+        self.layer = None
+        self.layer_id = None
+        self.feature_count = 0
+        self.timer = QTimer(self)
+        self.timer.setInterval(max(100, interval_ms))
+        self.timer.timeout.connect(self.poll)
+
+    def start(self):
+        self.timer.start()
+
+    def stop(self):
+        """Stop tailing and remove the preview layer."""
+        self.timer.stop()
+        if self.layer_id is not None and QgsProject.instance().mapLayer(self.layer_id) is not None:
+            QgsProject.instance().removeMapLayer(self.layer_id)
+        self.layer = None
+        self.layer_id = None
+
+    def poll(self):
+        features = []
+        for tail in self.tails:
+            records = tail.read_records()
+            if records and self.layer is None:
+                self.create_layer(records[0])
+            if records:
+                features.extend(self.to_features(records))
+            if len(features) >= self.batch_size:
+                break
+        if not features or self.layer is None:
+            return
+        self.layer.dataProvider().addFeatures(features)
+        self.layer.updateExtents()
+        self.feature_count += len(features)
+        self.layer.setName(f"{self.name} ({self.feature_count} features so far)")
+        self.layer.triggerRepaint()
+
+    def create_layer(self, record):
+        """Add the preview layer, typed after the first record."""
+        fields = QgsFields()
+        geometry = self.csv_geometry(record)
+        for name in record:
+            if name.lower() not in _WKT_COLUMNS:
+                fields.append(QgsField(name, QMetaType.Type.QString))
+
+        if geometry.isNull():
+            geometry_type = "None"
+        else:
+            # Multi types take the single geometries too, once converted
+            geometry_type = QgsWkbTypes.displayString(QgsWkbTypes.multiType(QgsWkbTypes.flatType(geometry.wkbType())))
+        crs_definition = self.crs.authid() or f"wkt:{self.crs.toWkt()}"
+        self.layer = QgsVectorLayer(f"{geometry_type}?crs={crs_definition}", self.name, "memory")
+        self.layer.dataProvider().addAttributes(fields)
+        self.layer.updateFields()
+        QgsProject.instance().addMapLayer(self.layer)
+        self.layer_id = self.layer.id()
+
+    def to_features(self, records):
+        fields = self.layer.fields()
+        features = []
+        for record in records:
+            feature = QgsFeature(fields)
+            geometry = self.csv_geometry(record)
+            for name, value in record.items():
+                if fields.lookupField(name) >= 0:
+                    feature.setAttribute(name, value)
+            if not geometry.isNull():
+                geometry.convertToMultiType()
+                feature.setGeometry(geometry)
+            features.append(feature)
+        return features
+
+    @staticmethod
+    def csv_geometry(record):
+        for name, value in record.items():
+            if name.lower() in _WKT_COLUMNS and value:
+                return QgsGeometry.fromWkt(value)
+        return QgsGeometry()
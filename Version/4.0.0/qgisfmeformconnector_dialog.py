@@ -25,7 +25,8 @@ from qgis.PyQt.QtWidgets import (
     QFileDialog, QTableWidget, QTableWidgetItem, QHeaderView,
     QGroupBox, QTabWidget, QLabel, QSizePolicy, QToolButton, QMessageBox, QCheckBox,
     QLineEdit, QHBoxLayout, QTreeView, QSplitter, QDialog, QFrame,
-    QStyledItemDelegate, QScrollArea, QProgressBar, QPlainTextEdit, QAbstractItemView, QApplication
+    QStyledItemDelegate, QScrollArea, QProgressBar, QPlainTextEdit, QAbstractItemView, QApplication,
+    QComboBox, QSpinBox, QDoubleSpinBox
 )
 from qgis.PyQt.QtCore import Qt, QCoreApplication, QVariant, QEvent, pyqtSignal, QUrl, QTimer, QDir
 from qgis.PyQt.QtGui import QDesktopServices, QFileSystemModel
@@ -52,9 +53,10 @@ from qgis.core import (
     QgsCoordinateReferenceSystem,
     QgsVectorLayer,
     QgsProcessingUtils,
-    QgsApplication
+    QgsApplication,
+    QgsTask
 )
-from qgis.gui import QgsProcessingParameterDefinitionDialog
+from qgis.gui import QgsProcessingParameterDefinitionDialog, QgsMapLayerComboBox
 from processing.gui.wrappers import WidgetWrapper
 import re
 import uuid
@@ -67,6 +69,27 @@ import configparser
 import tempfile
 import sys
 
+from .fme_process import FMEProcessRunner
+from .fme_tasks import (
+    EXPORT_CRS, IMPORT_BATCH_SIZE, ExportLayerTask, FMERunTask, ShardedExportTask, TiledExportTask,
+    import_memory_layers, set_command_parameter, shard_path
+)
+from .export_cache import ExportCache
+from .result_cache import ResultCache
+from .result_store import ResultStore
+from .progressive_display import ProgressiveDisplay, supports_progressive
+from .source_passthrough import file_backed_source
+from .source_scope import SCOPES, SCOPE_EXPRESSION, SpatialIndexCache, build_scope
+from .spatial_tiles import MERGE_MODES, MERGE_OWNER
+from .stream_transport import StreamExportTask, stream_unavailable_reason
+from .attribute_join import join_key
+from .write_back import WriteBack
+from .workspace_settings import load_workspace_settings, save_workspace_setting, split_list
+from .output_console import OutputConsole
+from .fmw_parser import load_workspace
+from .workspace_index import WorkspaceCatalog, WorkspaceIndexTask
+from .interchange_formats import FORMATS, DEFAULT_FORMAT, GEOJSON, GeoJSONOptions, get_format, detect_all_formats
+
 class CollapsibleGroupBox(QGroupBox):
     def __init__(self, title):
         super().__init__()
@@ -109,23 +132,33 @@ class CollapsibleGroupBox(QGroupBox):
 
 class FMEFileLister(QWidget):
     directory_selected = pyqtSignal(str)
+    workspace_loaded = pyqtSignal(str)  # Path of a workspace whose tables have just been filled
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_file = None
+        self.selected_directory = None
         self.stored_command = None  # Store the current command
+        self.fme_runner = None  # FME process of the current run
+        self.workspace = None  # Parsed model of the selected workspace (shared, read-only)
+        self.interchange_override = None  # FME short name chosen by the user, None to follow the workspace
         self.is_loading_fmw = False
         
         # Set path for ini file
         self.ini_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'qgisfmeConnector.ini')
         self.dialog = parent  # Store reference to the dialog
         self.is_loading_fmw = False  # Flag to track if we're loading an FMW file
+        # Persistent catalog of the workspaces below the working directory
+        self.catalog_path = os.path.join(QgsApplication.qgisSettingsDirPath(), "fme_connector", "workspaces.sqlite")
+        self.workspace_catalog = None
+        self.index_task = None
         self.setLayout(self.build_ui())
+        self.load_working_directory()
         
     def filePath(self):
         return os.path.normpath(self.current_file) if self.current_file else ''
 
-    def add_parameter(self, name, value, required=False):
+    def add_parameter(self, name, value, required=False, update_display=True):
         """Add a parameter to the parameters table."""
         row = self.user_parameters_table.rowCount()
         self.user_parameters_table.insertRow(row)
@@ -150,7 +183,8 @@ class FMEFileLister(QWidget):
         self.user_parameters_table.resizeRowToContents(row)
         
         # Update command display
-        self.update_command_display()
+        if update_display:
+            self.update_command_display()
 
     def build_ui(self):
         # Add modern styling to the entire application
@@ -343,6 +377,15 @@ class FMEFileLister(QWidget):
         address_widget.setLayout(address_layout)
         directory_layout.addWidget(address_widget)
 
+        # Catalog search, e.g. "source:GEOJSON myCoef"
+        self.workspace_search = QLineEdit()
+        self.workspace_search.setPlaceholderText("Find workspaces: source:FORMAT dest:FORMAT parameter names...")
+        self.workspace_search.setClearButtonEnabled(True)
+        self.workspace_search.setStyleSheet(self.address_bar.styleSheet())
+        self.workspace_search.returnPressed.connect(self.search_workspaces)
+        self.workspace_search.textChanged.connect(lambda text: text or self.search_workspaces())
+        directory_layout.addWidget(self.workspace_search)
+
         # Create tree view
         self.file_model = QFileSystemModel()
         self.file_model.setFilter(
@@ -351,6 +394,11 @@ class FMEFileLister(QWidget):
         self.file_model.setRootPath('')  # Empty string shows all drives
         self.file_model.setNameFilters(['*.fmw'])
         self.file_model.setNameFilterDisables(False)
+        # Full paths of the catalog search results, None when not searching
+        self.search_matches = None
+        self.file_model.directoryLoaded.connect(
+            lambda path: self.search_matches is not None and self.apply_search_matches(self.file_model.index(path))
+        )
 
         self.tree_view = QTreeView()
         self.tree_view.setModel(self.file_model)
@@ -420,8 +468,8 @@ class FMEFileLister(QWidget):
 
         # Group for Source Dataset Table
         self.source_group = CollapsibleGroupBox("Source Datasets")
-        self.source_dataset_table = QTableWidget(0, 2)
-        self.source_dataset_table.setHorizontalHeaderLabels(["Dataset Format Type", "Dataset Full Path"])
+        self.source_dataset_table = QTableWidget(0, 3)
+        self.source_dataset_table.setHorizontalHeaderLabels(["Dataset Format Type", "Dataset Full Path", "QGIS Layer"])
         self.source_dataset_table.setColumnWidth(0, 150)
         self.source_dataset_table.setColumnWidth(1, 200)
         self.source_dataset_table.horizontalHeader().setStretchLastSection(True)
@@ -652,6 +700,8 @@ class FMEFileLister(QWidget):
             self.address_bar.setText(norm_path)
             self.selected_directory = norm_path
             self.directory_selected.emit(norm_path)  # Emit only if it's a directory
+            self.save_working_directory()
+            self.start_workspace_index(norm_path)
             self.check_folder_for_workspaces(norm_path)
             return  # Do nothing further when a folder is selected
 
@@ -688,21 +738,14 @@ class FMEFileLister(QWidget):
         elif norm_path.lower().endswith('.fmw'):
             self.selected_directory = os.path.dirname(norm_path)
             
-            # Check if workspace is compatible by checking parameters
-            required_params = ["SourceDataset_GEOJSON", "DestDataset_GEOJSON"]
-            found_params = []
-            for row in range(self.user_parameters_table.rowCount()):
-                param_name = self.user_parameters_table.item(row, 0).text()
-                if param_name and param_name in required_params:
-                    found_params.append(param_name)
-
-            is_compatible = len(found_params) >= len(required_params)
-
-            if hasattr(self, 'check_compatibility') and self.check_compatibility.isChecked() and not is_compatible:
-                missing_params = [p for p in required_params if p not in found_params]
-                self.set_status_label(f"Selected FMW file: {os.path.basename(norm_path)} (Incompatible: This workspace is missing the following required FME Workspace Parameters: {', '.join(missing_params)})", success=False)
-            else:
-                self.set_status_label(f"Selected FMW file: {os.path.basename(norm_path)}")
+            # Parsed once per file version; re-selecting a workspace hits the cache
+            try:
+                self.workspace = load_workspace(norm_path)
+            except OSError as e:
+                self.workspace = None
+                self.set_status_label(f"Error reading {os.path.basename(norm_path)}: {str(e)}", success=False)
+                return
+            self.set_status_label(f"Selected FMW file: {os.path.basename(norm_path)}")
             
             # Clear existing parameters
             self.user_parameters_table.setRowCount(0)
@@ -725,104 +768,82 @@ class FMEFileLister(QWidget):
         self.source_dataset_table.setRowCount(0)
         self.dest_dataset_table.setRowCount(0)
         
-        # Check workspace compatibility
+        if self.workspace is None or self.workspace.path != os.path.abspath(norm_path):
+            self.is_loading_fmw = False
+            return
+        workspace = self.workspace
+
+        # Check workspace compatibility against the same parsed model
         is_compatible, compatibility_message = self.check_workspace_compatibility(norm_path)
+
+        # Set the workspace header content
+        self.header_text.setPlainText("".join(workspace.header_lines))
+        self.adjust_header_height()
+
+        # Fill the tables without re-rendering the command for every row
+        tables = (self.source_dataset_table, self.dest_dataset_table, self.user_parameters_table)
+        for table in tables:
+            table.blockSignals(True)
+        try:
+            formats = {dataset.parameter: dataset.format for dataset in workspace.datasets}
+            for table, datasets in ((self.source_dataset_table, workspace.source_datasets),
+                                    (self.dest_dataset_table, workspace.dest_datasets)):
+                for name, value in datasets:
+                    row = table.rowCount()
+                    table.insertRow(row)
+                    table.setItem(row, 0, QTableWidgetItem(formats.get(name, "GEOJSON")))
+                    table.setItem(row, 1, QTableWidgetItem(value.strip('"').strip("'")))
+
+            for name, value in workspace.user_parameters:
+                self.add_parameter(name, value, update_display=False)
+        finally:
+            for table in tables:
+                table.blockSignals(False)
+
+        # Update dataset paths
+        self.update_dataset_paths()
         
-        with open(norm_path, 'r') as file:
-            lines = file.readlines()
-
-            header_lines = []
-            source_dataset_lines = []
-            dest_dataset_lines = []
-            user_parameter_lines = []
-            header_started = False
-            command_line_found = False
-
-            for index, line in enumerate(lines):
-                if line.startswith("#! <WORKSPACE"):
-                    header_started = True
-                if header_started:
-                    if line.startswith("#!   A0_PREVIEW_IMAGE"):
-                        break
-                    header_lines.append(line)
-
-                if "SourceDataset" in line:
-                    cleaned_line = line.replace("#          --", "").strip()
-                    parts = cleaned_line.split(" ", 1)
-                    if len(parts) == 2:
-                        source_dataset_lines.append((parts[0], parts[1]))
-
-                elif "DestDataset" in line:
-                    cleaned_line = line.replace("#          --", "").strip()
-                    parts = cleaned_line.split(" ", 1)
-                    if len(parts) == 2:
-                        dest_dataset_lines.append((parts[0], parts[1]))
-
-                elif re.search(r"#\s+--", line) and "SourceDataset" not in line and "DestDataset" not in line:
-                    cleaned_line = re.sub(r"#\s+--", "", line).strip()
-                    parts = cleaned_line.split(" ", 1)
-                    if len(parts) == 2:
-                        user_parameter_lines.append((parts[0], parts[1]))
-
-            # Set the workspace header content
-            self.header_text.setPlainText("".join(header_lines))
-            self.adjust_header_height()
-
-            # Update tables
-            for name, value in source_dataset_lines:
-                row = self.source_dataset_table.rowCount()
-                self.source_dataset_table.insertRow(row)
-                self.source_dataset_table.setItem(row, 0, QTableWidgetItem("GEOJSON"))
-                self.source_dataset_table.setItem(row, 1, QTableWidgetItem(value.strip('"').strip("'")))
-
-            for name, value in dest_dataset_lines:
-                row = self.dest_dataset_table.rowCount()
-                self.dest_dataset_table.insertRow(row)
-                self.dest_dataset_table.setItem(row, 0, QTableWidgetItem("GEOJSON"))
-                self.dest_dataset_table.setItem(row, 1, QTableWidgetItem(value.strip('"').strip("'")))
-
-            for name, value in user_parameter_lines:
-                self.add_parameter(name, value)
-
-            # Update dataset paths
-            self.update_dataset_paths()
-            
-            # Update command display
-            self.update_command_display()
-            
-            # Update status label with compatibility message if not compatible
-            if not is_compatible:
-                self.set_status_label(f"Selected FMW file: {os.path.basename(fmw_path)} ({compatibility_message})", success=False)
-            else:
-                self.set_status_label(f"Loaded workspace: {os.path.basename(fmw_path)}", success=True)
-            
-            # Reset the loading flag
-            self.is_loading_fmw = False
+        # Update command display
+        self.update_command_display()
+        
+        # Update status label with compatibility message if not compatible
+        if not is_compatible:
+            self.set_status_label(f"Selected FMW file: {os.path.basename(fmw_path)} ({compatibility_message})", success=False)
+        else:
+            self.set_status_label(f"Loaded workspace: {os.path.basename(fmw_path)}", success=True)
+        
+        # Reset the loading flag
+        self.is_loading_fmw = False
+        self.workspace_loaded.emit(norm_path)
 
     def update_dataset_paths(self):
         """Update the source and destination dataset paths with the correct filename format"""
         try:
+            sources, dests = self.interchange_dataset_lists()
+
             # Generate unique filenames
-            input_filename, output_filename = self.generate_filename_pair()
+            input_filename, output_filename = self.generate_filename_pair(sources[0][0].extension, dests[0][0].extension)
             
             # Get QGIS temp folder
             temp_folder = QgsApplication.qgisSettingsDirPath() + "temp/"
-                
-            # Create full paths
-            input_path = os.path.join(temp_folder, input_filename)
-            output_path = os.path.join(temp_folder, output_filename)
-            
-            # Update source dataset table
-            if self.source_dataset_table.rowCount() == 0:
-                self.source_dataset_table.insertRow(0)
-            self.source_dataset_table.setItem(0, 0, QTableWidgetItem("GEOJSON"))
-            self.source_dataset_table.setItem(0, 1, QTableWidgetItem(input_path))
-            
-            # Update destination dataset table
-            if self.dest_dataset_table.rowCount() == 0:
-                self.dest_dataset_table.insertRow(0)
-            self.dest_dataset_table.setItem(0, 0, QTableWidgetItem("GEOJSON"))
-            self.dest_dataset_table.setItem(0, 1, QTableWidgetItem(output_path))
+
+            # One row per dataset parameter; the parameter rides along in the format cell
+            for table, bindings, filename in ((self.source_dataset_table, sources, input_filename),
+                                              (self.dest_dataset_table, dests, output_filename)):
+                stem = os.path.splitext(filename)[0]
+                table.blockSignals(True)
+                try:
+                    table.setRowCount(len(bindings))
+                    for row, (interchange, param) in enumerate(bindings):
+                        path = os.path.join(temp_folder, f"{stem}{row + 1 if row else ''}{interchange.extension}")
+                        format_item = QTableWidgetItem(interchange.name)
+                        format_item.setData(Qt.ItemDataRole.UserRole, param)
+                        format_item.setToolTip(param)
+                        table.setItem(row, 0, format_item)
+                        table.setItem(row, 1, QTableWidgetItem(path))
+                finally:
+                    table.blockSignals(False)
+            self.update_source_layer_cells()
             
             # Update command display
             self.update_command_display()
@@ -830,8 +851,58 @@ class FMEFileLister(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error updating dataset paths: {str(e)}")
 
-    def generate_filename_pair(self):
-        """Generate a pair of input/output filenames with the format YYYYMMDD_xxxxx_line2_[input/output].geojson"""
+    def update_source_layer_cells(self):
+        """The first source reads the active layer; every other source gets a layer picker."""
+        active_item = QTableWidgetItem("Active layer")
+        active_item.setFlags(active_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        if self.source_dataset_table.rowCount() > 0:
+            self.source_dataset_table.setItem(0, 2, active_item)
+        for row in range(1, self.source_dataset_table.rowCount()):
+            if isinstance(self.source_dataset_table.cellWidget(row, 2), QgsMapLayerComboBox):
+                continue
+            combo = QgsMapLayerComboBox()
+            combo.setFilters(Qgis.LayerFilter.VectorLayer)
+            self.source_dataset_table.setCellWidget(row, 2, combo)
+
+    def source_bindings(self):
+        """Return [(format, parameter, path, layer)] for every source dataset row.
+
+        layer is None for the first row, which reads the active layer.
+        """
+        bindings = []
+        sources, _ = self.interchange_dataset_lists()
+        for row in range(self.source_dataset_table.rowCount()):
+            format_item = self.source_dataset_table.item(row, 0)
+            path_item = self.source_dataset_table.item(row, 1)
+            param = format_item.data(Qt.ItemDataRole.UserRole) if format_item else None
+            if not param and row < len(sources):
+                param = sources[row][1]
+            if not param:
+                continue
+            interchange = get_format(format_item.text() if format_item else None) or DEFAULT_FORMAT
+            combo = self.source_dataset_table.cellWidget(row, 2)
+            layer = combo.currentLayer() if row and isinstance(combo, QgsMapLayerComboBox) else None
+            bindings.append((interchange, param, path_item.text().strip('"') if path_item else "", layer))
+        return bindings
+
+    def dest_bindings(self):
+        """Return [(format, parameter, path)] for every destination dataset row."""
+        bindings = []
+        _, dests = self.interchange_dataset_lists()
+        for row in range(self.dest_dataset_table.rowCount()):
+            format_item = self.dest_dataset_table.item(row, 0)
+            path_item = self.dest_dataset_table.item(row, 1)
+            param = format_item.data(Qt.ItemDataRole.UserRole) if format_item else None
+            if not param and row < len(dests):
+                param = dests[row][1]
+            if not param:
+                continue
+            interchange = get_format(format_item.text() if format_item else None) or DEFAULT_FORMAT
+            bindings.append((interchange, param, path_item.text().strip('"') if path_item else ""))
+        return bindings
+
+    def generate_filename_pair(self, input_extension=".geojson", output_extension=".geojson"):
+        """Generate a pair of input/output filenames with the format YYYYMMDD_xxxxx_line2_[input/output].<extension>"""
         from datetime import datetime
         import random
         import string
@@ -855,8 +926,8 @@ class FMEFileLister(QWidget):
             base_filename = f"{current_date}_{random_chars}_line2"
             
             # Generate input and output filenames
-            input_filename = f"{base_filename}_input.geojson"
-            output_filename = f"{base_filename}_output.geojson"
+            input_filename = f"{base_filename}_input{input_extension}"
+            output_filename = f"{base_filename}_output{output_extension}"
             
             # Check if files already exist in the temp directory
             input_path = os.path.join(temp_folder, input_filename)
@@ -1008,6 +1079,39 @@ class FMEFileLister(QWidget):
         if dest_label and dest_path:
             dest_label.setText(f"Destination: {dest_path}")
             
+    def interchange_dataset_lists(self, workspace=None):
+        """Return ([(format, parameter)...], [(format, parameter)...]) for the sources and destinations.
+
+        A format chosen by the user wins and makes a single source and
+        destination, or just the source for a source-only format; otherwise
+        every reader and writer of the workspace with a registered format is
+        listed, falling back to one GeoJSON pair.
+        """
+        workspace = workspace or self.workspace
+        sources = dests = []
+        if workspace is not None:
+            sources, dests = detect_all_formats(workspace)
+        sources = sources or [(DEFAULT_FORMAT, DEFAULT_FORMAT.source_parameter)]
+        dests = dests or [(DEFAULT_FORMAT, DEFAULT_FORMAT.dest_parameter)]
+
+        override = get_format(self.interchange_override)
+        if override is not None:
+            # A source-only format such as Shapefile keeps the workspace's destination
+            if override.destination:
+                dests = [(override, override.dest_parameter)]
+            return [(override, override.source_parameter)], dests[:1]
+        return sources, dests
+
+    def interchange_datasets(self, workspace=None):
+        """Return ((format, parameter), (format, parameter)) for the first source and destination."""
+        sources, dests = self.interchange_dataset_lists(workspace)
+        return sources[0], dests[0]
+
+    def dataset_parameter_names(self, workspace=None):
+        """Return the published parameters that take the source and destination paths."""
+        (source_format, source_param), (dest_format, dest_param) = self.interchange_datasets(workspace)
+        return source_param, dest_param
+
     def build_fme_command(self):
         """Build the FME command with all parameters."""
         # Get paths from the paths table
@@ -1043,20 +1147,16 @@ class FMEFileLister(QWidget):
                 command_parts.append(f'--{param_name}')
                 command_parts.append(param_value)
         
-        # Add source and destination dataset parameters if they exist
-        if self.source_dataset_table and self.source_dataset_table.rowCount() > 0:
-            source_item = self.source_dataset_table.item(0, 1)
-            if source_item and source_item.text():
-                source_value = source_item.text().strip('"')
-                command_parts.append('--SourceDataset_GEOJSON')
-                command_parts.append(source_value)
-        
-        if self.dest_dataset_table and self.dest_dataset_table.rowCount() > 0:
-            dest_item = self.dest_dataset_table.item(0, 1)
-            if dest_item and dest_item.text():
-                dest_value = dest_item.text().strip('"')
-                command_parts.append('--DestDataset_GEOJSON')
-                command_parts.append(dest_value)
+        # Dataset parameter names come from the workspace model when one is loaded
+        for _, param, path, _ in self.source_bindings():
+            if path:
+                command_parts.append(f'--{param}')
+                command_parts.append(path)
+
+        for _, param, path in self.dest_bindings():
+            if path:
+                command_parts.append(f'--{param}')
+                command_parts.append(path)
         
         return command_parts
 
@@ -1196,92 +1296,120 @@ class FMEFileLister(QWidget):
             QMessageBox.warning(self, "Invalid Folder", "Selected path is not a folder")
             return
 
-        fmw_files = [f for f in os.listdir(folder_path) if f.lower().endswith('.fmw')]
-        if not fmw_files:
-            self.set_folder_status_label("This folder has no workspaces in it")
+        catalog = self.get_workspace_catalog()
+        if catalog is not None and catalog.is_indexed(folder_path):
+            # Answered from the catalog; the background index keeps it current
+            count = catalog.folder_count(folder_path)
+            subtree_count = catalog.folder_count(folder_path, recursive=True)
         else:
-            self.set_folder_status_label(f"This folder has {len(fmw_files)} workspaces")
+            count = len([f for f in os.listdir(folder_path) if f.lower().endswith('.fmw')])
+            subtree_count = None
 
-    def check_required_parameters(self):
-        """Check if required QGIS parameters exist in the parameter table."""
-        required_params = ["SourceDataset_GEOJSON", "DestDataset_GEOJSON"]
-        found_params = []
-        
-        for row in range(self.user_parameters_table.rowCount()):
-            param_name = self.user_parameters_table.item(row, 0)
-            if param_name and param_name.text().replace('*', '') in required_params:
-                found_params.append(param_name.text().replace('*', ''))
-        
-        if len(found_params) < len(required_params):
-            missing_params = [p for p in required_params if p not in found_params]
-            current_text = self.status_label.text()
-            if not current_text.endswith("(Incompatible)"):
-                self.set_status_label(f"{current_text} (Incompatible: Missing required parameters: {', '.join(missing_params)})", success=False)
-            
-            # Clear all tables
-            # self.paths_table.setRowCount(0)
-            self.user_parameters_table.setRowCount(0)
-
-    def update_directory_label(self, directory):
-        """Update the directory label with the current directory."""
-        self.directory_label.setText(directory)
-        self.check_folder_for_workspaces(directory)
-
-    def ensure_tmp_directory(self, directory):
-        """Ensure the temporary directory exists within the working directory."""
-        tmp_dir = os.path.join(directory, 'tmp')
-        if not os.path.exists(tmp_dir):
-            os.makedirs(tmp_dir)
-        return tmp_dir
+        if not count:
+            text = "This folder has no workspaces in it"
+        else:
+            text = f"This folder has {count} workspaces"
+        if subtree_count and subtree_count != count:
+            text += f" ({subtree_count} including subfolders)"
+        self.set_folder_status_label(text)
+
+    def get_workspace_catalog(self):
+        """Open the workspace catalog on first use; None if it cannot be opened."""
+        if self.workspace_catalog is None:
+            try:
+                self.workspace_catalog = WorkspaceCatalog(self.catalog_path)
+            except Exception as e:
+                QgsMessageLog.logMessage(f"Error opening workspace catalog: {str(e)}", "QGIS-FME Connector", Qgis.Warning)
+        return self.workspace_catalog
 
-    def open_directory(self, event):
-        """Open the current directory in file explorer."""
-        if self.selected_directory and os.path.exists(self.selected_directory):
-            QDesktopServices.openUrl(QUrl.fromLocalFile(self.selected_directory))
+    def start_workspace_index(self, directory):
+        """Refresh the catalog for a directory tree in the background."""
+        if not directory or not os.path.isdir(directory):
+            return
+        # Never walk a whole drive implicitly
+        if os.path.dirname(os.path.abspath(directory)) == os.path.abspath(directory):
+            return
+        if self.index_task is not None:
+            try:
+                active = self.index_task.status() in (QgsTask.TaskStatus.Queued, QgsTask.TaskStatus.OnHold, QgsTask.TaskStatus.Running)
+            except RuntimeError:
+                active = False  # Task already finished and deleted
+            if active:
+                running_root = os.path.join(os.path.abspath(self.index_task.root), '')
+                if os.path.join(os.path.abspath(directory), '').startswith(running_root):
+                    return
+                self.index_task.cancel()
+            self.index_task = None
 
-    def load_working_directory(self):
-        """Load the last working directory from the config file."""
-        try:
-            config = configparser.ConfigParser()
-            if os.path.exists(self.config_file):
-                config.read(self.config_file)
-                if 'Settings' in config and 'WorkingDirectory' in config['Settings']:
-                    directory = config['Settings']['WorkingDirectory']
-                    if os.path.exists(directory):
-                        self.selected_directory = directory
-                        self.update_directory_label(directory)
-                        self.check_folder_for_workspaces(directory)
-        except Exception as e:
-            QgsMessageLog.logMessage(f"Error loading working directory: {str(e)}", "QGIS-FME Connector", Qgis.Warning)
+        config = configparser.ConfigParser()
+        config.read(self.ini_file_path)
+        task = WorkspaceIndexTask(
+            directory,
+            self.catalog_path,
+            max_workers=config.getint('Index', 'workers', fallback=4)
+        )
+        task.indexed.connect(self.on_workspace_index_updated)
+        self.index_task = task
+        QgsApplication.taskManager().addTask(task)
+
+    def on_workspace_index_updated(self, root, changed, total):
+        self.index_task = None
+        if self.selected_directory and os.path.isdir(self.selected_directory):
+            self.check_folder_for_workspaces(self.selected_directory)
+        if self.workspace_search.text().strip():
+            self.search_workspaces()
+
+    def search_workspaces(self):
+        """Filter the tree to the catalogued workspaces matching the search text.
+
+        Terms are "source:FORMAT", "dest:FORMAT" and published parameter
+        names, all of which must match.
+        """
+        text = self.workspace_search.text().strip()
+        if not text:
+            self.search_matches = None
+            self.file_model.setNameFilters(['*.fmw'])
+            self.apply_search_matches()
+            return
 
-    def save_working_directory(self):
-        """Save the current working directory to the config file."""
-        try:
-            config = configparser.ConfigParser()
-            if os.path.exists(self.config_file):
-                config.read(self.config_file)
-            
-            if 'Settings' not in config:
-                config['Settings'] = {}
-            
-            config['Settings']['WorkingDirectory'] = self.selected_directory
-            
-            with open(self.config_file, 'w') as configfile:
-                config.write(configfile)
-        except Exception as e:
-            QgsMessageLog.logMessage(f"Error saving working directory: {str(e)}", "QGIS-FME Connector", Qgis.Warning)
+        source_format = dest_format = None
+        parameters = []
+        for term in text.split():
+            key, sep, value = term.partition(':')
+            if sep and key.lower() == 'source':
+                source_format = value
+            elif sep and key.lower() == 'dest':
+                dest_format = value
+            else:
+                parameters.append(term)
 
-    def check_folder_for_workspaces(self, folder_path):
-        """Check the selected folder for FMW workspaces and update the status label."""
-        if not os.path.isdir(folder_path):
-            QMessageBox.warning(self, "Invalid Folder", "Selected path is not a folder")
+        catalog = self.get_workspace_catalog()
+        if catalog is None:
             return
-
-        fmw_files = [f for f in os.listdir(folder_path) if f.lower().endswith('.fmw')]
-        if not fmw_files:
-            self.set_folder_status_label("This folder has no workspaces in it")
-        else:
-            self.set_folder_status_label(f"This folder has {len(fmw_files)} workspaces")
+        matches = catalog.find(
+            root=self.selected_directory or None,
+            source_format=source_format,
+            dest_format=dest_format,
+            parameters=parameters
+        )
+        # QFileSystemModel filters by file name; same-named workspaces elsewhere are hidden by path
+        names = sorted({os.path.basename(path) for path in matches})
+        self.search_matches = set(matches)
+        self.file_model.setNameFilters(names or ['<no match>'])
+        self.apply_search_matches()
+        self.set_folder_status_label(f"{len(matches)} workspaces match \"{text}\"")
+
+    def apply_search_matches(self, parent=None):
+        """Hide the loaded workspace files below parent that are not search matches, show all others."""
+        if parent is None:
+            parent = self.tree_view.rootIndex()
+        for row in range(self.file_model.rowCount(parent)):
+            index = self.file_model.index(row, 0, parent)
+            if self.file_model.isDir(index):
+                self.apply_search_matches(index)
+                continue
+            path = os.path.normcase(os.path.abspath(self.file_model.filePath(index)))
+            self.tree_view.setRowHidden(row, parent, self.search_matches is not None and path not in self.search_matches)
 
     def check_required_parameters(self):
         """Check if required QGIS parameters exist in the parameter table."""
@@ -1324,13 +1452,17 @@ class FMEFileLister(QWidget):
         """Load the last working directory from the config file."""
         try:
             config = configparser.ConfigParser()
-            if os.path.exists(self.config_file):
-                config.read(self.config_file)
+            if os.path.exists(self.ini_file_path):
+                config.read(self.ini_file_path)
                 if 'Settings' in config and 'WorkingDirectory' in config['Settings']:
                     directory = config['Settings']['WorkingDirectory']
-                    if os.path.exists(directory):
+                    if os.path.isdir(directory):
                         self.selected_directory = directory
-                        self.update_directory_label(directory)
+                        self.address_bar.setText(directory)
+                        index = self.file_model.index(directory)
+                        self.tree_view.setCurrentIndex(index)
+                        self.tree_view.scrollTo(index)
+                        self.start_workspace_index(directory)
                         self.check_folder_for_workspaces(directory)
         except Exception as e:
             QgsMessageLog.logMessage(f"Error loading working directory: {str(e)}", "QGIS-FME Connector", Qgis.Warning)
@@ -1339,15 +1471,15 @@ class FMEFileLister(QWidget):
         """Save the current working directory to the config file."""
         try:
             config = configparser.ConfigParser()
-            if os.path.exists(self.config_file):
-                config.read(self.config_file)
+            if os.path.exists(self.ini_file_path):
+                config.read(self.ini_file_path)
             
             if 'Settings' not in config:
                 config['Settings'] = {}
             
             config['Settings']['WorkingDirectory'] = self.selected_directory
             
-            with open(self.config_file, 'w') as configfile:
+            with open(self.ini_file_path, 'w') as configfile:
                 config.write(configfile)
         except Exception as e:
             QgsMessageLog.logMessage(f"Error saving working directory: {str(e)}", "QGIS-FME Connector", Qgis.Warning)
@@ -1506,112 +1638,64 @@ class FMEFileLister(QWidget):
             # Clear previous output
             output_text.clear()
             
-            # Create process (shell=False for security)
-            creationflags = subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
-            process = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                shell=False,
-                text=True,
-                creationflags=creationflags
-            )
-            
-            # Create a QTimer to check process output
-            timer = QTimer()
+            # Stop a previous run that is still going
+            if self.fme_runner is not None and self.fme_runner.is_running():
+                self.fme_runner.kill()
+
+            # Run FME through QProcess; both streams are drained as data arrives
+            self.fme_runner = FMEProcessRunner(command, self)
+            self.fme_runner.output_line.connect(output_text.appendPlainText)
+            self.fme_runner.error_line.connect(output_text.appendPlainText)
             
-            def check_output():
-                # Read any new output
-                output = process.stdout.readline()
-                if output:
-                    output_text.appendPlainText(output.strip())
-                    QApplication.processEvents()
+            def on_finished(exit_code):
+                progress_bar.hide()
                 
-                # If process has finished
-                if process.poll() is not None:
-                    timer.stop()
-                    progress_bar.hide()
-                    
-                    # Get any remaining output
-                    remaining_output, errors = process.communicate()
-                    if remaining_output:
-                        output_text.appendPlainText(remaining_output.strip())
-                    if errors:
-                        output_text.appendPlainText("Errors:")
-                        output_text.appendPlainText(errors.strip())
-                    
-                    # Check if the process was successful
-                    if process.returncode == 0:
-                        if os.path.exists(dest_path):
-                            # Success - show green status
-                            status_label.setStyleSheet("""
-                                QLabel {
-                                    padding: 8px;
-                                    border-radius: 4px;
-                                    font-weight: 500;
-                                    background-color: #e8f5e9;
-                                    border: 1px solid #c8e6c9;
-                                    color: #2e7d32;
-                                }
-                            """)
-                            status_label.setText("Translation completed successfully!")
-                            
-                            # Check if we should load as scratch layer or regular layer
-                            if self.scratch_layer_checkbox.isChecked():
-                                # Create a memory layer by copying features from the GeoJSON file
-                                source_layer = QgsVectorLayer(dest_path, "temp_source", "ogr")
-                                if not source_layer.isValid():
-                                    QMessageBox.warning(self, "Warning", "Failed to load source GeoJSON file")
-                                else:
-                                    # Create an empty memory layer with same CRS and fields
-                                    geometry_type = source_layer.geometryType()
-                                    geom_str = "Point"
-                                    if geometry_type == 1:  # Line
-                                        geom_str = "LineString"
-                                    elif geometry_type == 2:  # Polygon
-                                        geom_str = "Polygon"
-                                        
-                                    memory_layer = QgsVectorLayer(f"{geom_str}?crs=" + source_layer.crs().authid(), "FME_Form_Output", "memory")
-                                    
-                                    # Copy fields from source layer
-                                    memory_layer.dataProvider().addAttributes(source_layer.fields())
-                                    memory_layer.updateFields()
-                                    
-                                    # Copy features directly through the provider (no editing needed)
-                                    features = [f for f in source_layer.getFeatures()]
-                                    memory_layer.dataProvider().addFeatures(features)
-                                    
-                                    # Add to project
-                                    QgsProject.instance().addMapLayer(memory_layer)
-                                    
-                                    status_label.setText("Translation successful! Layer added to map as scratch layer.")
-                                    self.fmwf_file.update_dataset_paths()
+                # Check if the process was successful
+                if exit_code == 0:
+                    if os.path.exists(dest_path):
+                        # Success - show green status
+                        status_label.setStyleSheet("""
+                            QLabel {
+                                padding: 8px;
+                                border-radius: 4px;
+                                font-weight: 500;
+                                background-color: #e8f5e9;
+                                border: 1px solid #c8e6c9;
+                                color: #2e7d32;
+                            }
+                        """)
+                        status_label.setText("Translation completed successfully!")
+                        
+                        # Check if we should load as scratch layer or regular layer
+                        if self.scratch_layer_checkbox.isChecked():
+                            # Create a memory layer by copying features from the GeoJSON file
+                            source_layer = QgsVectorLayer(dest_path, "temp_source", "ogr")
+                            if not source_layer.isValid():
+                                QMessageBox.warning(self, "Warning", "Failed to load source GeoJSON file")
                             else:
-                                # Load the physical GeoJSON file directly
-                                layer = QgsVectorLayer(dest_path, "FME_Form_Output", "ogr")
-                                if not layer.isValid():
-                                    QMessageBox.warning(self, "Warning", "Failed to load GeoJSON file")
+                                # Copy the features into memory layers, one per geometry type
+                                memory_layers = import_memory_layers(source_layer, "FME_Form_Output")
+                                if memory_layers is None:
+                                    QMessageBox.warning(self, "Warning", "Failed to copy the features of the output file")
                                 else:
-                                    # Add to project
-                                    QgsProject.instance().addMapLayer(layer)
-                                    
-                                    status_label.setText("Translation successful! Layer added to map from file.")
+                                    for memory_layer in memory_layers:
+                                        QgsProject.instance().addMapLayer(memory_layer)
+                                
+                                    status_label.setText("Translation successful! Layer added to map as scratch layer.")
                                     self.fmwf_file.update_dataset_paths()
                         else:
-                            # Failed - output file not found
-                            status_label.setStyleSheet("""
-                                QLabel {
-                                    padding: 8px;
-                                    border-radius: 4px;
-                                    font-weight: 500;
-                                    background-color: #ffebee;
-                                    border: 1px solid #ffcdd2;
-                                    color: #c62828;
-                                }
-                            """)
-                            status_label.setText("Translation failed: Output file not found")
+                            # Load the physical GeoJSON file directly
+                            layer = QgsVectorLayer(dest_path, "FME_Form_Output", "ogr")
+                            if not layer.isValid():
+                                QMessageBox.warning(self, "Warning", "Failed to load GeoJSON file")
+                            else:
+                                # Add to project
+                                QgsProject.instance().addMapLayer(layer)
+                                
+                                status_label.setText("Translation successful! Layer added to map from file.")
+                                self.fmwf_file.update_dataset_paths()
                     else:
-                        # Failed - process error
+                        # Failed - output file not found
                         status_label.setStyleSheet("""
                             QLabel {
                                 padding: 8px;
@@ -1622,11 +1706,23 @@ class FMEFileLister(QWidget):
                                 color: #c62828;
                             }
                         """)
-                        status_label.setText("Translation failed!")
-            
-            # Connect timer to check_output
-            timer.timeout.connect(check_output)
-            timer.start(100)  # Check every 100ms
+                        status_label.setText("Translation failed: Output file not found")
+                else:
+                    # Failed - process error
+                    status_label.setStyleSheet("""
+                        QLabel {
+                            padding: 8px;
+                            border-radius: 4px;
+                            font-weight: 500;
+                            background-color: #ffebee;
+                            border: 1px solid #ffcdd2;
+                            color: #c62828;
+                        }
+                    """)
+                    status_label.setText("Translation failed!")
+            
+            self.fme_runner.finished.connect(on_finished)
+            self.fme_runner.start()
             
         except Exception as e:
             error_details = traceback.format_exc()
@@ -1679,17 +1775,18 @@ class FMEFileLister(QWidget):
     def check_workspace_compatibility(self, fmw_path):
         """Check if the FMW workspace has the required parameters."""
         try:
-            # Define required parameters
-            required_params = ["SourceDataset_GEOJSON", "DestDataset_GEOJSON"]
+            # Shares the cached parse with the tables and the command builder
+            workspace = load_workspace(fmw_path)
+            parameter_names = workspace.parameter_names()
+
+            # Required parameters follow the interchange formats of the workspace
+            sources, dests = self.interchange_dataset_lists(workspace)
+            required_params = [param for _, param in sources + dests]
             found_params = []
             
-            # Read the workspace file
-            with open(fmw_path, 'r') as file:
-                content = file.read()
-            
             # Check for each required parameter
             for param in required_params:
-                if param in content:
+                if param in parameter_names:
                     found_params.append(param)
             
             # Check if all required parameters are found
@@ -1883,9 +1980,35 @@ class QGISFMEFormConnectorDialog(QDialog):
         
         # Set path for ini file
         self.ini_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'qgisfmeConnector.ini')
+        # Global settings, read once for building the dialog
+        config = configparser.ConfigParser(interpolation=None)
+        config.read(self.ini_file_path)
         
         # Install global exception handler for PyQt errors
         sys.excepthook = self.handle_exception
+
+        # Task chain of the current run
+        self.active_run = None
+        self.progressive_display = None  # Preview of the output while FME writes it
+
+        # Source datasets of earlier runs, reused while the layer is unchanged
+        self.export_cache = ExportCache()
+        self.active_exports = []  # (export cache key, export task) of the running translation
+        self.spatial_index_cache = SpatialIndexCache()
+
+        # Outputs of earlier runs, keyed on workspace, parameters and input content
+        self.result_cache = ResultCache(
+            os.path.join(QgsApplication.qgisSettingsDirPath(), "temp", "fme_result_cache"),
+            max_mb=config.getint('Cache', 'result_cache_mb', fallback=ResultCache.DEFAULT_MAX_MB)
+        )
+        # Results too large for a scratch layer, kept while a layer uses them
+        self.result_store = ResultStore.from_config(
+            config, os.path.join(QgsApplication.qgisSettingsDirPath(), "temp", "fme_results")
+        )
+        self.result_store.purge(
+            [layer.source().split("|")[0] for layer in QgsProject.instance().mapLayers().values()],
+            keep_days=config.getint('Results', 'keep_days', fallback=7)
+        )
         
         self.setWindowTitle('QGIS - FME Form Connector')
         # self.setWindowModality(Qt.WindowModality.WindowModal)  # Removed: handled with NonModal and parent above
@@ -1972,7 +2095,183 @@ class QGISFMEFormConnectorDialog(QDialog):
                 padding: 5px;
             }
         """)
-        self.right_layout.addWidget(self.scratch_layer_checkbox)
+
+        # Skip the result cache, e.g. when the workspace reads data outside the source dataset
+        self.bypass_cache_checkbox = QCheckBox("Bypass Result Cache")
+        self.bypass_cache_checkbox.setObjectName("bypass_cache_checkbox")
+        self.bypass_cache_checkbox.setToolTip("Always run FME, even if an identical run has been cached")
+        self.bypass_cache_checkbox.setStyleSheet(self.scratch_layer_checkbox.styleSheet())
+
+        # Write the source in the layer's own CRS instead of reprojecting to EPSG:4326
+        self.native_crs_checkbox = QCheckBox("Keep Native CRS")
+        self.native_crs_checkbox.setObjectName("native_crs_checkbox")
+        self.native_crs_checkbox.setToolTip("Send the layer to FME in its own CRS and load the result without reprojection")
+        self.native_crs_checkbox.setStyleSheet(self.scratch_layer_checkbox.styleSheet())
+        self.native_crs_checkbox.setChecked(config.getboolean('Export', 'native_crs', fallback=False))
+        self.native_crs_checkbox.toggled.connect(self.save_native_crs)
+
+        # Split the features over several concurrent FME processes
+        self.sharded_run_checkbox = QCheckBox("Sharded Run")
+        self.sharded_run_checkbox.setObjectName("sharded_run_checkbox")
+        self.sharded_run_checkbox.setToolTip("Split the features into chunks and run one FME process per chunk. "
+                                             "Only for workspaces that treat each feature on its own.")
+        self.sharded_run_checkbox.setStyleSheet(self.scratch_layer_checkbox.styleSheet())
+        self.sharded_run_checkbox.setChecked(config.getboolean('Sharding', 'enabled', fallback=False))
+        self.sharded_run_checkbox.toggled.connect(self.save_sharded_run)
+
+        # Tail a record-sequential output and draw its features while FME is still writing
+        self.progressive_checkbox = QCheckBox("Show While Running")
+        self.progressive_checkbox.setObjectName("progressive_checkbox")
+        self.progressive_checkbox.setToolTip("Draw the output features on the map as FME writes them. "
+                                             "Only for CSV destinations; a GeoJSON output is one "
+                                             "FeatureCollection that cannot be read until it is complete.")
+        self.progressive_checkbox.setStyleSheet(self.scratch_layer_checkbox.styleSheet())
+        self.progressive_checkbox.setChecked(config.getboolean('Progressive', 'enabled', fallback=False))
+        self.progressive_checkbox.toggled.connect(self.save_progressive_display)
+
+        run_options_layout = QHBoxLayout()
+        run_options_layout.addWidget(self.scratch_layer_checkbox)
+        run_options_layout.addWidget(self.bypass_cache_checkbox)
+        run_options_layout.addWidget(self.native_crs_checkbox)
+        run_options_layout.addWidget(self.sharded_run_checkbox)
+        run_options_layout.addWidget(self.progressive_checkbox)
+        run_options_layout.addStretch()
+
+        # Interchange format between QGIS and FME; "Auto" follows the workspace datasets
+        run_options_layout.addWidget(QLabel("Interchange Format:"))
+        self.interchange_combo = QComboBox()
+        self.interchange_combo.setObjectName("interchange_combo")
+        self.interchange_combo.addItem("Auto (from workspace)", None)
+        for interchange in FORMATS.values():
+            label = interchange.label if interchange.destination else f"{interchange.label} (source only)"
+            self.interchange_combo.addItem(label, interchange.name)
+        saved_format = config.get('Interchange', 'format', fallback='auto').upper()
+        index = self.interchange_combo.findData(saved_format)
+        self.interchange_combo.setCurrentIndex(max(index, 0))
+        self.fmwf_file.interchange_override = self.interchange_combo.currentData()
+        self.interchange_combo.currentIndexChanged.connect(self.on_interchange_format_changed)
+        run_options_layout.addWidget(self.interchange_combo)
+        self.right_layout.addLayout(run_options_layout)
+
+        # Which features of the active layer are sent to FME
+        scope_layout = QHBoxLayout()
+        scope_layout.addWidget(QLabel("Source Features:"))
+        self.scope_combo = QComboBox()
+        self.scope_combo.setObjectName("scope_combo")
+        for scope, label in SCOPES:
+            self.scope_combo.addItem(label, scope)
+        scope_layout.addWidget(self.scope_combo)
+        self.scope_expression = QLineEdit()
+        self.scope_expression.setObjectName("scope_expression")
+        self.scope_expression.setPlaceholderText('QGIS expression, e.g. "area" > 1000')
+        self.scope_expression.setVisible(False)
+        scope_layout.addWidget(self.scope_expression, 1)
+        scope_layout.addStretch()
+        self.scope_combo.currentIndexChanged.connect(
+            lambda index: self.scope_expression.setVisible(self.scope_combo.itemData(index) == SCOPE_EXPRESSION)
+        )
+        self.right_layout.addLayout(scope_layout)
+
+        # Attributes sent to FME; empty follows the attributes the workspace reads
+        columns_layout = QHBoxLayout()
+        columns_layout.addWidget(QLabel("Columns:"))
+        self.columns_edit = QLineEdit()
+        self.columns_edit.setObjectName("columns_edit")
+        self.columns_edit.setToolTip("Comma separated field names to export for this workspace, * for all fields. "
+                                     "Leave empty to export the attributes the workspace reader declares.")
+        self.columns_edit.editingFinished.connect(self.save_column_override)
+        columns_layout.addWidget(self.columns_edit, 1)
+        # Result fields that get an attribute index on import
+        columns_layout.addWidget(QLabel("Index Fields:"))
+        self.index_fields_edit = QLineEdit()
+        self.index_fields_edit.setObjectName("index_fields_edit")
+        self.index_fields_edit.setToolTip("Comma separated output field names to index when the result is loaded, "
+                                          "for faster filters and joins. Scratch layers only get a spatial index.")
+        self.index_fields_edit.editingFinished.connect(self.save_index_fields)
+        columns_layout.addWidget(self.index_fields_edit)
+        self.attributes_only_checkbox = QCheckBox("Attributes Only")
+        self.attributes_only_checkbox.setObjectName("attributes_only_checkbox")
+        self.attributes_only_checkbox.setToolTip("Send a table without geometries and join the attributes FME returns "
+                                                 "onto the layer. The workspace must pass the key column "
+                                                 "(the layer's key field or qgis_fid) through unchanged.")
+        self.attributes_only_checkbox.toggled.connect(self.save_attributes_only)
+        columns_layout.addWidget(self.attributes_only_checkbox)
+        self.write_back_checkbox = QCheckBox("Write Back")
+        self.write_back_checkbox.setObjectName("write_back_checkbox")
+        self.write_back_checkbox.setToolTip("Write the changed attributes and geometries back to the layer instead of "
+                                            "adding a new layer. Layers in edit mode get one undoable change. The "
+                                            "workspace must pass the key column through unchanged.")
+        self.write_back_checkbox.toggled.connect(self.save_write_back)
+        columns_layout.addWidget(self.write_back_checkbox)
+        self.right_layout.addLayout(columns_layout)
+
+        # Encoding of the GeoJSON interchange, remembered per workspace
+        geojson_layout = QHBoxLayout()
+        geojson_layout.addWidget(QLabel("GeoJSON Precision:"))
+        self.geojson_precision_spin = QSpinBox()
+        self.geojson_precision_spin.setObjectName("geojson_precision_spin")
+        self.geojson_precision_spin.setRange(-1, 15)
+        self.geojson_precision_spin.setSpecialValueText("Default")
+        self.geojson_precision_spin.setValue(-1)
+        self.geojson_precision_spin.setToolTip("Decimal places of exported coordinates. "
+                                               "3 keeps millimetres in metres, 8 keeps about a millimetre in degrees.")
+        geojson_layout.addWidget(self.geojson_precision_spin)
+        self.geojson_rfc7946_checkbox = QCheckBox("RFC 7946")
+        self.geojson_rfc7946_checkbox.setObjectName("geojson_rfc7946_checkbox")
+        self.geojson_rfc7946_checkbox.setToolTip("Write strict RFC 7946 GeoJSON (WGS 84, 7 decimals unless set)")
+        geojson_layout.addWidget(self.geojson_rfc7946_checkbox)
+        self.geojson_sequence_checkbox = QCheckBox("Newline-delimited")
+        self.geojson_sequence_checkbox.setObjectName("geojson_sequence_checkbox")
+        self.geojson_sequence_checkbox.setToolTip("Write one feature per line (GeoJSON text sequence) instead of a "
+                                                  "FeatureCollection; the workspace reader must accept it")
+        geojson_layout.addWidget(self.geojson_sequence_checkbox)
+        self.stream_source_checkbox = QCheckBox("Stream to FME")
+        self.stream_source_checkbox.setObjectName("stream_source_checkbox")
+        self.stream_source_checkbox.setToolTip("Write the features through a named pipe that FME reads while the export "
+                                               "runs. The workspace reader must accept newline-delimited GeoJSON and "
+                                               "read the file once; falls back to a file where pipes are unavailable.")
+        geojson_layout.addWidget(self.stream_source_checkbox)
+        geojson_layout.addStretch()
+        self.geojson_precision_spin.valueChanged.connect(self.save_geojson_options)
+        self.geojson_rfc7946_checkbox.toggled.connect(self.save_geojson_options)
+        self.geojson_sequence_checkbox.toggled.connect(self.save_geojson_options)
+        self.stream_source_checkbox.toggled.connect(self.save_geojson_options)
+        self.right_layout.addLayout(geojson_layout)
+
+        # How a sharded run splits the layer, remembered per workspace
+        sharding_layout = QHBoxLayout()
+        sharding_layout.addWidget(QLabel("Shard By:"))
+        self.shard_mode_combo = QComboBox()
+        self.shard_mode_combo.setObjectName("shard_mode_combo")
+        self.shard_mode_combo.addItem("Feature id ranges", "features")
+        self.shard_mode_combo.addItem("Spatial tiles", "tiles")
+        self.shard_mode_combo.setToolTip("Use spatial tiles for workspaces that look at neighbouring features, "
+                                         "e.g. dissolve, snapping or clustering")
+        sharding_layout.addWidget(self.shard_mode_combo)
+        sharding_layout.addWidget(QLabel("Halo:"))
+        self.tile_halo_spin = QDoubleSpinBox()
+        self.tile_halo_spin.setObjectName("tile_halo_spin")
+        self.tile_halo_spin.setRange(0, 1e9)
+        self.tile_halo_spin.setDecimals(6)
+        self.tile_halo_spin.setToolTip("Distance around each tile, in export CRS units, whose features are "
+                                       "sent along as context. Use at least the workspace's search distance.")
+        sharding_layout.addWidget(self.tile_halo_spin)
+        sharding_layout.addWidget(QLabel("Merge:"))
+        self.tile_merge_combo = QComboBox()
+        self.tile_merge_combo.setObjectName("tile_merge_combo")
+        for mode, label in MERGE_MODES:
+            self.tile_merge_combo.addItem(label, mode)
+        self.tile_merge_combo.setToolTip("Keep each output feature in the tile holding its centre, "
+                                         "or clip output geometries to the tiles")
+        sharding_layout.addWidget(self.tile_merge_combo)
+        sharding_layout.addStretch()
+        self.update_sharding_widgets()
+        self.shard_mode_combo.currentIndexChanged.connect(self.save_sharding_options)
+        self.tile_halo_spin.valueChanged.connect(self.save_sharding_options)
+        self.tile_merge_combo.currentIndexChanged.connect(self.save_sharding_options)
+        self.sharded_run_checkbox.toggled.connect(self.update_sharding_widgets)
+        self.right_layout.addLayout(sharding_layout)
+        self.fmwf_file.workspace_loaded.connect(self.on_workspace_loaded)
 
         # Progress bar
         self.progress_bar = QProgressBar()
@@ -1981,9 +2280,17 @@ class QGISFMEFormConnectorDialog(QDialog):
         self.progress_bar.hide()
         self.right_layout.addWidget(self.progress_bar)
 
-        # Add output text area
+        # Add output text area with a button to open the full log
+        output_header_layout = QHBoxLayout()
         output_label = QLabel("Command Output:")
-        self.right_layout.addWidget(output_label)
+        output_header_layout.addWidget(output_label)
+        output_header_layout.addStretch()
+        self.open_log_button = QPushButton("Open Full Log")
+        self.open_log_button.setObjectName("open_log_button")
+        self.open_log_button.setEnabled(False)
+        self.open_log_button.clicked.connect(self.open_full_log)
+        output_header_layout.addWidget(self.open_log_button)
+        self.right_layout.addLayout(output_header_layout)
         
         self.output_text = QPlainTextEdit()
         self.output_text.setObjectName("output_text")
@@ -1991,6 +2298,14 @@ class QGISFMEFormConnectorDialog(QDialog):
         self.output_text.setStyleSheet("font-family: monospace;")
         self.output_text.setMinimumHeight(150)
         self.right_layout.addWidget(self.output_text)
+        
+        # Batched, bounded console; the full log is kept on disk
+        self.output_console = OutputConsole(
+            self.output_text,
+            os.path.join(QgsApplication.qgisSettingsDirPath(), "temp", "fme_logs"),
+            max_lines=config.getint('Console', 'max_lines', fallback=OutputConsole.DEFAULT_MAX_LINES),
+            parent=self
+        )
 
         # Add Execute Command button
         execute_button = QPushButton("Execute Command")
@@ -2010,7 +2325,18 @@ class QGISFMEFormConnectorDialog(QDialog):
                                                                       "", ""))
         execute_button.setObjectName("execute_button")
         execute_button.setStyleSheet("padding: 8px 16px; background-color: #2980b9; color: white;")
-        self.right_layout.addWidget(execute_button)
+        
+        # Add Cancel button next to Execute, enabled while a run is active
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setObjectName("cancel_button")
+        self.cancel_button.setStyleSheet("padding: 8px 16px;")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_fme_command)
+        
+        run_buttons_layout = QHBoxLayout()
+        run_buttons_layout.addWidget(execute_button)
+        run_buttons_layout.addWidget(self.cancel_button)
+        self.right_layout.addLayout(run_buttons_layout)
         
         # Add a splitter between the left and right panels
         splitter = QSplitter(Qt.Orientation.Horizontal)
@@ -2066,16 +2392,19 @@ class QGISFMEFormConnectorDialog(QDialog):
             QMessageBox.warning(self, "Warning", "Please select a Workspace first.")
             return
             
+        # Only one translation at a time
+        if self.active_run is not None:
+            QMessageBox.warning(self, "Warning", "A translation is already running.")
+            return
+            
         try:
             # Get the widgets from the right panel
-            status_label = self.findChild(QLabel, "status_label")
             progress_bar = self.findChild(QProgressBar, "progress_bar")
-            output_text = self.findChild(QPlainTextEdit, "output_text")
             
             # Save active layer to source GeoJSON
             active_layer = iface.activeLayer()
-            if not active_layer:
-                QMessageBox.critical(self, "Error", "No active layer selected!")
+            if not isinstance(active_layer, QgsVectorLayer):
+                QMessageBox.critical(self, "Error", "No active vector layer selected!")
                 return
                 
             # Get the FME command from the file lister
@@ -2085,12 +2414,13 @@ class QGISFMEFormConnectorDialog(QDialog):
                 return
             
             # Extract source and destination paths from the command list
+            (source_format, source_param), (dest_format, dest_param) = self.fmwf_file.interchange_datasets()
             source_path = None
             dest_path = None
             for i, arg in enumerate(fme_command):
-                if arg == '--SourceDataset_GEOJSON' and i + 1 < len(fme_command):
+                if arg == f'--{source_param}' and i + 1 < len(fme_command):
                     source_path = fme_command[i + 1]
-                elif arg == '--DestDataset_GEOJSON' and i + 1 < len(fme_command):
+                elif arg == f'--{dest_param}' and i + 1 < len(fme_command):
                     dest_path = fme_command[i + 1]
             
             if not source_path:
@@ -2100,10 +2430,10 @@ class QGISFMEFormConnectorDialog(QDialog):
                 # Generate default source path if not found in command
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 layer_name = active_layer.name().lower().replace(" ", "_")
-                source_path = os.path.join(temp_dir, f"{timestamp}_{layer_name}_input.geojson")
+                source_path = os.path.join(temp_dir, f"{timestamp}_{layer_name}_input{source_format.extension}")
                 
                 # Add to command
-                fme_command.extend(['--SourceDataset_GEOJSON', source_path])
+                fme_command.extend([f'--{source_param}', source_path])
             
             if not dest_path:
                 # Create temp directory if it doesn't exist
@@ -2112,189 +2442,545 @@ class QGISFMEFormConnectorDialog(QDialog):
                 # Generate default destination path if not found in command
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 layer_name = active_layer.name().lower().replace(" ", "_")
-                dest_path = os.path.join(temp_dir, f"{timestamp}_{layer_name}_output.geojson")
+                dest_path = os.path.join(temp_dir, f"{timestamp}_{layer_name}_output{dest_format.extension}")
                 
                 # Add to command
-                fme_command.extend(['--DestDataset_GEOJSON', dest_path])
-            
+                fme_command.extend([f'--{dest_param}', dest_path])
+            
+            # Further readers and writers of the workspace, each with its own dataset
+            extra_sources = self.fmwf_file.source_bindings()[1:]
+            extra_dests = self.fmwf_file.dest_bindings()[1:]
+            for _, param, path, layer in extra_sources:
+                if not isinstance(layer, QgsVectorLayer):
+                    QMessageBox.critical(self, "Error", f"Choose a vector layer for {param} in the source datasets.")
+                    return
+                if not path:
+                    QMessageBox.critical(self, "Error", f"No dataset path for {param}.")
+                    return
+            multi_dataset = bool(extra_sources or extra_dests)
+
             # Ensure parent directories exist
-            os.makedirs(os.path.dirname(source_path), exist_ok=True)
-            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-            
-            # Save to GeoJSON
-            save_options = QgsVectorFileWriter.SaveVectorOptions()
-            save_options.driverName = "GeoJSON"
-            save_options.fileEncoding = "UTF-8"
-            
-            # Transform to EPSG:4326 if needed
-            if active_layer.crs().authid() != 'EPSG:4326':
-                save_options.ct = QgsCoordinateTransform(
-                    active_layer.crs(),
-                    QgsCoordinateReferenceSystem("EPSG:4326"),
-                    QgsProject.instance()
-                )
+            for path in [source_path, dest_path] + [b[2] for b in extra_sources] + [b[2] for b in extra_dests]:
+                if path:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
             
-            # Write to GeoJSON using the newer API
+            # Update the command text display
+            self.command_text.setPlainText(shlex.join(fme_command))
+
+            # Update status and show progress bar
+            self.set_status_label("Executing command...")
+            progress_bar.setRange(0, 100)
+            progress_bar.setValue(0)
+            progress_bar.show()
+            
+            # Clear previous output and start a new full log
+            self.output_console.start_log(os.path.splitext(os.path.basename(self.fmwf_file.current_file))[0])
+            self.open_log_button.setEnabled(True)
+            
+            export_crs = QgsCoordinateReferenceSystem(EXPORT_CRS)
+            expected_crs = None
+            if self.native_crs_checkbox.isChecked() and active_layer.crs().isValid():
+                # Native mode: no reprojection on the way out or back in
+                export_crs = expected_crs = active_layer.crs()
+                coordsys_param = self.coordsys_parameter()
+                if coordsys_param and export_crs.authid():
+                    set_command_parameter(fme_command, coordsys_param, export_crs.authid())
+                self.output_console.append_line(f"Keeping the native CRS {export_crs.authid() or export_crs.description()}")
+            export_key = None
+            existing_source = None
+
+            # Restrict the export to the chosen features and the columns the workspace reads
+            attributes = self.export_attributes(active_layer)
+            if attributes is not None:
+                self.output_console.append_line(f"Exporting {len(attributes)} of {active_layer.fields().count()} columns")
             try:
-                # Try using the newer API first
-                error = QgsVectorFileWriter.writeAsVectorFormatV2(
+                scope = build_scope(
+                    active_layer,
+                    self.scope_combo.currentData(),
+                    expression=self.scope_expression.text(),
+                    canvas_extent=iface.mapCanvas().extent(),
+                    canvas_crs=iface.mapCanvas().mapSettings().destinationCrs(),
+                    transform_context=QgsProject.instance().transformContext()
+                )
+            except ValueError as e:
+                self.output_console.close_log()
+                progress_bar.hide()
+                self.set_status_label(str(e), success=False)
+                return
+
+            # Let FME read a file-backed layer in place when it can
+            config = configparser.ConfigParser(interpolation=None)
+            config.read(self.ini_file_path)
+            attributes_only = self.attributes_only_checkbox.isChecked()
+            write_back = self.write_back_checkbox.isChecked()
+            keyed = attributes_only or write_back
+            key = None
+            if keyed:
+                # The key column identifies the features when the output comes back
+                key = join_key(active_layer)
+                if attributes is not None and not key.from_fid and key.field_name not in attributes:
+                    attributes.append(key.field_name)
+                action = "writing changes back to the layer" if write_back else "joining the output"
+                self.output_console.append_line(f"Matching features on {key.field_name}, {action}")
+            shard_count = self.shard_count(active_layer, scope, config)
+            if shard_count > 1 and (multi_dataset or keyed):
+                shard_count = 1
+                self.output_console.append_line("Sharding is off for keyed and multi-dataset runs")
+            if shard_count > 1:
+                self.output_console.append_line(f"Sharded run: {shard_count} FME processes")
+            elif not scope.is_complete:
+                self.output_console.append_line(f"Exporting the layer: only {self.scope_combo.currentText().lower()} are sent")
+            elif not keyed and config.getboolean('Passthrough', 'enabled', fallback=True):
+                # The layer file itself has no key column, so keyed runs always export
+                passthrough, reason = file_backed_source(active_layer, source_format, export_crs, self.fmwf_file.workspace)
+                if passthrough is not None:
+                    existing_source = passthrough.path
+                    for name, value in passthrough.parameters.items():
+                        set_command_parameter(fme_command, name, value)
+                    self.output_console.append_line(f"Reading the layer file directly: {passthrough.path}")
+                else:
+                    self.output_console.append_line(f"Exporting the layer: {reason}")
+
+            # GeoJSON encoding options of this workspace
+            geojson_options = self.geojson_options() if source_format == GEOJSON else GeoJSONOptions()
+            if geojson_options.rfc7946 and expected_crs is not None:
+                # RFC 7946 output is always WGS 84, which would undo the native CRS
+                geojson_options.rfc7946 = False
+                self.output_console.append_line("RFC 7946 output is off while keeping the native CRS")
+            file_format_key = source_format.name
+            if source_format == GEOJSON:
+                file_format_key += ":" + geojson_options.key()
+            if keyed:
+                file_format_key += f":{'attributes' if attributes_only else 'keyed'}:{key.field_name}"
+
+            # Stream the export into FME instead of writing a file first
+            stream_source = False
+            if self.stream_source_checkbox.isChecked() and existing_source is None and shard_count == 1 \
+                    and not keyed:
+                reason = stream_unavailable_reason(source_format)
+                if reason is None:
+                    stream_source = True
+                    self.output_console.append_line("Streaming the layer to FME through a named pipe")
+                else:
+                    self.output_console.append_line(f"Exporting to a file: {reason}")
+
+            # Otherwise reuse the last export of this layer if nothing that affects it has changed
+            if existing_source is None and shard_count == 1 and not stream_source:
+                export_key = self.export_cache.key(
+                    active_layer, export_crs, filter_expression=scope.key, file_format=file_format_key, attributes=attributes
+                )
+                existing_source = self.export_cache.lookup(export_key)
+                if existing_source:
+                    self.output_console.append_line(f"Reusing unchanged export: {existing_source}")
+
+            if existing_source:
+                set_command_parameter(fme_command, source_param, existing_source)
+                source_path = existing_source
+                self.command_text.setPlainText(shlex.join(fme_command))
+
+            # Each shard gets its own source and destination datasets
+            shards = None
+            if shard_count > 1:
+                shards = []
+                for index in range(shard_count):
+                    shard_command = list(fme_command)
+                    set_command_parameter(shard_command, source_param, shard_path(source_path, index))
+                    set_command_parameter(shard_command, dest_param, shard_path(dest_path, index))
+                    shards.append((shard_command, shard_path(source_path, index), shard_path(dest_path, index)))
+
+            # Export, FME and import run as a task chain off the UI thread
+            export_task = None
+            if shards and self.shard_mode_combo.currentData() == "tiles":
+                export_task = TiledExportTask(
+                    active_layer,
+                    [shard_source for _, shard_source, _ in shards],
+                    source_format,
+                    halo=self.tile_halo_spin.value(),
+                    merge_mode=self.tile_merge_combo.currentData(),
+                    scope=scope,
+                    index_cache=self.spatial_index_cache,
+                    layer_revision=self.export_cache.revision(active_layer),
+                    attributes=attributes,
+                    dest_crs=export_crs,
+                    ogr_driver=geojson_options.ogr_driver if source_format == GEOJSON else None,
+                    layer_options=geojson_options.layer_options()
+                )
+            elif shards:
+                export_task = ShardedExportTask(
+                    active_layer,
+                    [shard_source for _, shard_source, _ in shards],
+                    source_format,
+                    scope=scope,
+                    index_cache=self.spatial_index_cache,
+                    layer_revision=self.export_cache.revision(active_layer),
+                    attributes=attributes,
+                    dest_crs=export_crs,
+                    ogr_driver=geojson_options.ogr_driver if source_format == GEOJSON else None,
+                    layer_options=geojson_options.layer_options()
+                )
+            elif stream_source:
+                export_task = StreamExportTask(
                     active_layer,
                     source_path,
-                    QgsProject.instance().transformContext(),
-                    save_options
+                    precision=geojson_options.precision,
+                    scope=scope,
+                    index_cache=self.spatial_index_cache,
+                    layer_revision=self.export_cache.revision(active_layer),
+                    attributes=attributes,
+                    dest_crs=export_crs
                 )
-                if error[0] != QgsVectorFileWriter.NoError:
-                    raise Exception(f"Error code: {error[0]}")
-            except Exception as e:
-                # Fall back to the older API
-                error = QgsVectorFileWriter.writeAsVectorFormat(
+            elif existing_source is None:
+                export_task = ExportLayerTask(
                     active_layer,
                     source_path,
-                    "UTF-8",
-                    QgsCoordinateReferenceSystem("EPSG:4326"),
-                    "GeoJSON"
+                    source_format,
+                    scope=scope,
+                    index_cache=self.spatial_index_cache,
+                    layer_revision=self.export_cache.revision(active_layer),
+                    attributes=attributes,
+                    dest_crs=export_crs,
+                    ogr_driver=geojson_options.ogr_driver if source_format == GEOJSON else None,
+                    layer_options=geojson_options.layer_options(),
+                    no_geometry=attributes_only,
+                    fid_field=key.export_fid_field if keyed else None
                 )
-                
-                if error[0] != QgsVectorFileWriter.NoError:
-                    QMessageBox.critical(self, "Error", f"Failed to save GeoJSON: {error[0]}\nPath: {source_path}\nPlease check if the directory exists and is writable.")
-                    return
-                
-            # Update the command text display
-            self.command_text.setPlainText(shlex.join(fme_command))
+            active_exports = [(export_key, export_task)]
 
-            # Update status and show progress bar
-            status_label.setText("Executing command...")
-            progress_bar.show()
-            
-            # Clear previous output
-            output_text.clear()
-            
-            # Create process (shell=False for security)
-            creationflags = subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
-            process = subprocess.Popen(
+            # The other source layers are exported at the same time as the first
+            extra_export_tasks = []
+            for extra_format, extra_param, extra_path, extra_layer in extra_sources:
+                extra_key, extra_task = self.prepare_source(
+                    fme_command, extra_layer, extra_format, extra_param, extra_path, export_crs, config
+                )
+                if extra_task is not None:
+                    extra_export_tasks.append(extra_task)
+                    active_exports.append((extra_key, extra_task))
+            if extra_sources:
+                self.command_text.setPlainText(shlex.join(fme_command))
+
+            self.active_run = FMERunTask(
                 fme_command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                shell=False,
-                text=True,
-                creationflags=creationflags
+                source_path,
+                dest_path,
+                export_task=export_task,
+                as_scratch=self.scratch_layer_checkbox.isChecked(),
+                # A pipe cannot be hashed before FME reads it, and the key only covers one input and output
+                result_cache=None if self.bypass_cache_checkbox.isChecked() or stream_source or multi_dataset
+                else self.result_cache,
+                excluded_parameters=(source_param, dest_param),
+                expected_crs=expected_crs,
+                shards=shards,
+                stream_source=stream_source,
+                extra_export_tasks=extra_export_tasks,
+                extra_outputs=[(path, f"FME_Form_Output ({param})") for _, param, path in extra_dests],
+                output_name=f"FME_Form_Output ({dest_param})" if extra_dests else "FME_Form_Output",
+                join_layer=active_layer if attributes_only and not write_back else None,
+                join_key=key,
+                write_back=WriteBack(active_layer, key, export_crs, with_geometry=not attributes_only,
+                                     precision=geojson_options.precision) if write_back else None,
+                import_batch_size=config.getint('Import', 'batch_size', fallback=IMPORT_BATCH_SIZE),
+                result_store=self.result_store,
+                spatial_index=config.getboolean('Import', 'spatial_index', fallback=True),
+                index_fields=split_list(self.index_fields_edit.text())
             )
-            
-            # Create a QTimer to check process output
-            timer = QTimer()
-            
-            def check_output():
-                # Read any new output
-                output = process.stdout.readline()
-                if output:
-                    output_text.appendPlainText(output.strip())
-                    QApplication.processEvents()
-                
-                # If process has finished
-                if process.poll() is not None:
-                    timer.stop()
-                    progress_bar.hide()
-                    
-                    # Get any remaining output
-                    remaining_output, errors = process.communicate()
-                    if remaining_output:
-                        output_text.appendPlainText(remaining_output.strip())
-                    if errors:
-                        output_text.appendPlainText("Errors:")
-                        output_text.appendPlainText(errors.strip())
-                    
-                    # Check if the process was successful
-                    if process.returncode == 0:
-                        if os.path.exists(dest_path):
-                            # Success - show green status
-                            status_label.setStyleSheet("""
-                                QLabel {
-                                    padding: 8px;
-                                    border-radius: 4px;
-                                    font-weight: 500;
-                                    background-color: #e8f5e9;
-                                    border: 1px solid #c8e6c9;
-                                    color: #2e7d32;
-                                }
-                            """)
-                            status_label.setText("Translation completed successfully!")
-                            
-                            # Check if we should load as scratch layer or regular layer
-                            if self.scratch_layer_checkbox.isChecked():
-                                # Create a memory layer by copying features from the GeoJSON file
-                                source_layer = QgsVectorLayer(dest_path, "temp_source", "ogr")
-                                if not source_layer.isValid():
-                                    QMessageBox.warning(self, "Warning", "Failed to load source GeoJSON file")
-                                else:
-                                    # Create an empty memory layer with same CRS and fields
-                                    geometry_type = source_layer.geometryType()
-                                    geom_str = "Point"
-                                    if geometry_type == 1:  # Line
-                                        geom_str = "LineString"
-                                    elif geometry_type == 2:  # Polygon
-                                        geom_str = "Polygon"
-                                        
-                                    memory_layer = QgsVectorLayer(f"{geom_str}?crs=" + source_layer.crs().authid(), "FME_Form_Output", "memory")
-                                    
-                                    # Copy fields from source layer
-                                    memory_layer.dataProvider().addAttributes(source_layer.fields())
-                                    memory_layer.updateFields()
-                                    
-                                    # Copy features directly through the provider (no editing needed)
-                                    features = [f for f in source_layer.getFeatures()]
-                                    memory_layer.dataProvider().addFeatures(features)
-                                    
-                                    # Add to project
-                                    QgsProject.instance().addMapLayer(memory_layer)
-                                    
-                                    status_label.setText("Translation successful! Layer added to map as scratch layer.")
-                                    self.fmwf_file.update_dataset_paths()
-                            else:
-                                # Load the physical GeoJSON file directly
-                                layer = QgsVectorLayer(dest_path, "FME_Form_Output", "ogr")
-                                if not layer.isValid():
-                                    QMessageBox.warning(self, "Warning", "Failed to load GeoJSON file")
-                                else:
-                                    # Add to project
-                                    QgsProject.instance().addMapLayer(layer)
-                                    
-                                    status_label.setText("Translation successful! Layer added to map from file.")
-                                    self.fmwf_file.update_dataset_paths()
-                        else:
-                            # Failed - output file not found
-                            status_label.setStyleSheet("""
-                                QLabel {
-                                    padding: 8px;
-                                    border-radius: 4px;
-                                    font-weight: 500;
-                                    background-color: #ffebee;
-                                    border: 1px solid #ffcdd2;
-                                    color: #c62828;
-                                }
-                            """)
-                            status_label.setText("Translation failed: Output file not found")
-                    else:
-                        # Failed - process error
-                        status_label.setStyleSheet("""
-                            QLabel {
-                                padding: 8px;
-                                border-radius: 4px;
-                                font-weight: 500;
-                                background-color: #ffebee;
-                                border: 1px solid #ffcdd2;
-                                color: #c62828;
-                            }
-                        """)
-                        status_label.setText("Translation failed!")
-            
-            # Connect timer to check_output
-            timer.timeout.connect(check_output)
-            timer.start(100)  # Check every 100ms
+            self.active_exports = active_exports
+            self.active_run.output_line.connect(self.output_console.append_line)
+            self.active_run.progressChanged.connect(lambda progress: progress_bar.setValue(int(progress)))
+            self.active_run.run_finished.connect(self.on_fme_run_finished)
+            QgsApplication.taskManager().addTask(self.active_run)
+            self.cancel_button.setEnabled(True)
+
+            if self.progressive_checkbox.isChecked():
+                if attributes_only or write_back:
+                    self.output_console.append_line("Not showing the output while running: it is not loaded as a layer")
+                elif not supports_progressive(dest_format):
+                    # Only record-sequential outputs can be read while the writer appends to them
+                    self.output_console.append_line(
+                        f"Not showing the output while running: {dest_format.label} cannot be read while it is written; "
+                        f"use a CSV destination to see features as they are written")
+                else:
+                    self.progressive_display = ProgressiveDisplay(
+                        [shard_dest for _, _, shard_dest in shards] if shards else [dest_path],
+                        "FME_Form_Output (running)",
+                        crs=expected_crs,
+                        interval_ms=config.getint('Progressive', 'refresh_ms', fallback=1000),
+                        batch_size=config.getint('Progressive', 'batch_size', fallback=5000),
+                        read_size=config.getint('Progressive', 'read_kb', fallback=1024) * 1024,
+                        parent=self
+                    )
+                    self.progressive_display.start()
             
         except Exception as e:
             error_details = traceback.format_exc()
             QMessageBox.critical(self, "Error", f"An error occurred while executing the FME command:\n{str(e)}\n\nDetails:\n{error_details}")
 
+    def on_fme_run_finished(self, success, message):
+        """Show the outcome of a finished, failed or canceled run."""
+        # A complete export stays valid even if FME failed, e.g. on a bad parameter
+        for export_key, export_task in self.active_exports:
+            if export_key and export_task is not None and export_task.completed:
+                self.export_cache.store(export_key, export_task.path)
+        self.active_exports = []
+        self.active_run = None
+        if self.progressive_display is not None:
+            self.progressive_display.stop()
+            self.progressive_display = None
+        self.cancel_button.setEnabled(False)
+        self.progress_bar.hide()
+        self.output_console.close_log()
+        self.set_status_label(message, success)
+        if success:
+            self.fmwf_file.update_dataset_paths()
+
+    def prepare_source(self, fme_command, layer, source_format, param, path, export_crs, config):
+        """Point FME at a further source layer; return (export cache key, export task or None).
+
+        Like the first source it is read in place or reused from the export
+        cache when possible, and otherwise exported in full with the columns
+        its reader declares.
+        """
+        if config.getboolean('Passthrough', 'enabled', fallback=True):
+            passthrough, reason = file_backed_source(layer, source_format, export_crs, self.fmwf_file.workspace)
+            if passthrough is not None:
+                set_command_parameter(fme_command, param, passthrough.path)
+                for name, value in passthrough.parameters.items():
+                    set_command_parameter(fme_command, name, value)
+                self.output_console.append_line(f"{param}: reading {passthrough.path} directly")
+                return None, None
+            self.output_console.append_line(f"{param}: exporting {layer.name()}: {reason}")
+
+        attributes = self.consumed_attributes(param)
+        if attributes is not None:
+            attributes = [name for name in attributes if layer.fields().lookupField(name) >= 0]
+        export_key = self.export_cache.key(layer, export_crs, file_format=source_format.name, attributes=attributes)
+        existing_source = self.export_cache.lookup(export_key)
+        if existing_source:
+            set_command_parameter(fme_command, param, existing_source)
+            self.output_console.append_line(f"{param}: reusing unchanged export {existing_source}")
+            return None, None
+
+        export_task = ExportLayerTask(
+            layer,
+            path,
+            source_format,
+            index_cache=self.spatial_index_cache,
+            layer_revision=self.export_cache.revision(layer),
+            attributes=attributes,
+            dest_crs=export_crs
+        )
+        return export_key, export_task
+
+    def on_workspace_loaded(self, fmw_path):
+        """Show the column settings of the newly selected workspace."""
+        settings = load_workspace_settings(self.ini_file_path, fmw_path)
+        self.columns_edit.setText(settings.get('columns', ''))
+        self.index_fields_edit.setText(settings.get('index_fields', ''))
+        consumed = self.consumed_attributes()
+        if consumed is None:
+            self.columns_edit.setPlaceholderText("All fields (the workspace may use any attribute)")
+        else:
+            self.columns_edit.setPlaceholderText(f"Auto: {', '.join(consumed) or 'geometry only'}")
+
+        options = GeoJSONOptions.from_settings(settings)
+        for widget in (self.geojson_precision_spin, self.geojson_rfc7946_checkbox, self.geojson_sequence_checkbox,
+                       self.stream_source_checkbox, self.attributes_only_checkbox, self.write_back_checkbox):
+            widget.blockSignals(True)
+        self.geojson_precision_spin.setValue(-1 if options.precision is None else options.precision)
+        self.geojson_rfc7946_checkbox.setChecked(options.rfc7946)
+        self.geojson_sequence_checkbox.setChecked(options.sequence)
+        self.stream_source_checkbox.setChecked(settings.get('stream_source', '').lower() == 'true')
+        self.attributes_only_checkbox.setChecked(settings.get('attributes_only', '').lower() == 'true')
+        self.write_back_checkbox.setChecked(settings.get('write_back', '').lower() == 'true')
+        for widget in (self.geojson_precision_spin, self.geojson_rfc7946_checkbox, self.geojson_sequence_checkbox,
+                       self.stream_source_checkbox, self.attributes_only_checkbox, self.write_back_checkbox):
+            widget.blockSignals(False)
+
+        for widget in (self.shard_mode_combo, self.tile_halo_spin, self.tile_merge_combo):
+            widget.blockSignals(True)
+        self.shard_mode_combo.setCurrentIndex(max(0, self.shard_mode_combo.findData(settings.get('shard_mode', 'features'))))
+        try:
+            self.tile_halo_spin.setValue(float(settings.get('tile_halo', 0)))
+        except ValueError:
+            self.tile_halo_spin.setValue(0)
+        self.tile_merge_combo.setCurrentIndex(max(0, self.tile_merge_combo.findData(settings.get('tile_merge', MERGE_OWNER))))
+        for widget in (self.shard_mode_combo, self.tile_halo_spin, self.tile_merge_combo):
+            widget.blockSignals(False)
+        self.update_sharding_widgets()
+
+    def save_column_override(self):
+        if self.fmwf_file.current_file:
+            save_workspace_setting(self.ini_file_path, self.fmwf_file.current_file, 'columns', self.columns_edit.text().strip())
+
+    def save_index_fields(self):
+        if self.fmwf_file.current_file:
+            save_workspace_setting(self.ini_file_path, self.fmwf_file.current_file, 'index_fields',
+                                   ', '.join(split_list(self.index_fields_edit.text())))
+
+    def save_attributes_only(self, checked):
+        if self.fmwf_file.current_file:
+            save_workspace_setting(self.ini_file_path, self.fmwf_file.current_file, 'attributes_only',
+                                   'true' if checked else '')
+
+    def save_write_back(self, checked):
+        if self.fmwf_file.current_file:
+            save_workspace_setting(self.ini_file_path, self.fmwf_file.current_file, 'write_back',
+                                   'true' if checked else '')
+
+    def geojson_options(self):
+        """GeoJSON encoding options currently shown in the dialog."""
+        precision = self.geojson_precision_spin.value()
+        return GeoJSONOptions(
+            precision=None if precision < 0 else precision,
+            rfc7946=self.geojson_rfc7946_checkbox.isChecked(),
+            sequence=self.geojson_sequence_checkbox.isChecked()
+        )
+
+    def save_geojson_options(self):
+        if self.fmwf_file.current_file:
+            for key, value in self.geojson_options().to_settings().items():
+                save_workspace_setting(self.ini_file_path, self.fmwf_file.current_file, key, value)
+            save_workspace_setting(self.ini_file_path, self.fmwf_file.current_file, 'stream_source',
+                                   'true' if self.stream_source_checkbox.isChecked() else '')
+
+    def consumed_attributes(self, source_param=None):
+        """Attributes a source reader of the current workspace declares, None if it may use any.
+
+        source_param picks the reader by its dataset parameter; the first source by default.
+        """
+        workspace = self.fmwf_file.workspace
+        if workspace is None:
+            return None
+        if source_param is None:
+            source_param, _ = self.fmwf_file.dataset_parameter_names()
+        keywords = [d.keyword for d in workspace.readers if d.parameter == source_param]
+        return workspace.consumed_attributes(keywords[0] if keywords else None)
+
+    def export_attributes(self, layer):
+        """Field names of layer to export, or None for all fields."""
+        override = split_list(self.columns_edit.text())
+        if override == ['*']:
+            return None
+        names = override or self.consumed_attributes()
+        if names is None:
+            return None
+        missing = [name for name in names if layer.fields().lookupField(name) < 0]
+        if missing:
+            self.output_console.append_line(f"Columns not found in {layer.name()}: {', '.join(missing)}")
+        return [name for name in names if name not in missing]
+
+    def _save_setting(self, section, key, value):
+        """Store one global setting in the ini file."""
+        config = configparser.ConfigParser(interpolation=None)
+        config.read(self.ini_file_path)
+        if not config.has_section(section):
+            config.add_section(section)
+        config.set(section, key, value)
+        with open(self.ini_file_path, 'w') as configfile:
+            config.write(configfile)
+
+    def save_native_crs(self, checked):
+        self._save_setting('Export', 'native_crs', 'true' if checked else 'false')
+
+    def save_sharded_run(self, checked):
+        self._save_setting('Sharding', 'enabled', 'true' if checked else 'false')
+
+    def save_progressive_display(self, checked):
+        self._save_setting('Progressive', 'enabled', 'true' if checked else 'false')
+
+    def update_sharding_widgets(self):
+        enabled = self.sharded_run_checkbox.isChecked()
+        self.shard_mode_combo.setEnabled(enabled)
+        tiled = enabled and self.shard_mode_combo.currentData() == "tiles"
+        self.tile_halo_spin.setEnabled(tiled)
+        self.tile_merge_combo.setEnabled(tiled)
+
+    def save_sharding_options(self):
+        self.update_sharding_widgets()
+        if not self.fmwf_file.current_file:
+            return
+        tiled = self.shard_mode_combo.currentData() == "tiles"
+        settings = {
+            'shard_mode': 'tiles' if tiled else '',
+            'tile_halo': f"{self.tile_halo_spin.value():g}" if tiled and self.tile_halo_spin.value() else '',
+            'tile_merge': self.tile_merge_combo.currentData() if tiled and self.tile_merge_combo.currentData() != MERGE_OWNER else '',
+        }
+        for key, value in settings.items():
+            save_workspace_setting(self.ini_file_path, self.fmwf_file.current_file, key, value)
+
+    def shard_count(self, layer, scope, config):
+        """Number of FME processes for a run: 1 unless sharding is on and the layer is large enough.
+
+        Defaults to the core count, bounded by the FME license slots
+        ([Sharding] max_processes) and by min_features per shard.
+        """
+        if not self.sharded_run_checkbox.isChecked():
+            return 1
+        count = os.cpu_count() or 1
+        max_processes = config.getint('Sharding', 'max_processes', fallback=0)
+        if max_processes > 0:
+            count = min(count, max_processes)
+        feature_count = scope.feature_count if scope.feature_count is not None else layer.featureCount()
+        min_features = max(1, config.getint('Sharding', 'min_features', fallback=1000))
+        if feature_count >= 0:
+            count = min(count, feature_count // min_features)
+        return max(1, count)
+
+    def coordsys_parameter(self):
+        """Published parameter of the current workspace that takes a coordinate system, if any."""
+        workspace = self.fmwf_file.workspace
+        if workspace is None:
+            return None
+        names = [name for name in workspace.parameter_names() if name.upper().endswith("COORDSYS")]
+        return names[0] if names else None
+
+    def on_interchange_format_changed(self, index):
+        """Switch the interchange format, regenerate the dataset paths and remember the choice."""
+        name = self.interchange_combo.itemData(index)
+        self.fmwf_file.interchange_override = name
+        if self.fmwf_file.current_file:
+            self.fmwf_file.update_dataset_paths()
+            is_compatible, message = self.fmwf_file.check_workspace_compatibility(self.fmwf_file.current_file)
+            if not is_compatible:
+                self.set_status_label(message, success=False)
+        self._save_setting('Interchange', 'format', name or 'auto')
+
+    def open_full_log(self):
+        """Open the complete log of the last run."""
+        if not self.output_console.open_full_log():
+            QMessageBox.warning(self, "Warning", "No log file is available yet.")
+
+    def cancel_fme_command(self):
+        """Cancel the running export, translation or import."""
+        if self.active_run is not None:
+            self.active_run.cancel()
+
+    def set_status_label(self, text, success=True):
+        """Set the status label with appropriate styles."""
+        if success:
+            style = """
+                QLabel {
+                    padding: 8px;
+                    border-radius: 4px;
+                    font-weight: 500;
+                    background-color: #e8f5e9;
+                    border: 1px solid #c8e6c9;
+                    color: #2e7d32;
+                }
+            """
+        else:
+            style = """
+                QLabel {
+                    padding: 8px;
+                    border-radius: 4px;
+                    font-weight: 500;
+                    background-color: #ffebee;
+                    border: 1px solid #ffcdd2;
+                    color: #c62828;
+                }
+            """
+        self.status_label.setText(text)
+        self.status_label.setStyleSheet(style)
+
     def is_fmw_file_selected(self):
         """Validate FMW file selection with comprehensive checks."""
         
@@ -2343,52 +3029,6 @@ class QGISFMEFormConnectorDialog(QDialog):
         """Check if the FMW workspace has the required parameters."""
         pass
 
-    def load_as_scratch_layer(self, geojson_path):
-        """Load a GeoJSON file as a memory layer in QGIS if the checkbox is checked,
-        otherwise load it as a regular layer."""
-        
-        # Create a memory layer by copying features from the GeoJSON file
-        source_layer = QgsVectorLayer(geojson_path, "temp_source", "ogr")
-        if not source_layer.isValid():
-            QMessageBox.warning(self, "Warning", "Failed to load source GeoJSON file")
-            return
-                
-        # Create an empty memory layer with same CRS and fields
-        memory_layer = QgsVectorLayer("Point?crs=" + source_layer.crs().authid(), "FME_Form_Output", "memory")
-        
-        # Copy fields from source layer
-        for field in source_layer.fields():
-            memory_layer.dataProvider().addAttributes([field])
-        memory_layer.updateFields()
-        
-        # Copy features directly through the provider (no editing needed)
-        features = [f for f in source_layer.getFeatures()]
-        memory_layer.dataProvider().addFeatures(features)
-        
-        # Add to project
-        QgsProject.instance().addMapLayer(memory_layer)
-        
-        # Update dataset paths after loading the layer
-        self.fmwf_file.update_dataset_paths()
-        
-        # Update status
-        self.status_label.setText("Layer loaded as scratch layer")
-        
-        # Update status styling
-        self.status_label.setStyleSheet("""
-            QLabel {
-                padding: 8px;
-                border-radius: 4px;
-                font-weight: 500;
-                background-color: #e8f5e9;
-                border: 1px solid #c8e6c9;
-                color: #2e7d32;
-            }
-        """)
-
-        # Emit signal to uncheck toggle after generating points
-        self.closingPlugin.emit()
-
     def cancel(self):
         """Triggered when Cancel button is clicked."""
         # Emit signal to close plugin and uncheck toggle
@@ -2410,20 +3050,13 @@ class QGISFMEFormConnectorDialog(QDialog):
             QMessageBox.warning(self, "Warning", "Failed to load source GeoJSON file")
             return
                 
-        # Create an empty memory layer with same CRS and fields
-        memory_layer = QgsVectorLayer("Point?crs=" + source_layer.crs().authid(), "FME_Form_Output", "memory")
-        
-        # Copy fields from source layer
-        for field in source_layer.fields():
-            memory_layer.dataProvider().addAttributes([field])
-        memory_layer.updateFields()
-        
-        # Copy features directly through the provider (no editing needed)
-        features = [f for f in source_layer.getFeatures()]
-        memory_layer.dataProvider().addFeatures(features)
-        
-        # Add to project
-        QgsProject.instance().addMapLayer(memory_layer)
+        # Copy the features into memory layers, one per geometry type
+        memory_layers = import_memory_layers(source_layer, "FME_Form_Output")
+        if memory_layers is None:
+            QMessageBox.warning(self, "Warning", "Failed to copy the features of the output file")
+            return
+        for memory_layer in memory_layers:
+            QgsProject.instance().addMapLayer(memory_layer)
         
         # Update dataset paths after loading the layer
         self.fmwf_file.update_dataset_paths()
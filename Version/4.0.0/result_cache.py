@@ -0,0 +1,126 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Memoization of whole FME runs. A run is identified by the content of the
+# workspace, the command without its generated dataset paths and the content
+# of the input dataset; when the same run is requested again, the stored
+# output is copied into place instead of starting fme.exe. The cache is kept
+# on disk and trimmed to a size limit, least recently used entries first.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+import hashlib
+import os
+import shutil
+import threading
+
+from .interchange_formats import dataset_files
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+class ResultCache:
+    """Size-bounded LRU cache of FME outputs, stored as files in cache_dir.
+
+    Methods may be called from task worker threads.
+    """
+
+    DEFAULT_MAX_MB = 2048
+
+    def __init__(self, cache_dir, max_mb=DEFAULT_MAX_MB):
+        self.cache_dir = cache_dir
+        self.max_bytes = max(0, max_mb) * 1024 * 1024
+        self._lock = threading.Lock()
+        self._digests = {}  # path -> (size, mtime_ns, sha256) of hashed files
+
+    def file_digest(self, path):
+        """SHA-256 of a file, remembered for as long as its size and mtime do not change."""
+        stat = os.stat(path)
+        with self._lock:
+            known = self._digests.get(path)
+        if known and known[:2] == (stat.st_size, stat.st_mtime_ns):
+            return known[2]
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        with self._lock:
+            self._digests[path] = (stat.st_size, stat.st_mtime_ns, digest.hexdigest())
+        return digest.hexdigest()
+
+    def key(self, fmw_path, command, input_path, excluded_parameters=()):
+        """Return the cache key of a run.
+
+        The fme.exe and workspace paths and the values of excluded_parameters
+        (the generated source and destination paths) are left out of the
+        command; the workspace and input are identified by their content,
+        including the sidecar files of the input, e.g. the .dbf of a .shp.
+        """
+        arguments = []
+        skip = False
+        for argument in command[2:]:
+            if skip:
+                skip = False
+                continue
+            if argument.startswith("--") and argument[2:] in excluded_parameters:
+                skip = True
+                continue
+            arguments.append(argument)
+        parts = [self.file_digest(fmw_path)] + [self.file_digest(path) for path in dataset_files(input_path)]
+        parts += arguments
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key, extension):
+        return os.path.join(self.cache_dir, key + extension)
+
+    def fetch(self, key, dest_path):
+        """Copy the cached output for key to dest_path; return False on a miss."""
+        entry = self._entry_path(key, os.path.splitext(dest_path)[1])
+        with self._lock:
+            if not os.path.isfile(entry):
+                return False
+            # The modification time doubles as the LRU timestamp
+            os.utime(entry)
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        shutil.copyfile(entry, dest_path)
+        return True
+
+    def store(self, key, output_path):
+        """Keep a copy of a run's output, then trim the cache to its size limit."""
+        if self.max_bytes == 0 or not os.path.isfile(output_path):
+            return
+        if os.path.getsize(output_path) > self.max_bytes:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = self._entry_path(key, os.path.splitext(output_path)[1])
+        partial = entry + ".part"
+        shutil.copyfile(output_path, partial)
+        with self._lock:
+            os.replace(partial, entry)
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        for item in os.scandir(self.cache_dir):
+            if item.is_file() and not item.name.endswith(".part"):
+                stat = item.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, item.path))
+        total = sum(size for mtime_ns, size, path in entries)
+        for mtime_ns, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+
+    def clear(self):
+        with self._lock:
+            if os.path.isdir(self.cache_dir):
+                shutil.rmtree(self.cache_dir, ignore_errors=True)
@@ -0,0 +1,108 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Size-aware storage of FME results. Small outputs are loaded into memory
+# layers; outputs above a feature or byte threshold are converted in the
+# background into a GeoPackage or FlatGeobuf file with a spatial index, kept
+# in a managed result directory, so a large result can neither exhaust the
+# memory of QGIS nor render from an unindexed GeoJSON file.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+import os
+import re
+import time
+import uuid
+
+from qgis.core import QgsProject, QgsVectorFileWriter
+
+from .interchange_formats import FLATGEOBUF, GEOPACKAGE, get_format
+
+# Formats a result can be stored in; both carry a spatial index
+STORE_FORMATS = (GEOPACKAGE, FLATGEOBUF)
+
+
+class ResultStore:
+    """Decides where a result goes and writes the large ones to result_dir.
+
+    A result spills to disk when it has more than max_features features or
+    its output file is larger than max_mb megabytes; 0 disables a limit.
+    Methods may be called from task worker threads, except purge().
+    """
+
+    DEFAULT_MAX_FEATURES = 250000
+    DEFAULT_MAX_MB = 256
+
+    def __init__(self, result_dir, max_features=DEFAULT_MAX_FEATURES, max_mb=DEFAULT_MAX_MB, store_format=GEOPACKAGE):
+        self.result_dir = result_dir
+        self.max_features = max(0, max_features)
+        self.max_bytes = max(0, max_mb) * 1024 * 1024
+        self.store_format = store_format if store_format in STORE_FORMATS else GEOPACKAGE
+
+    @classmethod
+    def from_config(cls, config, result_dir):
+        """A store configured by the [Results] section of the plugin settings."""
+        return cls(
+            result_dir,
+            max_features=config.getint('Results', 'max_memory_features', fallback=cls.DEFAULT_MAX_FEATURES),
+            max_mb=config.getint('Results', 'max_memory_mb', fallback=cls.DEFAULT_MAX_MB),
+            store_format=get_format(config.get('Results', 'store_format', fallback=GEOPACKAGE.name))
+        )
+
+    def exceeds_memory_limit(self, feature_count, size=0):
+        """True if a result of feature_count features in a size byte file must not be held in memory."""
+        if self.max_features and feature_count > self.max_features:
+            return True
+        return bool(self.max_bytes and size > self.max_bytes)
+
+    def new_path(self, name):
+        """A fresh file path in the result directory for a result called name."""
+        os.makedirs(self.result_dir, exist_ok=True)
+        stem = re.sub(r"[^\w-]+", "_", name).strip("_") or "result"
+        return os.path.join(
+            self.result_dir,
+            f"{time.strftime('%Y%m%d_%H%M%S')}_{stem}_{uuid.uuid4().hex[:8]}{self.store_format.extension}"
+        )
+
+    def create_writer(self, path, fields, wkb_type, crs):
+        """A QgsVectorFileWriter for a stored result; check hasError() before use."""
+        save_options = QgsVectorFileWriter.SaveVectorOptions()
+        save_options.driverName = self.store_format.ogr_driver
+        save_options.fileEncoding = "UTF-8"
+        save_options.layerOptions = ["SPATIAL_INDEX=YES"]
+        return QgsVectorFileWriter.create(
+            path,
+            fields,
+            wkb_type,
+            crs,
+            QgsProject.instance().transformContext(),
+            save_options
+        )
+
+    def purge(self, in_use=(), keep_days=0):
+        """Delete the stored results, keeping the files of in_use (paths of loaded layers).
+
+        Results younger than keep_days are kept too, as a saved project may
+        still refer to them. GeoPackage sidecar files (-wal, -shm) go with
+        their database.
+        """
+        if not os.path.isdir(self.result_dir):
+            return
+        keep = {os.path.normcase(os.path.abspath(path)) for path in in_use}
+        cutoff = time.time() - keep_days * 86400
+        for item in os.scandir(self.result_dir):
+            if not item.is_file() or item.stat().st_mtime > cutoff:
+                continue
+            database = re.sub(r"-(wal|shm|journal)$", "", item.path)
+            if os.path.normcase(os.path.abspath(database)) in keep:
+                continue
+            try:
+                os.remove(item.path)
+            except OSError:
+                # Still open, e.g. by a layer of another project
+                continue
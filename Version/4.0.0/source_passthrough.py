@@ -0,0 +1,71 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Zero-copy source datasets. When the active layer is already a file in the
+# format the workspace reads, FME is pointed at that file instead of a fresh
+# export. A layer name or subset string is passed on through published
+# workspace parameters; when that is not possible, the caller exports as usual.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+import os
+from dataclasses import dataclass, field
+
+from qgis.core import QgsProviderRegistry
+
+from .interchange_formats import format_for_path
+
+# Published parameter that restricts which feature types a reader reads
+FEATURE_TYPES_PARAMETER = "FEATURE_TYPES"
+# Suffix of a published reader WHERE clause parameter
+WHERE_CLAUSE_SUFFIX = "WHERE_CLAUSE"
+
+
+@dataclass
+class Passthrough:
+    """The original file of a layer and the parameters that select its features."""
+
+    path: str
+    parameters: dict = field(default_factory=dict)  # Extra --name value pairs for the command
+
+
+def file_backed_source(layer, source_format, dest_crs, workspace=None):
+    """Return (Passthrough, None) if layer can be read by FME in place, else (None, reason)."""
+    if layer.providerType() != "ogr":
+        return None, "layer is not file-based"
+
+    parts = QgsProviderRegistry.instance().decodeUri("ogr", layer.source())
+    path = parts.get("path") or ""
+    if not os.path.isfile(path):
+        return None, "layer is not file-based"
+
+    file_format = format_for_path(path)
+    if file_format is None or file_format.name != source_format.name:
+        return None, f"the workspace does not read {os.path.splitext(path)[1] or 'this file type'}"
+    if layer.isModified():
+        return None, "the layer has unsaved edits"
+    if layer.crs() != dest_crs:
+        return None, f"the layer needs reprojecting to {dest_crs.authid()}"
+
+    parameter_names = workspace.parameter_names() if workspace is not None else []
+    parameters = {}
+
+    layer_name = parts.get("layerName")
+    if layer_name and len(layer.dataProvider().subLayers()) > 1:
+        if FEATURE_TYPES_PARAMETER not in parameter_names:
+            return None, f"the workspace has no {FEATURE_TYPES_PARAMETER} parameter to select layer {layer_name}"
+        parameters[FEATURE_TYPES_PARAMETER] = layer_name
+
+    subset = layer.subsetString()
+    if subset:
+        where_parameters = [name for name in parameter_names if name.upper().endswith(WHERE_CLAUSE_SUFFIX)]
+        if not where_parameters:
+            return None, "the workspace has no WHERE clause parameter for the layer filter"
+        parameters[where_parameters[0]] = subset
+
+    return Passthrough(path, parameters), None
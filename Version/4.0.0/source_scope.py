@@ -0,0 +1,129 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Which features of the active layer are sent to FME: all of them, the
+# selection, those in the current map extent, or those matching a QGIS
+# expression. Each scope becomes a QgsFeatureRequest for the export task.
+# Extent filters on layers without a provider spatial index are served from
+# an in-memory index that is built once per layer revision.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+import hashlib
+import threading
+
+from qgis.core import (
+    Qgis,
+    QgsExpression,
+    QgsFeatureRequest,
+    QgsSpatialIndex,
+    QgsCoordinateTransform
+)
+
+SCOPE_ALL = "all"
+SCOPE_SELECTED = "selected"
+SCOPE_EXTENT = "extent"
+SCOPE_EXPRESSION = "expression"
+
+# (scope, label) pairs in the order they are offered to the user
+SCOPES = [
+    (SCOPE_ALL, "All features"),
+    (SCOPE_SELECTED, "Selected features"),
+    (SCOPE_EXTENT, "Current map extent"),
+    (SCOPE_EXPRESSION, "Expression"),
+]
+
+
+class SourceScope:
+    """A feature request for the export plus what identifies it in the export cache."""
+
+    def __init__(self, scope=SCOPE_ALL, request=None, key="", feature_count=None, filter_rect=None):
+        self.scope = scope
+        self.request = request if request is not None else QgsFeatureRequest()
+        self.key = key                      # Part of the export cache key
+        self.feature_count = feature_count  # Exact count when known, else None
+        self.filter_rect = filter_rect      # Extent in layer CRS, resolved through an index by the task
+
+    @property
+    def is_complete(self):
+        """True if every feature of the layer is exported."""
+        return self.scope == SCOPE_ALL
+
+
+def build_scope(layer, scope, expression="", canvas_extent=None, canvas_crs=None, transform_context=None):
+    """Return a SourceScope for layer; raises ValueError if the scope cannot be applied."""
+    if scope == SCOPE_SELECTED:
+        fids = sorted(layer.selectedFeatureIds())
+        if not fids:
+            raise ValueError(f"No features are selected in {layer.name()}.")
+        request = QgsFeatureRequest()
+        request.setFilterFids(fids)
+        digest = hashlib.sha1(",".join(map(str, fids)).encode("ascii")).hexdigest()
+        return SourceScope(scope, request, f"selected:{digest}", feature_count=len(fids))
+
+    if scope == SCOPE_EXTENT:
+        if canvas_extent is None or canvas_extent.isEmpty():
+            raise ValueError("The map canvas has no extent.")
+        rect = canvas_extent
+        if canvas_crs is not None and canvas_crs != layer.crs():
+            rect = QgsCoordinateTransform(canvas_crs, layer.crs(), transform_context).transformBoundingBox(canvas_extent)
+        return SourceScope(scope, QgsFeatureRequest(), f"extent:{rect.toString(6)}", filter_rect=rect)
+
+    if scope == SCOPE_EXPRESSION:
+        expression = (expression or "").strip()
+        if not expression:
+            raise ValueError("Enter an expression to filter the source features.")
+        parsed = QgsExpression(expression)
+        if parsed.hasParserError():
+            raise ValueError(f"Invalid expression: {parsed.parserErrorString()}")
+        request = QgsFeatureRequest()
+        request.setFilterExpression(expression)
+        return SourceScope(scope, request, f"expression:{expression}")
+
+    return SourceScope()
+
+
+class SpatialIndexCache:
+    """In-memory spatial indexes of layers whose provider has none.
+
+    Indexes are keyed on layer id and edit revision, built from a feature
+    source so they can be created in a task worker, and reused until the
+    layer changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._indexes = {}  # layer id -> (revision, QgsSpatialIndex)
+
+    @staticmethod
+    def provider_has_index(layer):
+        return layer.hasSpatialIndex() == Qgis.SpatialIndexPresence.Present
+
+    def get(self, layer_id, revision):
+        with self._lock:
+            entry = self._indexes.get(layer_id)
+        if entry is not None and entry[0] == revision:
+            return entry[1]
+        return None
+
+    def build(self, layer_id, revision, source, is_canceled=None):
+        """Index every geometry of a feature source; None if canceled."""
+        request = QgsFeatureRequest()
+        request.setNoAttributes()
+        index = QgsSpatialIndex()
+        for feature in source.getFeatures(request):
+            if is_canceled is not None and is_canceled():
+                return None
+            index.addFeature(feature)
+        with self._lock:
+            self._indexes[layer_id] = (revision, index)
+        return index
+
+    def discard(self, layer_id):
+        with self._lock:
+            self._indexes.pop(layer_id, None)
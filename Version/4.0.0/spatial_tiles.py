@@ -0,0 +1,110 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Spatial partitioning for sharded runs of workspaces that look at neighbours
+# (dissolve, snapping, clustering). The layer is cut into tiles holding about
+# the same number of features; each tile is exported with a halo of nearby
+# features, and on merge every output feature is kept by, or clipped to, the
+# tile core it belongs to. Cuts fall between distinct coordinates only, so a
+# layer with few distinct positions gets fewer tiles rather than empty ones.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+import bisect
+import math
+from dataclasses import dataclass
+
+MERGE_OWNER = "owner"  # Keep an output feature in the tile that holds its bounding box centre
+MERGE_CLIP = "clip"    # Clip output geometries to the tile core
+
+MERGE_MODES = [
+    (MERGE_OWNER, "Keep by centre"),
+    (MERGE_CLIP, "Clip to tile"),
+]
+
+
+@dataclass(frozen=True)
+class Tile:
+    """A tile core; cores are half-open and the outer ones reach to infinity."""
+
+    xmin: float
+    ymin: float
+    xmax: float
+    ymax: float
+
+    def contains(self, x, y):
+        return self.xmin <= x < self.xmax and self.ymin <= y < self.ymax
+
+    def intersects(self, xmin, ymin, xmax, ymax, halo=0.0):
+        """True if a bounding box meets the core grown by halo."""
+        return (xmin <= self.xmax + halo and xmax >= self.xmin - halo
+                and ymin <= self.ymax + halo and ymax >= self.ymin - halo)
+
+    def clamped(self, xmin, ymin, xmax, ymax):
+        """The core limited to a finite extent, as (xmin, ymin, xmax, ymax)."""
+        return (max(self.xmin, xmin), max(self.ymin, ymin), min(self.xmax, xmax), min(self.ymax, ymax))
+
+
+def _cuts(values, weights):
+    """Split values (sorted) at the boundaries that share them out by weights.
+
+    Cuts are strictly increasing values above the smallest one, so every
+    interval between them holds at least one value. A cut that would repeat
+    the previous one moves to the next distinct value, or is dropped when
+    there is none; fewer than len(weights) - 1 cuts may come back.
+    """
+    if not values:
+        return []
+    total = sum(weights)
+    cuts = []
+    previous = values[0]
+    running = 0
+    for weight in weights[:-1]:
+        running += weight
+        index = min(len(values) - 1, round(len(values) * running / total))
+        if values[index] <= previous:
+            # Many equal values, e.g. a grid column; cut at the next one that differs
+            index = bisect.bisect_right(values, previous)
+            if index == len(values):
+                break
+        previous = values[index]
+        cuts.append(previous)
+    return cuts
+
+
+def balanced_tiles(points, count):
+    """Partition the plane into up to count tiles holding about equal numbers of points.
+
+    points are (x, y) feature centres. The tiles form columns split at
+    x quantiles, each column split into rows at the y quantiles of its own
+    points, so dense areas get small tiles. Every tile holds at least one
+    point; with too few distinct coordinates there are fewer than count.
+    """
+    count = max(1, count)
+    columns = max(1, min(count, round(math.sqrt(count))))
+    rows_per_column = _share(count, columns)
+
+    by_x = sorted(points)
+    inner_cuts = _cuts([x for x, _ in by_x], rows_per_column)
+    if len(inner_cuts) + 1 < columns:
+        # Too few distinct x values; the remaining columns take all the rows
+        rows_per_column = _share(count, len(inner_cuts) + 1)
+    x_cuts = [-math.inf] + inner_cuts + [math.inf]
+    tiles = []
+    for column, rows in enumerate(rows_per_column):
+        xmin, xmax = x_cuts[column], x_cuts[column + 1]
+        ys = sorted(y for x, y in by_x if xmin <= x < xmax)
+        y_cuts = [-math.inf] + _cuts(ys, [1] * rows) + [math.inf]
+        for row in range(len(y_cuts) - 1):
+            tiles.append(Tile(xmin, y_cuts[row], xmax, y_cuts[row + 1]))
+    return tiles
+
+
+def _share(count, parts):
+    """count split into parts near-equal whole numbers, the larger ones first."""
+    return [count // parts + (1 if part < count % parts else 0) for part in range(parts)]
@@ -0,0 +1,147 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Streaming handoff of the source dataset. Instead of writing the whole
+# GeoJSON file before FME starts, features are written one per line into a
+# named pipe (FIFO) that FME reads as they arrive, so the export overlaps with
+# FME's reader. Needs POSIX named pipes and a reader that reads the dataset
+# once, front to back; otherwise the caller exports to a file as usual.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+import errno
+import os
+import stat
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from qgis.core import QgsJsonExporter
+
+from .fme_tasks import ExportLayerTask
+from .interchange_formats import GEOJSON
+
+# How long the export waits for a running FME to open the pipe
+OPEN_TIMEOUT = 120.0
+
+
+def supports_streaming():
+    """True if this platform has named pipes the export can write to."""
+    return fcntl is not None and hasattr(os, "mkfifo")
+
+
+def create_fifo(path):
+    """Create a named pipe at path, replacing a leftover one."""
+    if os.path.exists(path):
+        if not stat.S_ISFIFO(os.stat(path).st_mode):
+            raise FileExistsError(errno.EEXIST, "Not a named pipe", path)
+        os.unlink(path)
+    os.mkfifo(path, 0o600)
+
+
+def stream_unavailable_reason(source_format):
+    """Why the source cannot be streamed, or None if it can."""
+    if not supports_streaming():
+        return "named pipes are not available on this platform"
+    if source_format != GEOJSON:
+        return f"only GeoJSON can be streamed, the workspace reads {source_format.label}"
+    return None
+
+
+class StreamExportTask(ExportLayerTask):
+    """Write newline-delimited GeoJSON features into a named pipe while FME reads it.
+
+    The pipe is created when the task starts, and pipe_ready is set then so
+    the FME task can start its process; the task then waits for FME to
+    connect and writes the features as it reads them. reader_exited, if
+    set, tells whether the FME process has already ended, which stops the
+    wait at once. precision is the number of coordinate decimals.
+    """
+
+    def __init__(self, layer, path, precision=None, **kwargs):
+        super().__init__(layer, path, GEOJSON, **kwargs)
+        self.setDescription(f"Streaming {layer.name()} to FME")
+        self.precision = 15 if precision is None else precision
+        self.pipe_ready = threading.Event()
+        self.reader_exited = None
+        self.pipe_created = False
+
+    def run(self):
+        try:
+            create_fifo(self.path)
+            self.pipe_created = True
+        except OSError as e:
+            self.error = f"Failed to create the source pipe: {e}\nPath: {self.path}"
+            return False
+        finally:
+            # Also released on failure, so FME starts and reports the missing dataset
+            self.pipe_ready.set()
+
+        request = self.feature_request()
+        if request is None:
+            return False
+        pipe = self.open_pipe()
+        if pipe is None:
+            return False
+
+        exporter = QgsJsonExporter()
+        exporter.setTransformGeometries(False)
+        exporter.setPrecision(self.precision)
+        try:
+            with pipe:
+                for index, feature in enumerate(self.source.getFeatures(request)):
+                    if self.isCanceled():
+                        return False
+                    pipe.write(exporter.exportFeature(self.export_feature(feature)) + "\n")
+                    if self.feature_count > 0 and index % 1000 == 0:
+                        self.setProgress(100.0 * index / self.feature_count)
+        except BrokenPipeError:
+            self.error = "FME stopped reading the streamed source dataset"
+            return False
+        except OSError as e:
+            self.error = f"Failed to stream the source dataset: {e}\nPath: {self.path}"
+            return False
+        self.completed = True
+        return True
+
+    def open_pipe(self):
+        """Open the pipe for writing once FME has opened it; None if canceled or timed out."""
+        deadline = time.monotonic() + OPEN_TIMEOUT
+        while True:
+            try:
+                # Non-blocking so a run that never reaches the reader can still be canceled
+                fd = os.open(self.path, os.O_WRONLY | os.O_NONBLOCK)
+                break
+            except OSError as e:
+                if e.errno != errno.ENXIO:
+                    self.error = f"Failed to open the source pipe: {e}\nPath: {self.path}"
+                    return None
+            if self.isCanceled():
+                return None
+            if self.reader_exited is not None and self.reader_exited():
+                self.error = "FME exited before reading the streamed source dataset"
+                return None
+            if time.monotonic() > deadline:
+                self.error = "FME did not open the streamed source dataset"
+                return None
+            time.sleep(0.1)
+        fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) & ~os.O_NONBLOCK)
+        return os.fdopen(fd, "w", encoding="utf-8")
+
+    def finished(self, result):
+        if not self.pipe_created:
+            return
+        # The reader keeps its end open; only the name goes away
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,28 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# The plugin folder is not an importable name, so it is registered as the
+# package "fmeconnector" for the tests. Only modules that do not need QGIS
+# are imported from it.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+import importlib.util
+import os
+import sys
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_WORKSPACE = os.path.join(PLUGIN_DIR, "sampleworkspace", "QGISFMEFormConnectorTemplate.fmw")
+
+if "fmeconnector" not in sys.modules:
+    _spec = importlib.util.spec_from_file_location(
+        "fmeconnector", os.path.join(PLUGIN_DIR, "__init__.py"), submodule_search_locations=[PLUGIN_DIR]
+    )
+    _package = importlib.util.module_from_spec(_spec)
+    sys.modules["fmeconnector"] = _package
+    _spec.loader.exec_module(_package)
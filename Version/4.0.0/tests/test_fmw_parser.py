@@ -0,0 +1,95 @@
+import io
+
+from fmeconnector.fmw_parser import (
+    FMWHeader,
+    FMWWorkspace,
+    MAX_LINE_LENGTH,
+    iter_lines,
+    parse_header_lines,
+    parse_workspace_lines,
+    read_workspace
+)
+
+from conftest import SAMPLE_WORKSPACE
+
+
+class CountingLines:
+    """(line, truncated) tuples of a file, remembering the last line handed out."""
+
+    def __init__(self, file):
+        self.lines = iter_lines(file)
+        self.last = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line, truncated = next(self.lines)
+        self.last = line
+        return line, truncated
+
+
+def test_iter_lines_truncates_long_lines():
+    text = "short\n" + "x" * (3 * MAX_LINE_LENGTH + 10) + "\nafter\n"
+    lines = list(iter_lines(io.StringIO(text)))
+    assert [truncated for _, truncated in lines] == [False, True, False]
+    assert len(lines[1][0]) == MAX_LINE_LENGTH
+    assert lines[2][0] == "after\n"
+
+
+def test_header_of_sample_workspace():
+    header = FMWHeader()
+    with open(SAMPLE_WORKSPACE, encoding="utf-8") as file:
+        lines = CountingLines(file)
+        parse_header_lines(lines, header)
+        # Left just after the attributes, with the rest of the file unread
+        assert lines.last.startswith("#! >")
+        assert next(lines)[0].startswith("#! <DATASETS>")
+
+    assert header.fme_exe == r"C:\Program Files\FME\fme.exe"
+    assert header.workspace_path.endswith("QGISFMETemplate.fmw")
+    assert ("myCoef", '"5"') in header.parameters
+    assert [name for name, _ in header.source_datasets] == ["SourceDataset_GEOJSON"]
+    assert [name for name, _ in header.dest_datasets] == ["DestDataset_GEOJSON"]
+    assert header.attributes["FME_BUILD_NUM"] == "24801"
+    assert "A0_PREVIEW_IMAGE" not in header.attributes
+
+
+def test_workspace_parsing_stops_at_global_parameters_end():
+    workspace = FMWWorkspace(path=SAMPLE_WORKSPACE)
+    with open(SAMPLE_WORKSPACE, encoding="utf-8") as file:
+        lines = CountingLines(file)
+        parse_workspace_lines(lines, workspace)
+        assert lines.last.startswith("#! </GLOBAL_PARAMETERS>")
+        # Nothing after the block was read
+        assert next(lines)[0].startswith("#! <USER_PARAMETERS")
+
+    assert [parameter.name for parameter in workspace.published_parameters] == [
+        "myCoef", "SourceDataset_GEOJSON", "FEATURE_TYPES", "DestDataset_GEOJSON", "OFFSET"
+    ]
+    assert workspace.published_parameters[0].default_value == "5"
+    assert [(d.format, d.parameter) for d in workspace.readers] == [("GEOJSON", "SourceDataset_GEOJSON")]
+    assert [(d.format, d.parameter) for d in workspace.writers] == [("GEOJSON", "DestDataset_GEOJSON")]
+
+
+def test_macro_fallback_without_global_parameters():
+    text = (
+        "#! <WORKSPACE\n"
+        "#    Command line to run this workspace:\n"
+        "#        fme.exe ws.fmw\n"
+        "#          --OFFSET \"1\"\n"
+        "#! >\n"
+        "#! </WORKSPACE>\n"
+        "DEFAULT_MACRO OFFSET 1\n"
+        "GUI FLOAT OFFSET Buffer Distance\n"
+        "INCLUDE [ puts {} ]\n"
+        "DEFAULT_MACRO NEVER_READ 2\n"
+    )
+    workspace = parse_workspace_lines(iter_lines(io.StringIO(text)), FMWWorkspace())
+    assert [(p.name, p.default_value) for p in workspace.published_parameters] == [("OFFSET", "1")]
+
+
+def test_read_workspace_matches_line_parser():
+    workspace = read_workspace(SAMPLE_WORKSPACE)
+    assert workspace.fme_build == "24801"
+    assert "OFFSET" in workspace.parameter_names()
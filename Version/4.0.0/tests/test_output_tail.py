@@ -0,0 +1,47 @@
+from fmeconnector.output_tail import OutputTail
+
+
+def _append(path, data):
+    with open(path, "ab") as file:
+        file.write(data)
+
+
+def test_record_end_balances_quotes():
+    tail = OutputTail("out.csv")
+    assert tail.record_end(b'id,name\n1,"a\nb"\n2,"c') == len(b'id,name\n1,"a\nb"\n') - 1
+    assert tail.record_end(b'1,"open\n') == -1
+    assert tail.record_end(b'1,"say ""hi"""\n') == len(b'1,"say ""hi"""\n') - 1
+
+
+def test_record_split_across_reads(tmp_path):
+    path = str(tmp_path / "out.csv")
+    tail = OutputTail(path)
+    _append(path, b'id,note\n1,plain\n2,"first line\n')
+    assert tail.read_records() == [{"id": "1", "note": "plain"}]
+
+    _append(path, b'second line"\n3,la')
+    assert tail.read_records() == [{"id": "2", "note": "first line\nsecond line"}]
+
+    _append(path, b'st\n')
+    assert tail.read_records() == [{"id": "3", "note": "last"}]
+    assert tail.read_records() == []
+
+
+def test_reads_are_bounded(tmp_path):
+    path = str(tmp_path / "out.csv")
+    _append(path, b"id\n" + b"".join(b"%d\n" % i for i in range(100)))
+    tail = OutputTail(path, max_bytes=16)
+    records = []
+    for _ in range(100):
+        records.extend(tail.read_records())
+    assert [record["id"] for record in records] == [str(i) for i in range(100)]
+
+
+def test_replaced_file_is_read_from_the_start(tmp_path):
+    path = str(tmp_path / "out.csv")
+    _append(path, b"id\n1\n2\n3\n")
+    tail = OutputTail(path)
+    assert len(tail.read_records()) == 3
+    with open(path, "wb") as file:
+        file.write(b"key\n9\n")
+    assert tail.read_records() == [{"key": "9"}]
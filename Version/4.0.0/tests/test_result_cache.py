@@ -0,0 +1,79 @@
+import os
+
+from fmeconnector.result_cache import ResultCache
+
+KB = 1024
+
+
+def _write(path, data):
+    with open(path, "wb") as file:
+        file.write(data)
+    return str(path)
+
+
+def _age(path, seconds):
+    """Make a cache entry look last used seconds ago."""
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime - seconds, stat.st_mtime - seconds))
+
+
+def test_key_ignores_generated_paths_and_follows_content(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    fmw = _write(tmp_path / "ws.fmw", b"workspace")
+    source = _write(tmp_path / "in.geojson", b"{}")
+    command = ["fme.exe", fmw, "--SourceDataset", source, "--DestDataset", "out1.geojson", "--OFFSET", "5"]
+    key = cache.key(fmw, command, source, ("SourceDataset", "DestDataset"))
+
+    moved = ["other/fme.exe", fmw, "--SourceDataset", "x.geojson", "--DestDataset", "out2.geojson", "--OFFSET", "5"]
+    assert cache.key(fmw, moved, source, ("SourceDataset", "DestDataset")) == key
+
+    changed = command[:-1] + ["6"]
+    assert cache.key(fmw, changed, source, ("SourceDataset", "DestDataset")) != key
+
+    _write(tmp_path / "in.geojson", b'{"type": "FeatureCollection"}')
+    assert cache.key(fmw, command, source, ("SourceDataset", "DestDataset")) != key
+
+
+def test_key_covers_shapefile_sidecars(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    fmw = _write(tmp_path / "ws.fmw", b"workspace")
+    source = _write(tmp_path / "in.shp", b"shp")
+    _write(tmp_path / "in.dbf", b"attributes")
+    command = ["fme.exe", fmw]
+    key = cache.key(fmw, command, source)
+    _write(tmp_path / "in.dbf", b"edited attributes")
+    assert cache.key(fmw, command, source) != key
+
+
+def test_fetch_copies_a_stored_output(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    output = _write(tmp_path / "out.geojson", b"result")
+    dest = str(tmp_path / "run" / "dest.geojson")
+    assert not cache.fetch("k", dest)
+    cache.store("k", output)
+    assert cache.fetch("k", dest)
+    with open(dest, "rb") as file:
+        assert file.read() == b"result"
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = ResultCache(str(cache_dir), max_mb=1)
+    output = _write(tmp_path / "out.geojson", b"x" * (400 * KB))
+
+    cache.store("a", output)
+    _age(cache_dir / "a.geojson", 300)
+    cache.store("b", output)
+    _age(cache_dir / "b.geojson", 200)
+    # Using a makes b the least recently used entry
+    assert cache.fetch("a", str(tmp_path / "dest.geojson"))
+
+    cache.store("c", output)
+    assert sorted(os.listdir(cache_dir)) == ["a.geojson", "c.geojson"]
+
+
+def test_outputs_larger_than_the_cache_are_not_stored(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = ResultCache(str(cache_dir), max_mb=1)
+    cache.store("big", _write(tmp_path / "big.geojson", b"x" * (1100 * KB)))
+    assert not os.path.exists(cache_dir / "big.geojson")
@@ -0,0 +1,56 @@
+import math
+import random
+
+from fmeconnector.spatial_tiles import Tile, _cuts, balanced_tiles
+
+
+def _loads(tiles, points):
+    return [sum(tile.contains(x, y) for x, y in points) for tile in tiles]
+
+
+def test_cuts_share_out_distinct_values():
+    assert _cuts([1, 2, 3, 4, 5, 6], [1, 1, 1]) == [3, 5]
+    assert _cuts([], [1, 1]) == []
+
+
+def test_cuts_skip_duplicate_values():
+    # Most values on one coordinate, as in a vertical line set
+    values = sorted([0.0] * 90 + [1.0] * 5 + [2.0] * 5)
+    cuts = _cuts(values, [1, 1, 1, 1])
+    assert cuts == sorted(set(cuts))
+    assert all(cut > values[0] for cut in cuts)
+    assert cuts == [1.0, 2.0]
+
+
+def test_cuts_of_a_single_value():
+    assert _cuts([5.0] * 10, [1, 1, 1]) == []
+
+
+def test_tiles_cover_the_plane_without_overlap():
+    random.seed(1)
+    points = [(random.uniform(0, 100), random.uniform(0, 100)) for _ in range(1000)]
+    tiles = balanced_tiles(points, 6)
+    assert len(tiles) == 6
+    loads = _loads(tiles, points)
+    assert sum(loads) == len(points)
+    assert max(loads) - min(loads) <= 2
+
+
+def test_duplicate_x_values_leave_no_empty_tile():
+    # A grid: only three distinct x and y values
+    points = [(x, y) for x in range(3) for y in range(3) for _ in range(4)]
+    tiles = balanced_tiles(points, 16)
+    loads = _loads(tiles, points)
+    assert sum(loads) == len(points)
+    assert min(loads) > 0
+    assert len(tiles) == 9
+
+
+def test_single_column_takes_all_rows():
+    points = [(0.0, float(y)) for y in range(100)]
+    tiles = balanced_tiles(points, 4)
+    assert _loads(tiles, points) == [25, 25, 25, 25]
+
+
+def test_no_points_gives_one_tile():
+    assert balanced_tiles([], 4) == [Tile(-math.inf, -math.inf, math.inf, math.inf)]
@@ -0,0 +1,249 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Persistent catalog of the FME workspaces found under the working directory.
+# A background task walks the directory tree, parses new or changed .fmw files
+# in a small worker pool and stores what the connector needs (formats,
+# published parameters, FME build) in a local SQLite database, so folder
+# counts and "which workspaces take ..." questions are answered without
+# touching the files again.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from qgis.PyQt.QtCore import pyqtSignal
+from qgis.core import Qgis, QgsMessageLog, QgsTask
+
+from .fmw_parser import read_workspace
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workspaces (
+    path TEXT PRIMARY KEY,
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    fme_build TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS workspaces_folder ON workspaces (folder);
+CREATE TABLE IF NOT EXISTS datasets (
+    path TEXT NOT NULL REFERENCES workspaces (path) ON DELETE CASCADE,
+    is_source INTEGER NOT NULL,
+    format TEXT,
+    parameter TEXT
+);
+CREATE INDEX IF NOT EXISTS datasets_path ON datasets (path);
+CREATE INDEX IF NOT EXISTS datasets_format ON datasets (format, is_source);
+CREATE TABLE IF NOT EXISTS parameters (
+    path TEXT NOT NULL REFERENCES workspaces (path) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    default_value TEXT
+);
+CREATE INDEX IF NOT EXISTS parameters_path ON parameters (path);
+CREATE INDEX IF NOT EXISTS parameters_name ON parameters (name);
+CREATE TABLE IF NOT EXISTS roots (
+    path TEXT PRIMARY KEY,
+    indexed_at REAL NOT NULL
+);
+"""
+
+
+def _norm(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _subtree_pattern(folder):
+    """LIKE pattern matching every path below folder."""
+    escaped = folder.rstrip(os.sep).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + ("\\\\" if os.sep == "\\" else os.sep) + "%"
+
+
+class WorkspaceCatalog:
+    """SQLite catalog of indexed workspaces.
+
+    Every thread must use its own WorkspaceCatalog; the database runs in WAL
+    mode so the dialog can query while the indexer writes.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.connection = sqlite3.connect(db_path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def is_indexed(self, folder):
+        """Return True if folder lies inside a directory tree that has been indexed."""
+        folder = _norm(folder)
+        for (root,) in self.connection.execute("SELECT path FROM roots"):
+            if folder == root or folder.startswith(root.rstrip(os.sep) + os.sep):
+                return True
+        return False
+
+    def known_files(self, root):
+        """Return {path: (size, mtime_ns)} for every catalogued workspace below root."""
+        root = _norm(root)
+        rows = self.connection.execute(
+            "SELECT path, size, mtime_ns FROM workspaces WHERE folder = ? OR path LIKE ? ESCAPE '\\'",
+            (root, _subtree_pattern(root))
+        )
+        return {path: (size, mtime_ns) for path, size, mtime_ns in rows}
+
+    def store(self, path, size, mtime_ns, workspace=None, error=None):
+        """Insert or replace one workspace and its datasets and parameters."""
+        path = _norm(path)
+        with self.connection:
+            self.connection.execute("DELETE FROM workspaces WHERE path = ?", (path,))
+            self.connection.execute(
+                "INSERT INTO workspaces (path, folder, name, size, mtime_ns, fme_build, error) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (path, os.path.dirname(path), os.path.basename(path), size, mtime_ns,
+                 workspace.fme_build if workspace else None, error)
+            )
+            if workspace is None:
+                return
+            self.connection.executemany(
+                "INSERT INTO datasets (path, is_source, format, parameter) VALUES (?, ?, ?, ?)",
+                [(path, int(d.is_source), d.format.upper(), d.parameter) for d in workspace.datasets]
+            )
+            parameters = [(path, p.name, p.default_value) for p in workspace.published_parameters]
+            known = {p.name for p in workspace.published_parameters}
+            # Workspaces without GUI definitions still list their parameters in the header
+            parameters.extend((path, name, value) for name, value in workspace.parameters if name not in known)
+            self.connection.executemany(
+                "INSERT INTO parameters (path, name, default_value) VALUES (?, ?, ?)", parameters
+            )
+
+    def remove(self, paths):
+        with self.connection:
+            self.connection.executemany("DELETE FROM workspaces WHERE path = ?", [(p,) for p in paths])
+
+    def mark_indexed(self, root):
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO roots (path, indexed_at) VALUES (?, ?)", (_norm(root), time.time())
+            )
+
+    def folder_count(self, folder, recursive=False):
+        """Number of workspaces directly in folder, or in its whole subtree."""
+        folder = _norm(folder)
+        if recursive:
+            query = "SELECT COUNT(*) FROM workspaces WHERE folder = ? OR path LIKE ? ESCAPE '\\'"
+            args = (folder, _subtree_pattern(folder))
+        else:
+            query = "SELECT COUNT(*) FROM workspaces WHERE folder = ?"
+            args = (folder,)
+        return self.connection.execute(query, args).fetchone()[0]
+
+    def find(self, root=None, source_format=None, dest_format=None, parameters=()):
+        """Return the paths of workspaces matching every given criterion.
+
+        Formats are FME short names (GEOJSON, GPKG, ...), parameters are the
+        names of published parameters the workspace must accept.
+        """
+        query = "SELECT w.path FROM workspaces w WHERE w.error IS NULL"
+        args = []
+        if root:
+            root = _norm(root)
+            query += " AND (w.folder = ? OR w.path LIKE ? ESCAPE '\\')"
+            args += [root, _subtree_pattern(root)]
+        for is_source, format_name in ((1, source_format), (0, dest_format)):
+            if format_name:
+                query += (" AND EXISTS (SELECT 1 FROM datasets d WHERE d.path = w.path"
+                          " AND d.is_source = ? AND d.format = ?)")
+                args += [is_source, format_name.upper()]
+        for name in parameters:
+            query += " AND EXISTS (SELECT 1 FROM parameters p WHERE p.path = w.path AND p.name = ?)"
+            args.append(name)
+        query += " ORDER BY w.path"
+        return [path for (path,) in self.connection.execute(query, args)]
+
+
+class WorkspaceIndexTask(QgsTask):
+    """Bring the catalog up to date for every .fmw file below a directory."""
+
+    indexed = pyqtSignal(str, int, int)  # root, workspaces (re)parsed, workspaces in the tree
+
+    def __init__(self, root, db_path, max_workers=4):
+        super().__init__(f"Indexing FME workspaces in {root}", QgsTask.Flag.CanCancel)
+        self.root = root
+        self.db_path = db_path
+        self.max_workers = max(1, max_workers)
+        self.changed = 0
+        self.total = 0
+
+    def _scan(self):
+        """Return {path: (size, mtime_ns)} for all .fmw files below root."""
+        found = {}
+        stack = [self.root]
+        while stack:
+            if self.isCanceled():
+                return None
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.name.lower().endswith(".fmw"):
+                                stat = entry.stat()
+                                found[_norm(entry.path)] = (stat.st_size, stat.st_mtime_ns)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return found
+
+    def run(self):
+        # The catalog connection belongs to this worker thread
+        catalog = WorkspaceCatalog(self.db_path)
+        try:
+            found = self._scan()
+            if found is None:
+                return False
+            self.total = len(found)
+            known = catalog.known_files(self.root)
+            catalog.remove([path for path in known if path not in found])
+            changed = [path for path, key in found.items() if known.get(path) != key]
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {path: pool.submit(read_workspace, path) for path in changed}
+                for index, (path, future) in enumerate(futures.items(), 1):
+                    if self.isCanceled():
+                        for pending in futures.values():
+                            pending.cancel()
+                        return False
+                    size, mtime_ns = found[path]
+                    try:
+                        workspace = future.result()
+                    except Exception as e:
+                        # One unreadable workspace must not stop the rest of the run
+                        QgsMessageLog.logMessage(f"Could not index {path}: {e}", "QGIS-FME Connector", Qgis.Warning)
+                        catalog.store(path, size, mtime_ns, error=str(e) or type(e).__name__)
+                    else:
+                        catalog.store(path, size, mtime_ns, workspace=workspace)
+                    self.changed = index
+                    self.setProgress(100.0 * index / len(changed))
+
+            catalog.mark_indexed(self.root)
+            return True
+        finally:
+            catalog.close()
+
+    def finished(self, result):
+        if result:
+            self.indexed.emit(self.root, self.changed, self.total)
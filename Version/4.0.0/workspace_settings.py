@@ -0,0 +1,50 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Per-workspace settings in qgisfmeConnector.ini. Each workspace that has
+# settings gets its own [Workspace <path>] section next to the global ones.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+import configparser
+import os
+
+
+def workspace_section(fmw_path):
+    """ini section that holds the settings of a workspace."""
+    return "Workspace " + os.path.normcase(os.path.abspath(fmw_path)).replace("\\", "/")
+
+
+def load_workspace_settings(ini_path, fmw_path):
+    """Return the settings of a workspace as a dict (empty if it has none)."""
+    config = configparser.ConfigParser(interpolation=None)
+    config.read(ini_path)
+    section = workspace_section(fmw_path)
+    return dict(config[section]) if config.has_section(section) else {}
+
+
+def save_workspace_setting(ini_path, fmw_path, key, value):
+    """Store one setting of a workspace; an empty value removes it."""
+    config = configparser.ConfigParser(interpolation=None)
+    config.read(ini_path)
+    section = workspace_section(fmw_path)
+    if value:
+        if not config.has_section(section):
+            config.add_section(section)
+        config.set(section, key, value)
+    elif config.has_section(section):
+        config.remove_option(section, key)
+        if not config.options(section):
+            config.remove_section(section)
+    with open(ini_path, 'w') as configfile:
+        config.write(configfile)
+
+
+def split_list(value):
+    """Split a comma separated setting into its stripped, non-empty items."""
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
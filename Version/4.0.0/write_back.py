@@ -0,0 +1,232 @@
+# -------------------------------------------------------------------------------
+# QGIS-FME Form Connector - Version 4.0.0
+# -------------------------------------------------------------------------------
+#
+# Write-back runs. The export carries a key column through the workspace; the
+# output is read in batches, each batch is matched with its source features by
+# key and only the attribute values and geometries that changed beyond the
+# export rounding are written back, through the edit buffer of the layer,
+# instead of loading the output as a new layer. Changed geometries are
+# converted to the geometry type of the layer first, as a GeoJSON round trip
+# may turn a Polygon into a MultiPolygon or back.
+#
+# Developed by: GIS Innovation Sdn Bhd
+# Contact: sales@gis.fm / mygis@gis.my
+#
+# Copyright 2026 GIS Innovation Sdn Bhd. All rights reserved.
+# -------------------------------------------------------------------------------
+
+from qgis.core import (
+    Qgis,
+    QgsCoordinateTransform,
+    QgsExpression,
+    QgsFeatureRequest,
+    QgsProject,
+    QgsVectorLayerFeatureSource
+)
+
+# Origins of the layer fields that can be written to
+_WRITABLE_ORIGINS = (Qgis.FieldOrigin.Provider, Qgis.FieldOrigin.Edit)
+# Output features matched against the source per request
+MATCH_BATCH_SIZE = 1000
+
+
+class WriteBack:
+    """Changes an FME output makes to a source layer, collected off the main thread.
+
+    Created on the main thread with the layer, the JoinKey the export added
+    and the CRS of the exported geometries; with_geometry is False when the
+    export had none, precision the number of coordinate decimals the export
+    was rounded to, None for full precision. collect() runs in a task
+    worker, apply() on the main thread afterwards.
+    """
+
+    def __init__(self, layer, key, export_crs, with_geometry=True, precision=None, batch_size=MATCH_BATCH_SIZE):
+        self.layer_id = layer.id()
+        self.wkb_type = layer.wkbType()
+        self.source = QgsVectorLayerFeatureSource(layer)
+        self.fields = layer.fields()
+        self.key = key
+        self.with_geometry = with_geometry
+        self.export_crs = export_crs
+        self.transform_context = QgsProject.instance().transformContext()
+        self.transform = None
+        if with_geometry and export_crs != layer.crs():
+            self.transform = QgsCoordinateTransform(export_crs, layer.crs(), self.transform_context)
+        # Geometries are compared in the export CRS; vertices closer than the export
+        # rounding (and about a millimetre of reprojection noise) count as unchanged
+        noise = 1e-8 if export_crs.isGeographic() else 1e-3
+        self.tolerance = noise if precision is None else max(noise, 10.0 ** -precision)
+        self.batch_size = max(1, batch_size)
+        self.attribute_changes = {}  # fid -> {layer field index: value}
+        self.geometry_changes = {}   # fid -> QgsGeometry in layer CRS
+        self.unmatched = 0
+        self.unconvertible = 0  # Changed geometries that do not fit the layer geometry type
+        self.ignored_fields = []
+
+    @property
+    def changed_count(self):
+        return len(set(self.attribute_changes) | set(self.geometry_changes))
+
+    def collect(self, output_layer, is_canceled=None):
+        """Compare output_layer with the source, batch_size features at a time; False if canceled."""
+        output_names = output_layer.fields().names()
+        if self.key.field_name not in output_names:
+            raise ValueError(f"The output has no {self.key.field_name} column to match the features by")
+        key_index = output_names.index(self.key.field_name)
+        columns = []  # (output index, layer index)
+        for output_index, name in enumerate(output_names):
+            if name == self.key.field_name:
+                continue
+            index = self.fields.lookupField(name)
+            if index < 0 or self.fields.fieldOrigin(index) not in _WRITABLE_ORIGINS:
+                self.ignored_fields.append(name)
+                continue
+            columns.append((output_index, index))
+
+        # Only one batch of output features is held at a time
+        outputs = {}
+        for feature in output_layer.getFeatures():
+            if is_canceled is not None and is_canceled():
+                return False
+            outputs[self._key_value(feature.attributes()[key_index])] = feature
+            if len(outputs) >= self.batch_size:
+                self._match(outputs, columns)
+                outputs = {}
+        if outputs:
+            self._match(outputs, columns)
+        return True
+
+    def _match(self, outputs, columns):
+        """Compare a batch of output features, by key, with the source features they came from."""
+        request = QgsFeatureRequest()
+        if self.key.from_fid:
+            request.setFilterFids([fid for fid in outputs if isinstance(fid, int)])
+        else:
+            values = ", ".join(QgsExpression.quotedValue(value) for value in outputs)
+            request.setFilterExpression(f"{QgsExpression.quotedColumnRef(self.key.field_name)} IN ({values})")
+        request.setSubsetOfAttributes([index for _, index in columns] + self._key_indexes())
+        if not self.with_geometry:
+            request.setFlags(QgsFeatureRequest.Flag.NoGeometry)
+        elif self.transform is not None:
+            request.setDestinationCrs(self.export_crs, self.transform_context)
+        matched = 0
+        for feature in self.source.getFeatures(request):
+            key_value = feature.id() if self.key.from_fid else feature.attribute(self.key.field_name)
+            output = outputs.get(key_value)
+            if output is None:
+                continue
+            matched += 1
+            self._compare(feature, output, columns)
+        self.unmatched += len(outputs) - matched
+
+    def _key_value(self, value):
+        """A key read from the output, in the type the source layer uses (CSV keys are text)."""
+        if self.key.from_fid:
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return value
+        try:
+            return self.fields.field(self.key.field_name).convertCompatible(value)
+        except ValueError:
+            return value
+
+    def _key_indexes(self):
+        return [] if self.key.from_fid else [self.fields.lookupField(self.key.field_name)]
+
+    def _compare(self, feature, output, columns):
+        attributes = feature.attributes()
+        output_attributes = output.attributes()
+        changes = {}
+        for output_index, index in columns:
+            value = output_attributes[output_index]
+            try:
+                value = self.fields.at(index).convertCompatible(value)
+            except ValueError:
+                pass
+            if value != attributes[index]:
+                changes[index] = value
+        if changes:
+            self.attribute_changes[feature.id()] = changes
+
+        if self.with_geometry and output.hasGeometry():
+            geometry = output.geometry()
+            if self._same_geometry(feature.geometry(), geometry):
+                return
+            if self.transform is not None:
+                geometry.transform(self.transform)
+            geometry = self._coerce(geometry)
+            if geometry is None:
+                self.unconvertible += 1
+                return
+            self.geometry_changes[feature.id()] = geometry
+
+    def _coerce(self, geometry):
+        """geometry as the single/multi and Z/M type of the layer, None if it cannot be one."""
+        if self.wkb_type in (Qgis.WkbType.Unknown, Qgis.WkbType.NoGeometry) or geometry.wkbType() == self.wkb_type:
+            return geometry
+        # A multi geometry of several parts becomes several geometries for a single-part layer
+        geometries = geometry.coerceToType(self.wkb_type)
+        if len(geometries) != 1 or geometries[0].isNull():
+            return None
+        return geometries[0]
+
+    def _same_geometry(self, source, output):
+        """True if two geometries in the export CRS differ by no more than the tolerance at any vertex.
+
+        A single part and a one-part multi geometry with the same vertices
+        are the same.
+        """
+        if source.isNull():
+            return False
+        if source.type() != output.type():
+            return False
+        source_shape, output_shape = source.constGet(), output.constGet()
+        if source_shape.nCoordinates() != output_shape.nCoordinates() \
+                or source_shape.partCount() != output_shape.partCount() \
+                or source_shape.ringCount() != output_shape.ringCount():
+            return False
+        compare_z = source_shape.is3D() and output_shape.is3D()
+        for a, b in zip(source.vertices(), output.vertices()):
+            if abs(a.x() - b.x()) > self.tolerance or abs(a.y() - b.y()) > self.tolerance:
+                return False
+            if compare_z and abs(a.z() - b.z()) > self.tolerance:
+                return False
+        return True
+
+    def apply(self, layer):
+        """Write the collected changes to layer; return an error message or None.
+
+        A layer in edit mode takes them into its edit buffer as one undoable
+        command. Otherwise editing is started, the changes are committed
+        together and rolled back from the buffer if the commit fails.
+        """
+        if layer.isEditable():
+            self._edit(layer)
+            return None
+
+        capabilities = layer.dataProvider().capabilities()
+        if self.attribute_changes and not capabilities & Qgis.VectorProviderCapability.ChangeAttributeValues:
+            return f"{layer.name()} does not allow changing attribute values"
+        if self.geometry_changes and not capabilities & Qgis.VectorProviderCapability.ChangeGeometries:
+            return f"{layer.name()} does not allow changing geometries"
+        if not self.changed_count:
+            return None
+
+        if not layer.startEditing():
+            return f"{layer.name()} cannot be edited"
+        self._edit(layer)
+        if not layer.commitChanges():
+            errors = "; ".join(layer.commitErrors())
+            layer.rollBack()
+            return f"Failed to write the changes to {layer.name()}: {errors}"
+        return None
+
+    def _edit(self, layer):
+        layer.beginEditCommand("FME write back")
+        for fid, changes in self.attribute_changes.items():
+            layer.changeAttributeValues(fid, changes)
+        for fid, geometry in self.geometry_changes.items():
+            layer.changeGeometry(fid, geometry)
+        layer.endEditCommand()